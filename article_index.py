@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Índice BM25 sobre fragmentos de los artículos de todas las convocatorias.
+
+Cada artículo extraído (``article_3`` … ``article_48``) se divide en sus apartados
+("A)", "1.", "a)", ...) y cada apartado se indexa como un fragmento. El índice se
+construye una vez, se guarda en disco y permite recuperar en milisegundos los
+fragmentos más relevantes para una consulta, de modo que la etapa de generación
+lea solo unos cientos de tokens en lugar de documentos completos.
+
+Uso:
+python article_index.py build -i output/becas_datos.json -o output/indice_articulos.json
+python article_index.py search -x output/indice_articulos.json "ayuda de residencia" -k 5 --year 2022-2023
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import heapq
+import argparse
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from models import load_documents, as_document
+from prompt_compaction import estimate_tokens
+from text_cache import TextCache, resolve_article
+
+INDEX_VERSION = 1
+
+# Palabras vacías más frecuentes en las convocatorias
+STOPWORDS = frozenset("""
+a al ante con de del desde el en entre es esta este hasta la las lo los o para por que se
+segun ser sera seran si sin sobre su sus un una unas unos y
+""".split())
+
+# Inicio de apartado: "A) ", "b) ", "1. " o "12. " precedido de un salto o de varios espacios
+APARTADO_PATTERN = re.compile(r'(?:^|\n|\s{2,})(?=(?:[A-Za-z]|\d{1,2})[\).]\s+\S)')
+APARTADO_LABEL_PATTERN = re.compile(r'^((?:[A-Za-z]|\d{1,2})[\).])\s')
+# Restos de texto vertical de los márgenes del BOE: secuencias largas de caracteres sueltos
+MARGIN_NOISE_PATTERN = re.compile(r'(?:(?<!\S)\S(?!\S)\s*){6,}')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]{2,}')
+
+
+def normalize(text: str) -> str:
+    """Pasa a minúsculas y elimina las tildes."""
+    decomposed = unicodedata.normalize('NFD', text.lower())
+    return ''.join(c for c in decomposed if unicodedata.category(c) != 'Mn')
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens normalizados de un texto, sin palabras vacías."""
+    return [token for token in TOKEN_PATTERN.findall(normalize(text)) if token not in STOPWORDS]
+
+
+def clean_chunk_text(text: str) -> str:
+    """Elimina el ruido de los márgenes y normaliza los espacios de un fragmento."""
+    return ' '.join(MARGIN_NOISE_PATTERN.sub(' ', text).split())
+
+
+@dataclass(slots=True)
+class Chunk:
+    """Fragmento indexado: un apartado de un artículo de una convocatoria."""
+    file_name: str
+    year: str
+    article: str
+    apartado: str
+    text: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file_name": self.file_name,
+            "year": self.year,
+            "article": self.article,
+            "apartado": self.apartado,
+            "text": self.text
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Chunk":
+        return cls(data['file_name'], data['year'], data['article'], data['apartado'], data['text'])
+
+
+def split_apartados(article_text: str, max_words: int = 180) -> Iterator[Tuple[str, str]]:
+    """
+    Divide el texto de un artículo en apartados.
+
+    Los apartados demasiado largos se parten en ventanas de ``max_words`` palabras.
+
+    Returns:
+        Pares (etiqueta del apartado, texto)
+    """
+    for part in APARTADO_PATTERN.split(article_text):
+        part = clean_chunk_text(part)
+        if not part:
+            continue
+        label_match = APARTADO_LABEL_PATTERN.match(part)
+        label = label_match.group(1) if label_match else ""
+
+        words = part.split()
+        for start in range(0, len(words), max_words):
+            yield label, ' '.join(words[start:start + max_words])
+
+
+class ArticleIndex:
+    """Índice BM25 de fragmentos de artículos."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunks: List[Chunk] = []
+        self.lengths: List[int] = []
+        # término -> lista de (posición del fragmento, frecuencia)
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.idf: Dict[str, float] = {}
+        self.avg_length = 0.0
+
+    @classmethod
+    def build(cls, documents: Iterable[Any], text_cache: Optional[TextCache] = None,
+              max_words: int = 180) -> "ArticleIndex":
+        """
+        Construye el índice a partir de los resultados de los extractores.
+
+        Args:
+            documents: Resultados (diccionarios o ``Document``) con los textos de los artículos
+            text_cache: Caché de textos para resolver los artículos guardados en modo compacto
+            max_words: Longitud máxima de un fragmento en palabras
+        """
+        index = cls()
+        for data in documents:
+            document = as_document(data)
+            if not document.valid:
+                continue
+            for article, value in sorted(document.articles.items(), key=lambda kv: int(kv[0].split('_')[1])):
+                text = resolve_article(value, text_cache)
+                for apartado, chunk_text in split_apartados(text, max_words):
+                    index.add(Chunk(document.file_name, document.academic_year, article, apartado, chunk_text))
+        index.finalize()
+        return index
+
+    def add(self, chunk: Chunk) -> None:
+        """Añade un fragmento (hay que llamar a ``finalize`` antes de buscar)."""
+        position = len(self.chunks)
+        tokens = tokenize(chunk.text)
+        self.chunks.append(chunk)
+        self.lengths.append(len(tokens))
+
+        frequencies: Dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for token, frequency in frequencies.items():
+            self.postings.setdefault(token, []).append((position, frequency))
+
+    def finalize(self) -> None:
+        """Calcula la longitud media y el IDF de cada término."""
+        total = len(self.chunks)
+        self.avg_length = sum(self.lengths) / total if total else 0.0
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query: str, k: int = 5, year: Optional[str] = None,
+               articles: Optional[Iterable[str]] = None) -> List[Tuple[float, Chunk]]:
+        """
+        Devuelve los ``k`` fragmentos más relevantes para una consulta.
+
+        Args:
+            query: Texto de la consulta
+            k: Número de fragmentos
+            year: Limitar a un curso académico (por ejemplo, '2022-2023')
+            articles: Limitar a ciertos artículos (por ejemplo, ['article_11', 'article_19'])
+
+        Returns:
+            Lista de pares (puntuación, fragmento) ordenada de mayor a menor puntuación
+        """
+        article_filter = set(articles) if articles else None
+        k1, b, avg_length = self.k1, self.b, self.avg_length or 1.0
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for position, frequency in self.postings[term]:
+                norm = k1 * (1 - b + b * self.lengths[position] / avg_length)
+                scores[position] = scores.get(position, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+
+        if year is not None or article_filter is not None:
+            scores = {
+                position: score for position, score in scores.items()
+                if (year is None or self.chunks[position].year == year)
+                and (article_filter is None or self.chunks[position].article in article_filter)
+            }
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, self.chunks[position]) for position, score in best]
+
+    def build_context(self, query: str, token_budget: int = 300, k: int = 10,
+                      year: Optional[str] = None, articles: Optional[Iterable[str]] = None) -> List[Chunk]:
+        """Fragmentos más relevantes que caben en un presupuesto de tokens (según ``estimate_tokens``)."""
+        selected = []
+        used = 0
+        for _, chunk in self.search(query, k, year, articles):
+            cost = estimate_tokens(chunk.text)
+            if used + cost > token_budget:
+                continue
+            selected.append(chunk)
+            used += cost
+        return selected
+
+    def save(self, path: str) -> None:
+        """Guarda el índice en un fichero JSON."""
+        data = {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "chunks": [chunk.to_dict() for chunk in self.chunks],
+            "lengths": self.lengths,
+            "postings": self.postings
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "ArticleIndex":
+        """Carga un índice guardado con ``save``."""
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Versión de índice no soportada en {path}: {data.get('version')}")
+
+        index = cls(data["k1"], data["b"])
+        index.chunks = [Chunk.from_dict(chunk) for chunk in data["chunks"]]
+        index.lengths = data["lengths"]
+        index.postings = {term: [tuple(p) for p in postings] for term, postings in data["postings"].items()}
+        index.finalize()
+        return index
+
+
+def main():
+    """Construye el índice o realiza búsquedas sobre él."""
+    parser = argparse.ArgumentParser(description='Índice BM25 de los artículos de las convocatorias de becas')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Construye el índice a partir de ficheros de resultados')
+    build_parser.add_argument('--input', '-i', type=str, nargs='+', required=True,
+                              help='Ficheros JSON o NDJSON con los resultados de los extractores')
+    build_parser.add_argument('--output', '-o', type=str, default='./output/indice_articulos.json',
+                              help='Fichero del índice')
+    build_parser.add_argument('--text-cache', type=str, default=None,
+                              help='Directorio text_cache de los resultados generados con --compact')
+    build_parser.add_argument('--max-words', type=int, default=180, help='Longitud máxima de un fragmento')
+
+    search_parser = subparsers.add_parser('search', help='Busca los fragmentos más relevantes')
+    search_parser.add_argument('query', type=str, help='Consulta')
+    search_parser.add_argument('--index', '-x', type=str, default='./output/indice_articulos.json',
+                               help='Fichero del índice')
+    search_parser.add_argument('-k', type=int, default=5, help='Número de fragmentos')
+    search_parser.add_argument('--year', type=str, default=None, help='Curso académico (por ejemplo, 2022-2023)')
+    search_parser.add_argument('--article', type=str, action='append', default=None,
+                               help='Limitar a un artículo (por ejemplo, article_11); se puede repetir')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        text_cache = TextCache(args.text_cache) if args.text_cache else None
+        start = time.perf_counter()
+        documents = (document for path in args.input for document in load_documents(path))
+        index = ArticleIndex.build(documents, text_cache, args.max_words)
+        index.save(args.output)
+        print(f"Índice con {len(index.chunks)} fragmentos y {len(index.postings)} términos guardado en "
+              f"{args.output} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return
+
+    index = ArticleIndex.load(args.index)
+    start = time.perf_counter()
+    results = index.search(args.query, args.k, args.year, args.article)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if not results:
+        print("Sin resultados")
+        sys.exit(1)
+
+    for score, chunk in results:
+        print(f"[{score:.2f}] {chunk.year} {chunk.article} {chunk.apartado} ({chunk.file_name})")
+        print(f"    {chunk.text[:300]}")
+    print(f"{len(results)} fragmentos en {elapsed:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
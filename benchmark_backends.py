@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Banco de pruebas de rendimiento de los backends de extracción de PDF.
+
+Compara ``pymupdf_extractor`` (PyMuPDF), ``pdf_miner_extractor_2`` (pdfminer) y
+``pdyd2_extractor`` (PyPDF2) sobre los PDFs de ``corpus/`` y sobre corpus ampliados
+sintéticamente (10× y 100×, replicando los ficheros o concatenando cada PDF consigo
+mismo). Para cada backend y escala se mide:
+- tiempo en frío: proceso nuevo, incluyendo arranque del intérprete, importaciones y
+  primera pasada por el corpus
+- tiempo en caliente: mediana de las pasadas siguientes dentro del mismo proceso
+- pico de memoria residente (RSS) del proceso
+- caracteres de texto producidos
+
+Cada medición se hace en un subproceso independiente para que las importaciones y la
+memoria de un backend no afecten a los demás. Los resultados se guardan en JSON en
+``output/benchmarks`` para poder comparar ejecuciones a lo largo del tiempo.
+
+Uso:
+python benchmark_backends.py --input corpus --scales 1 10 100 --repeat 3
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import platform
+import tempfile
+import argparse
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+BACKENDS = ('pymupdf', 'pdfminer', 'pypdf2')
+SCALE_MODES = ('replicate', 'concatenate')
+
+
+def load_backend(name: str):
+    """
+    Importa un backend y devuelve sus funciones (extracción de texto, análisis de campos).
+
+    Las importaciones se hacen aquí para poder medir su coste dentro del proceso de medición.
+    """
+    if name == 'pymupdf':
+        import pymupdf_extractor
+        return pymupdf_extractor.extract_text_from_pdf, pymupdf_extractor.analyze_text
+    if name == 'pypdf2':
+        import pdyd2_extractor
+        return pdyd2_extractor.extract_text_from_pdf, pdyd2_extractor.analyze_text
+    if name == 'pdfminer':
+        import pdf_miner_extractor_2
+        # Directorio de trabajo propio, que se borra al terminar el proceso
+        work_dir = tempfile.mkdtemp(prefix='becas_bench_')
+        atexit.register(shutil.rmtree, work_dir, ignore_errors=True)
+        extractor = pdf_miner_extractor_2.BecasExtractor(input_dir='.', output_dir=work_dir)
+        return extractor.extract_text_from_pdf, lambda text, path: extractor.extract_data(text, os.path.basename(path))
+    raise ValueError(f"Backend desconocido: {name}")
+
+
+def _peak_rss_kib() -> Optional[int]:
+    """Pico de memoria residente del proceso actual en KiB (None si no se puede medir)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # En macOS ru_maxrss está en bytes; en Linux, en KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _run_pass(extract_text, analyze, pdf_paths: List[str]) -> Dict[str, Any]:
+    """Procesa todos los PDFs una vez y devuelve tiempos y caracteres."""
+    text_seconds = fields_seconds = 0.0
+    chars = valid = 0
+    for path in pdf_paths:
+        start = time.perf_counter()
+        text = extract_text(path)
+        middle = time.perf_counter()
+        result = analyze(text, path)
+        end = time.perf_counter()
+
+        text_seconds += middle - start
+        fields_seconds += end - middle
+        chars += len(text)
+        valid += bool(result.get('valid'))
+    return {
+        "seconds": text_seconds + fields_seconds,
+        "text_seconds": text_seconds,
+        "fields_seconds": fields_seconds,
+        "chars": chars,
+        "valid": valid
+    }
+
+
+def run_worker(backend: str, pdf_paths: List[str], repeat: int) -> Dict[str, Any]:
+    """Mide un backend dentro del proceso actual (se ejecuta en un subproceso)."""
+    start = time.perf_counter()
+    try:
+        # Los extractores escriben mensajes de progreso que no interesan aquí
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract_text, analyze = load_backend(backend)
+    except ImportError as e:
+        return {"available": False, "error": str(e)}
+    import_seconds = time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cold = _run_pass(extract_text, analyze, pdf_paths)
+        warm = [_run_pass(extract_text, analyze, pdf_paths) for _ in range(repeat)]
+
+    warm_seconds = [p["seconds"] for p in warm]
+    return {
+        "available": True,
+        "documents": len(pdf_paths),
+        "import_seconds": round(import_seconds, 6),
+        "first_pass": {k: round(v, 6) if isinstance(v, float) else v for k, v in cold.items()},
+        "warm_median_seconds": round(statistics.median(warm_seconds), 6) if warm else None,
+        "warm_min_seconds": round(min(warm_seconds), 6) if warm else None,
+        "warm_total_seconds": sum(warm_seconds),
+        "warm_text_median_seconds": round(statistics.median(p["text_seconds"] for p in warm), 6) if warm else None,
+        "warm_fields_median_seconds": round(statistics.median(p["fields_seconds"] for p in warm), 6) if warm else None,
+        "chars": cold["chars"],
+        "valid_documents": cold["valid"],
+        "peak_rss_kib": _peak_rss_kib()
+    }
+
+
+def build_scaled_corpus(pdf_paths: List[str], scale: int, mode: str, work_dir: str) -> List[str]:
+    """
+    Crea un corpus ampliado ``scale`` veces.
+
+    Args:
+        pdf_paths: PDFs originales
+        scale: Factor de ampliación
+        mode: 'replicate' (``scale`` copias de cada fichero) o 'concatenate' (cada PDF
+            unido ``scale`` veces consigo mismo, requiere PyMuPDF)
+        work_dir: Directorio donde se crea el corpus
+
+    Returns:
+        Rutas de los PDFs del corpus ampliado
+    """
+    if scale == 1:
+        return list(pdf_paths)
+
+    scaled_dir = os.path.join(work_dir, f"{mode}_{scale}x")
+    os.makedirs(scaled_dir, exist_ok=True)
+    scaled_paths = []
+
+    if mode == 'concatenate':
+        import fitz  # PyMuPDF
+        for path in pdf_paths:
+            target = os.path.join(scaled_dir, os.path.basename(path))
+            with fitz.open(path) as source, fitz.open() as combined:
+                for _ in range(scale):
+                    combined.insert_pdf(source)
+                combined.save(target)
+            scaled_paths.append(target)
+        return scaled_paths
+
+    for copy in range(scale):
+        for path in pdf_paths:
+            stem, ext = os.path.splitext(os.path.basename(path))
+            target = os.path.join(scaled_dir, f"{stem}_{copy:03d}{ext}")
+            # Enlaces duros cuando es posible: no ocupan espacio y se leen igual que una copia
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copyfile(path, target)
+            scaled_paths.append(target)
+    return scaled_paths
+
+
+def measure(backend: str, pdf_paths: List[str], repeat: int, timeout: float) -> Dict[str, Any]:
+    """Lanza un subproceso de medición y devuelve su resultado con el tiempo total en frío."""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as file:
+        json.dump(pdf_paths, file)
+        list_path = file.name
+
+    command = [sys.executable, os.path.abspath(__file__), '--worker', backend,
+               '--file-list', list_path, '--repeat', str(repeat)]
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    except subprocess.TimeoutExpired:
+        return {"available": True, "error": f"Tiempo agotado ({timeout} s)"}
+    finally:
+        os.unlink(list_path)
+    wall = time.perf_counter() - start
+
+    if completed.returncode != 0:
+        return {"available": True, "error": completed.stderr.strip().splitlines()[-1:] or "error desconocido"}
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    if result.get("available"):
+        # Tiempo en frío: arranque del proceso + importaciones + primera pasada
+        result["cold_seconds"] = round(wall - result.pop("warm_total_seconds"), 6)
+        result["process_wall_seconds"] = round(wall, 6)
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    """Ejecuta el banco de pruebas y guarda los resultados en JSON."""
+    parser = argparse.ArgumentParser(description='Banco de pruebas de los backends de extracción de PDF')
+    parser.add_argument('--input', '-i', type=str, default='./corpus', help='Directorio con los PDFs')
+    parser.add_argument('--output', '-o', type=str, default='./output/benchmarks',
+                        help='Directorio donde se guardan los resultados')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS), help='Backends a medir')
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10, 100], help='Factores de ampliación del corpus')
+    parser.add_argument('--scale-mode', choices=SCALE_MODES, default='replicate',
+                        help='Cómo se amplía el corpus: replicando ficheros o concatenando cada PDF')
+    parser.add_argument('--repeat', type=int, default=3, help='Pasadas en caliente por medición')
+    parser.add_argument('--timeout', type=float, default=3600.0, help='Tiempo máximo por medición (s)')
+    # Modo interno: medición de un backend en un subproceso
+    parser.add_argument('--worker', choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument('--file-list', type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.file_list, 'r', encoding='utf-8') as file:
+            pdf_paths = json.load(file)
+        print(json.dumps(run_worker(args.worker, pdf_paths, args.repeat)))
+        return
+
+    pdf_paths = sorted(os.path.join(args.input, f) for f in os.listdir(args.input) if f.lower().endswith('.pdf'))
+    if not pdf_paths:
+        print(f"No se encontraron PDFs en {args.input}")
+        sys.exit(1)
+
+    os.makedirs(args.output, exist_ok=True)
+    report = {
+        "started_at": datetime.now().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "input": os.path.abspath(args.input),
+        "scale_mode": args.scale_mode,
+        "repeat": args.repeat,
+        "results": []
+    }
+
+    with tempfile.TemporaryDirectory(prefix='becas_bench_') as work_dir:
+        for scale in args.scales:
+            try:
+                scaled_paths = build_scaled_corpus(pdf_paths, scale, args.scale_mode, work_dir)
+            except ImportError:
+                print(f"⚠️ PyMuPDF no está instalado: el corpus {scale}× se amplía replicando ficheros")
+                scaled_paths = build_scaled_corpus(pdf_paths, scale, 'replicate', work_dir)
+
+            for backend in args.backends:
+                print(f"⏱️ {backend} × {scale} ({len(scaled_paths)} PDFs)...", flush=True)
+                result = measure(backend, scaled_paths, args.repeat, args.timeout)
+                result.update({"backend": backend, "scale": scale})
+                report["results"].append(result)
+
+                if not result.get("available"):
+                    print(f"   no disponible: {result.get('error')}")
+                elif "error" in result:
+                    print(f"   error: {result['error']}")
+                else:
+                    print(f"   frío {result['cold_seconds']:.2f} s, caliente {result['warm_median_seconds']:.2f} s, "
+                          f"RSS {result['peak_rss_kib']} KiB, {result['chars']} caracteres")
+
+    output_path = os.path.join(args.output, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados guardados en {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Registros de finalización por documento para reanudar ejecuciones interrumpidas.
+
+Con ``--resume`` o ``--checkpoint-dir``, cada documento procesado deja un registro en
+``<output>/checkpoints`` (o en el directorio indicado) con su resultado y una huella del
+fichero de entrada (tamaño y fecha de modificación); sin ellas no se escribe nada. Los
+registros se escriben de forma atómica (fichero temporal + ``os.replace``), por lo que
+una ejecución interrumpida nunca deja un registro a medias.
+
+Al reanudar (``--resume``), los documentos con registro y huella coincidente no se
+vuelven a extraer: su resultado se recupera del registro y los ficheros agregados
+(``becas_datos.json``, NDJSON y resúmenes) se reconstruyen con todos los documentos.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+class CheckpointStore:
+    """Almacén de registros de finalización por documento."""
+
+    def __init__(self, checkpoint_dir: str, resume: bool = True):
+        """
+        Inicializa el almacén.
+
+        Args:
+            checkpoint_dir: Directorio de los registros
+            resume: Si es False, los registros existentes se ignoran (y se sobrescriben)
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.resume = resume
+        self.restored = 0
+        self.recorded = 0
+
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(file_path: str) -> str:
+        """Huella barata de un fichero de entrada: cambia si el fichero se modifica."""
+        stat = os.stat(file_path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def record_path(self, file_name: str) -> str:
+        """Ruta del registro de un documento."""
+        digest = hashlib.sha1(file_name.encode('utf-8')).hexdigest()[:12]
+        safe_name = "".join(c if c.isalnum() or c in '-_.' else '_' for c in file_name)
+        return os.path.join(self.checkpoint_dir, f"{safe_name}.{digest}.json")
+
+    def load(self, file_name: str, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve el registro de un documento ya completado.
+
+        Returns:
+            El registro, o None si no se reanuda, no existe, está dañado o el fichero
+            de entrada ha cambiado desde que se escribió
+        """
+        if not self.resume:
+            return None
+
+        try:
+            with open(self.record_path(file_name), 'r', encoding='utf-8') as file:
+                record = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if record.get('file_name') != file_name or record.get('fingerprint') != self.fingerprint(file_path):
+            return None
+
+        self.restored += 1
+        return record
+
+    def mark_complete(self, file_name: str, file_path: str, result: Dict[str, Any]) -> None:
+        """Registra de forma atómica que un documento se ha completado, junto con su resultado."""
+        record = {
+            'file_name': file_name,
+            'fingerprint': self.fingerprint(file_path),
+            'completed_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'valid': bool(result.get('valid', False)),
+            'result': result
+        }
+
+        path = self.record_path(file_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(record, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        self.recorded += 1
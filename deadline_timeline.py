@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Calendario de plazos de solicitud de todas las convocatorias.
+
+A partir de los resultados de los extractores se construye una vez un índice, en memoria
+o en disco, con los plazos de todos los cursos (plazo general, plazos por tipo de
+estudiante y plazo excepcional) con su inicio y fin en ISO 8601 (ver ``spanish_dates``).
+Las fechas ISO se ordenan como texto, de modo que las consultas son búsquedas binarias
+sobre listas ordenadas en lugar de volver a interpretar el corpus:
+
+- ``open_on``: plazos abiertos en una fecha o en un momento concreto.
+- ``closing_after``: próximos cierres de plazo a partir de una fecha.
+
+Los plazos de los que solo se conoce el fin ("hasta el 14 de octubre de 2021") entran
+en ``closing_after`` pero no en ``open_on``.
+
+Uso:
+python deadline_timeline.py build -i output/ayudas_*.json -o output/calendario_plazos.json
+python deadline_timeline.py open 2024-04-15
+python deadline_timeline.py open "10 de mayo de 2024" --at 16:00
+python deadline_timeline.py next 2023-01-01 --limit 3
+"""
+
+import sys
+import json
+import time
+import argparse
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from models import Document, load_documents
+from query import normalize_year
+from spanish_dates import END_OF_DAY, START_OF_DAY, extract_application_window, normalize_deadline, \
+    parse_date, parse_time, to_iso
+from text_cache import resolve_article
+
+TIMELINE_VERSION = 1
+DEFAULT_TIMELINE_PATH = './output/calendario_plazos.json'
+GENERAL_TYPE = "General"
+EXCEPTIONAL_TYPE = "Excepcional"
+
+
+class TimelineEntry(NamedTuple):
+    """Un plazo de solicitud de un curso ("" en ``start`` si no se conoce el inicio)."""
+    start: str
+    end: str
+    year: str
+    type: str
+    description: str
+
+
+def document_entries(document: Document) -> List[TimelineEntry]:
+    """
+    Plazos de un documento. Si el resultado es anterior a las fechas ISO, el plazo
+    general se obtiene del texto del Artículo 48 (cuando está guardado en claro).
+    """
+    if not document.valid or not document.academic_year:
+        return []
+    year = normalize_year(document.academic_year)
+
+    if document.application_window is not None:
+        window: Optional[Tuple[str, str, str]] = (document.application_window.start,
+                                                  document.application_window.end,
+                                                  document.application_window.description)
+    else:
+        found = extract_application_window(resolve_article(document.articles.get('article_48'), None))
+        window = (found["start"], found["end"], found["description"]) if found else None
+
+    entries = []
+    if window is not None:
+        entries.append(TimelineEntry(window[0], window[1], year, GENERAL_TYPE, window[2]))
+
+    for deadline in document.deadlines:
+        end = deadline.deadline_iso or normalize_deadline(deadline.deadline)
+        if end is None:
+            continue
+        # Los plazos por tipo de estudiante que terminan dentro del plazo general empiezan con
+        # él; de uno que termina después (el excepcional mal etiquetado) no se sabe el inicio
+        start = window[0] if window is not None and window[0] <= end <= window[1] else ""
+        entries.append(TimelineEntry(start, end, year, deadline.type or GENERAL_TYPE, deadline.description))
+
+    if document.exceptional_case is not None:
+        exceptional = document.exceptional_case
+        end = exceptional.deadline_iso or normalize_deadline(exceptional.deadline)
+        if end is not None:
+            # El plazo excepcional se abre cuando termina el general
+            start = window[1] if window is not None and window[1] <= end else ""
+            entries.append(TimelineEntry(start, end, year, EXCEPTIONAL_TYPE, exceptional.description))
+
+    # Varios extractores pueden dar el mismo plazo con distinto tipo o descripción
+    unique = {}
+    for entry in entries:
+        unique.setdefault((entry.start, entry.end), entry)
+    return list(unique.values())
+
+
+def closed_window_problems(timeline: "DeadlineTimeline") -> List[str]:
+    """
+    Comprueba que, un segundo después del cierre de cada plazo general, no queda abierto
+    ningún plazo de ese curso salvo el excepcional. Devuelve los problemas encontrados.
+    """
+    problems = []
+    for window in timeline.windows:
+        if window.type != GENERAL_TYPE:
+            continue
+        after = (datetime.fromisoformat(window.end) + timedelta(seconds=1)).isoformat(timespec='seconds')
+        for entry in timeline.open_on(after):
+            if entry.year == window.year and entry.type != EXCEPTIONAL_TYPE:
+                problems.append(f"{window.year}: '{entry.type}' ({entry.start} → {entry.end}) sigue abierto "
+                                f"tras el cierre del plazo general ({window.end})")
+    return problems
+
+
+def moment_bounds(value: str, at: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Intervalo ISO de una fecha de consulta: el día completo, o un único instante si se
+    indica la hora ('2024-05-10T16:00', o ``at`` = '16:00').
+
+    Acepta fechas ISO ('2024-05-10'), '10/05/2024' o '10 de mayo de 2024'.
+
+    Raises:
+        ValueError: Si la fecha o la hora no son válidas
+    """
+    text = value.strip()
+    day_text, _, time_text = text.partition('T')
+    try:
+        day = date.fromisoformat(day_text)
+    except ValueError:
+        day = parse_date(day_text)
+    if day is None:
+        raise ValueError(f"Fecha no válida: {value}")
+
+    time_text = at or time_text
+    if not time_text:
+        return to_iso(day, START_OF_DAY), to_iso(day, END_OF_DAY)
+    moment = parse_time(time_text)
+    if moment is None:
+        raise ValueError(f"Hora no válida: {time_text}")
+    iso = to_iso(day, moment)
+    return iso, iso
+
+
+class DeadlineTimeline:
+    """Índice ordenado de los plazos de solicitud de todos los cursos."""
+
+    def __init__(self, entries: Iterable[TimelineEntry]):
+        entries = list(entries)
+        # Plazos con inicio, por inicio; y todos los plazos, por fin
+        self.windows = sorted((entry for entry in entries if entry.start), key=lambda e: (e.start, e.end))
+        self.by_end = sorted(entries, key=lambda e: (e.end, e.start))
+        self._starts = [entry.start for entry in self.windows]
+        self._ends = [entry.end for entry in self.by_end]
+        # Mayor fin entre los primeros i+1 plazos por inicio: permite dejar de buscar hacia
+        # atrás en cuanto ningún plazo anterior puede seguir abierto
+        self._reach = list(accumulate((entry.end for entry in self.windows), max))
+
+    def __len__(self) -> int:
+        return len(self.by_end)
+
+    @property
+    def years(self) -> List[str]:
+        """Cursos con algún plazo, en orden."""
+        return sorted({entry.year for entry in self.by_end})
+
+    @classmethod
+    def build(cls, documents: Iterable[Document]) -> "DeadlineTimeline":
+        """Construye el índice a partir de los documentos de todos los cursos."""
+        entries = {}
+        for document in documents:
+            for entry in document_entries(document):
+                entries.setdefault((entry.year, entry.start, entry.end), entry)
+        return cls(entries.values())
+
+    def save(self, path: str) -> None:
+        """Guarda el índice en un fichero JSON."""
+        data = {
+            "version": TIMELINE_VERSION,
+            "entries": [entry._asdict() for entry in self.by_end]
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "DeadlineTimeline":
+        """Carga un índice guardado con ``save``."""
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data.get("version") != TIMELINE_VERSION:
+            raise ValueError(f"Versión de calendario no soportada en {path}: {data.get('version')}")
+        return cls(TimelineEntry(**entry) for entry in data["entries"])
+
+    def open_on(self, first: str, last: Optional[str] = None) -> List[TimelineEntry]:
+        """
+        Plazos abiertos en algún momento entre dos instantes ISO (ambos incluidos), en
+        orden de inicio. Con un solo instante, los abiertos en ese momento.
+        """
+        last = last or first
+        position = bisect_right(self._starts, last) - 1
+        found = []
+        while position >= 0 and self._reach[position] >= first:
+            if self.windows[position].end >= first:
+                found.append(self.windows[position])
+            position -= 1
+        found.reverse()
+        return found
+
+    def closing_after(self, moment: str, limit: Optional[int] = None) -> List[TimelineEntry]:
+        """Plazos que terminan en el instante ISO indicado o después, en orden de cierre."""
+        position = bisect_left(self._ends, moment)
+        end = len(self.by_end) if limit is None else min(len(self.by_end), position + limit)
+        return self.by_end[position:end]
+
+
+def _print_entries(label: str, entries: List[TimelineEntry], elapsed: float) -> None:
+    print(f"{label}: {len(entries)} plazos ({elapsed * 1e6:.0f} µs)")
+    for entry in entries:
+        start = entry.start.replace('T', ' ') if entry.start else '?'
+        print(f"   {entry.year} · {entry.type}: {start} → {entry.end.replace('T', ' ')}")
+
+
+def main():
+    """Construye el calendario de plazos o responde a una consulta."""
+    parser = argparse.ArgumentParser(description='Calendario de plazos de solicitud de las convocatorias de becas')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Construye el calendario a partir de ficheros de resultados')
+    build_parser.add_argument('--input', '-i', type=str, nargs='+', required=True,
+                              help='Ficheros JSON o NDJSON con los resultados de los extractores')
+    build_parser.add_argument('--output', '-o', type=str, default=DEFAULT_TIMELINE_PATH, help='Fichero del calendario')
+
+    open_parser = subparsers.add_parser('open', help='Plazos abiertos en una fecha')
+    open_parser.add_argument('date', help="Fecha ('2024-04-15', '15/04/2024' o '15 de abril de 2024')")
+    open_parser.add_argument('--at', type=str, default=None, help="Hora concreta ('16:00'); por defecto, todo el día")
+
+    next_parser = subparsers.add_parser('next', help='Próximos cierres de plazo a partir de una fecha')
+    next_parser.add_argument('date', help="Fecha ('2024-04-15', '15/04/2024' o '15 de abril de 2024')")
+    next_parser.add_argument('--at', type=str, default=None, help="Hora concreta ('16:00')")
+    next_parser.add_argument('--limit', '-n', type=int, default=None, help='Número máximo de plazos')
+
+    for sub in (open_parser, next_parser):
+        sub.add_argument('--index', '-x', type=str, default=DEFAULT_TIMELINE_PATH, help='Fichero del calendario')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        documents = (document for path in args.input for document in load_documents(path))
+        timeline = DeadlineTimeline.build(documents)
+        timeline.save(args.output)
+        print(f"Calendario con {len(timeline)} plazos de {len(timeline.years)} cursos guardado en {args.output}")
+        return
+
+    timeline = DeadlineTimeline.load(args.index)
+    try:
+        first, last = moment_bounds(args.date, args.at)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    if args.command == 'open':
+        entries = timeline.open_on(first, last)
+        _print_entries(f"Plazos abiertos el {args.date}{' a las ' + args.at if args.at else ''}", entries,
+                       time.perf_counter() - start)
+    else:
+        entries = timeline.closing_after(first, args.limit)
+        _print_entries(f"Plazos que terminan a partir del {args.date}", entries, time.perf_counter() - start)
+    sys.exit(0 if entries else 1)
+
+
+if __name__ == "__main__":
+    main()
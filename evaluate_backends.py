@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Evaluación de precisión frente a velocidad de los backends de extracción.
+
+Para cada backend (PyMuPDF, pdfminer, PyPDF2) y cada campo (enseñanzas, componentes,
+umbrales, plazos y requisitos) se calculan la precisión y la exhaustividad (recall)
+respecto a ficheros de referencia anotados a mano, junto con el tiempo de extracción por
+documento. El resultado es una tabla de Pareto por campo: los backends que no son a la
+vez peores y más lentos que otro, y el recomendado para producción (mayor F1 y, a
+igualdad, el más rápido).
+
+Ficheros de referencia (``gold/<documento>.json``, con el mismo nombre que el PDF)::
+
+    {
+      "academic_year": "2022-2023",
+      "studies": ["Primer y segundo cursos de bachillerato.", ...],
+      "components": [{"type": "Cuantía fija ligada a la renta", "amount": "1.700,00"}, ...],
+      "thresholds": [{"number": 1, "family_size": 1, "amount": "8.422"}, ...],
+      "deadlines": [{"type": "Estudiantes universitarios", "deadline": "12 de mayo de 2022"}, ...],
+      "requirements": [{"area": "Ciencias", "percentage": "65%"}, {"grade": "5,00"}, ...]
+    }
+
+Los elementos se comparan normalizados (sin tildes, mayúsculas ni puntuación; los
+importes como número), de modo que una descripción truncada o un importe mal leído
+cuentan como fallo. ``--bootstrap BACKEND`` escribe plantillas de referencia a partir de
+la salida de un backend para revisarlas a mano.
+
+Uso:
+python evaluate_backends.py --input corpus --gold gold
+python evaluate_backends.py --source txt --input corpus_txt
+python evaluate_backends.py --bootstrap pdfminer --input corpus
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import contextlib
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+
+from models import Document
+from article_index import normalize
+from spanish_numbers import parse_amount
+from benchmark_backends import BACKENDS, load_backend
+
+FIELDS = ('studies', 'components', 'thresholds', 'deadlines', 'requirements')
+GOLD_DIR = './gold'
+
+
+def _text_key(text: Optional[str]) -> str:
+    """Texto sin tildes, mayúsculas, puntuación ni espacios repetidos."""
+    return ' '.join(re.sub(r'[^\w%]+', ' ', normalize(text or '')).split())
+
+
+def _amount_key(raw: Any) -> str:
+    """Importe como número con dos decimales ('' si no hay importe interpretable)."""
+    value = parse_amount(str(raw)) if raw not in (None, '') else float('nan')
+    return '' if value != value else f"{value:.2f}"
+
+
+def gold_items(gold: Dict[str, Any]) -> Dict[str, Counter]:
+    """Elementos comparables de un fichero de referencia, por campo."""
+    return {
+        'studies': Counter(_text_key(study) for study in gold.get('studies', [])),
+        'components': Counter((_text_key(c.get('type')), _amount_key(c.get('amount')))
+                              for c in gold.get('components', [])),
+        'thresholds': Counter((int(t['number']), str(t['family_size']), _amount_key(t.get('amount')))
+                              for t in gold.get('thresholds', [])),
+        'deadlines': Counter(_text_key(d.get('deadline')) for d in gold.get('deadlines', [])),
+        'requirements': Counter((_text_key(r.get('area')), _text_key(r.get('percentage') or r.get('grade')))
+                                for r in gold.get('requirements', []))
+    }
+
+
+def predicted_items(document: Document) -> Dict[str, Counter]:
+    """Elementos comparables extraídos por un backend, por campo."""
+    return {
+        'studies': Counter(_text_key(re.sub(r'^\s*[\w\d]{1,3}\)\s*', '', study.description))
+                           for study in document.non_university_studies + document.university_studies),
+        'components': Counter((_text_key(c.type), _amount_key(c.amount)) for c in document.components),
+        'thresholds': Counter((t.number, family.size, _amount_key(family.amount))
+                              for t in document.thresholds for family in t.family_sizes),
+        'deadlines': Counter(_text_key(d.deadline) for d in document.deadlines),
+        'requirements': Counter((_text_key(r.area), _text_key(r.percentage or r.grade)) for r in document.requirements)
+    }
+
+
+def to_gold(document: Document) -> Dict[str, Any]:
+    """Plantilla de referencia a partir de un resultado (para revisarla a mano)."""
+    return {
+        "reviewed": False,
+        "academic_year": document.academic_year,
+        "studies": [re.sub(r'^\s*[\w\d]{1,3}\)\s*', '', study.description)
+                    for study in document.non_university_studies + document.university_studies],
+        "components": [{"type": c.type, "amount": c.amount or ""} for c in document.components],
+        "thresholds": [{"number": t.number, "family_size": int(f.size) if f.size.isdigit() else f.size,
+                        "amount": f.amount}
+                       for t in document.thresholds for f in t.family_sizes],
+        "deadlines": [{"type": d.type, "deadline": d.deadline} for d in document.deadlines],
+        "requirements": [{"area": r.area or r.type, **({"percentage": r.percentage} if r.percentage else {}),
+                          **({"grade": r.grade} if r.grade else {})}
+                         for r in document.requirements]
+    }
+
+
+def _gold_stem(path: str) -> str:
+    """Nombre del documento sin extensión ni el sufijo '_text' de los textos de ``corpus_txt``."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem[:-len('_text')] if stem.endswith('_text') else stem
+
+
+def evaluate_backend(backend: str, paths: List[str], golds: Dict[str, Dict[str, Any]],
+                     source: str) -> Optional[Dict[str, Any]]:
+    """
+    Ejecuta un backend sobre los documentos con referencia y acumula aciertos y tiempos.
+
+    Returns:
+        Resultado por campo (tp, predichos, esperados) y tiempos, o None si el backend
+        no está instalado
+    """
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            extract_text, analyze = load_backend(backend)
+    except ImportError as e:
+        print(f"⚠️ {backend} no disponible: {e}")
+        return None
+
+    counts = {field: {"tp": 0, "predicted": 0, "expected": 0} for field in FIELDS}
+    seconds = 0.0
+    documents = 0
+    for path in paths:
+        gold = golds.get(_gold_stem(path))
+        if gold is None:
+            continue
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if source == 'pdf':
+                text = extract_text(path)
+            else:
+                with open(path, 'r', encoding='utf-8') as file:
+                    text = file.read()
+            document = Document.from_dict(analyze(text, path))
+        seconds += time.perf_counter() - start
+        documents += 1
+
+        expected = gold_items(gold)
+        predicted = predicted_items(document)
+        for field in FIELDS:
+            counts[field]["tp"] += sum((expected[field] & predicted[field]).values())
+            counts[field]["predicted"] += sum(predicted[field].values())
+            counts[field]["expected"] += sum(expected[field].values())
+
+    return {"documents": documents, "seconds": seconds, "fields": counts}
+
+
+def scores(counts: Dict[str, int]) -> Tuple[float, float, float]:
+    """Precisión, exhaustividad y F1 de unos recuentos (0 si no hay elementos)."""
+    precision = counts["tp"] / counts["predicted"] if counts["predicted"] else 0.0
+    recall = counts["tp"] / counts["expected"] if counts["expected"] else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def pareto_table(results: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Tabla por campo con precisión, exhaustividad, F1 y segundos por documento de cada backend.
+
+    Un backend está en la frontera de Pareto de un campo si ningún otro tiene a la vez
+    mayor o igual F1 y menor o igual tiempo (con al menos una mejora estricta).
+    """
+    table = {}
+    for field in FIELDS:
+        rows = []
+        for backend, result in results.items():
+            precision, recall, f1 = scores(result["fields"][field])
+            per_document = result["seconds"] / result["documents"] if result["documents"] else 0.0
+            rows.append({"backend": backend, "precision": precision, "recall": recall,
+                         "f1": f1, "seconds_per_document": per_document})
+
+        # La frontera y el orden se calculan con los valores sin redondear: dos backends
+        # con el mismo tiempo a cuatro decimales no son necesariamente igual de rápidos
+        for row in rows:
+            row["pareto"] = not any(
+                other["f1"] >= row["f1"] and other["seconds_per_document"] <= row["seconds_per_document"]
+                and (other["f1"] > row["f1"] or other["seconds_per_document"] < row["seconds_per_document"])
+                for other in rows if other is not row
+            )
+        rows.sort(key=lambda row: (-row["f1"], row["seconds_per_document"]))
+        for row in rows:
+            for key in ("precision", "recall", "f1", "seconds_per_document"):
+                row[key] = round(row[key], 4)
+        if rows:
+            rows[0]["recommended"] = True
+        table[field] = rows
+    return table
+
+
+def print_table(table: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Imprime la tabla de Pareto de cada campo."""
+    for field, rows in table.items():
+        print(f"\n📋 {field}")
+        print(f"   {'backend':<10} {'precisión':>10} {'recall':>8} {'F1':>8} {'s/doc':>9}  Pareto")
+        for row in rows:
+            mark = "★" if row.get("recommended") else ("•" if row["pareto"] else "")
+            print(f"   {row['backend']:<10} {row['precision']:>10.3f} {row['recall']:>8.3f} {row['f1']:>8.3f} "
+                  f"{row['seconds_per_document']:>9.3f}  {mark}")
+    print("\n★ recomendado (mayor F1; a igualdad, el más rápido)   • en la frontera de Pareto")
+
+
+def main():
+    """Evalúa los backends contra las referencias (o genera plantillas con --bootstrap)."""
+    parser = argparse.ArgumentParser(description='Precisión frente a velocidad de los backends de extracción')
+    parser.add_argument('--input', '-i', type=str, default='./corpus', help='Directorio con los documentos')
+    parser.add_argument('--source', choices=('pdf', 'txt'), default='pdf',
+                        help='pdf: cada backend extrae el texto del PDF; txt: solo se evalúa el análisis de campos')
+    parser.add_argument('--gold', '-g', type=str, default=GOLD_DIR, help='Directorio de las referencias')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS), help='Backends a evaluar')
+    parser.add_argument('--output', '-o', type=str, default=None, help='Guarda la tabla en este fichero JSON')
+    parser.add_argument('--bootstrap', choices=BACKENDS, default=None,
+                        help='Escribe plantillas de referencia con la salida de este backend (no sobrescribe)')
+    args = parser.parse_args()
+
+    extension = '.pdf' if args.source == 'pdf' else '.txt'
+    paths = sorted(os.path.join(args.input, f) for f in os.listdir(args.input) if f.endswith(extension))
+    if not paths:
+        print(f"No se encontraron documentos {extension} en {args.input}")
+        sys.exit(1)
+
+    # Los extractores informan en el log de cada documento; aquí solo estorba
+    logging.disable(logging.CRITICAL)
+
+    if args.bootstrap:
+        extract_text, analyze = load_backend(args.bootstrap)
+        os.makedirs(args.gold, exist_ok=True)
+        for path in paths:
+            gold_path = os.path.join(args.gold, f"{_gold_stem(path)}.json")
+            if os.path.exists(gold_path):
+                print(f"   {gold_path} ya existe, no se sobrescribe")
+                continue
+            with contextlib.redirect_stdout(io.StringIO()):
+                if args.source == 'pdf':
+                    text = extract_text(path)
+                else:
+                    with open(path, 'r', encoding='utf-8') as file:
+                        text = file.read()
+                document = Document.from_dict(analyze(text, path))
+            with open(gold_path, 'w', encoding='utf-8') as file:
+                json.dump(to_gold(document), file, ensure_ascii=False, indent=2)
+            print(f"📝 Plantilla guardada en {gold_path} (revísala y marca \"reviewed\": true)")
+        return
+
+    golds = {}
+    if os.path.isdir(args.gold):
+        for name in sorted(os.listdir(args.gold)):
+            if name.endswith('.json'):
+                with open(os.path.join(args.gold, name), 'r', encoding='utf-8') as file:
+                    golds[os.path.splitext(name)[0]] = json.load(file)
+    unreviewed = [stem for stem, gold in golds.items() if gold.get("reviewed") is False]
+    if unreviewed:
+        print(f"⚠️ Referencias sin revisar: {', '.join(unreviewed)}")
+    if not any(_gold_stem(path) in golds for path in paths):
+        print(f"No hay referencias en {args.gold} para los documentos de {args.input}")
+        sys.exit(1)
+
+    results = {}
+    for backend in args.backends:
+        print(f"⏱️ Evaluando {backend}...", flush=True)
+        result = evaluate_backend(backend, paths, golds, args.source)
+        if result is not None:
+            results[backend] = result
+
+    if not results:
+        print("Ningún backend disponible")
+        sys.exit(1)
+
+    table = pareto_table(results)
+    print_table(table)
+
+    if args.output:
+        report = {"source": args.source, "input": os.path.abspath(args.input),
+                  "documents": {backend: result["documents"] for backend, result in results.items()},
+                  "fields": table}
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"💾 Tabla guardada en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
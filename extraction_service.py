@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Servicio HTTP local de extracción de convocatorias de becas.
+
+Mantiene un conjunto de procesos trabajadores "calientes" que importan pdfminer y el
+extractor, compilan los patrones y configuran el logging una sola vez al arrancar.
+Las peticiones que llegan a la vez se agrupan en lotes durante una ventana corta y
+se reparten entre los trabajadores, de modo que cada documento solo paga el coste
+de su propia extracción.
+
+Peticiones:
+- ``POST /extract?mode=simple|full&filename=ayudas_22-23.pdf`` con el PDF (o el texto)
+  como cuerpo de la petición (``application/pdf``, ``application/octet-stream`` o ``text/plain``)
+- ``POST /extract`` con un JSON ``{"path": "...", "mode": "simple"}`` o ``{"paths": [...], "mode": "full"}``
+  (solo si el servicio se arranca con ``--root``, y con rutas dentro de ese directorio; las
+  relativas se resuelven respecto a él)
+- ``GET /health`` con el estado del servicio
+
+Uso:
+python extraction_service.py --port 8765 --workers 4
+curl -X POST --data-binary @corpus/ayudas_22-23.pdf -H "Content-Type: application/pdf" \\
+     "http://127.0.0.1:8765/extract?filename=ayudas_22-23.pdf&mode=simple"
+"""
+
+import os
+import json
+import time
+import queue
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from functools import partial
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger("ExtractionService")
+
+MODES = ('simple', 'full')
+
+# Extractor propio de cada proceso trabajador (se crea una vez en _init_worker)
+_worker_extractor = None
+
+
+def _init_worker(warmup_path: Optional[str]) -> None:
+    """Precarga el extractor en el proceso trabajador."""
+    global _worker_extractor
+    from pdf_miner_extractor_2 import BecasExtractor
+
+    _worker_extractor = BecasExtractor(input_dir='.', output_dir=tempfile.gettempdir())
+
+    # Una extracción completa de prueba deja compiladas en la caché de re todas las expresiones
+    if warmup_path:
+        try:
+            _extract_one(("warmup", os.path.basename(warmup_path), warmup_path, None, 'full'))
+        except Exception as e:
+            logger.warning(f"Error en la extracción de calentamiento de {warmup_path}: {str(e)}")
+
+
+def _extract_one(item: Tuple[str, str, Optional[str], Optional[bytes], str]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extrae un documento en el proceso trabajador.
+
+    Args:
+        item: (id de petición, nombre de fichero, ruta, contenido, modo); se usa la ruta
+            si se indica y, si no, el contenido recibido en la petición
+
+    Returns:
+        (id de petición, respuesta)
+    """
+    request_id, filename, path, content, mode = item
+    extractor = _worker_extractor
+    start = time.perf_counter()
+
+    try:
+        if path is None and filename.lower().endswith('.pdf'):
+            # pdfminer trabaja sobre ficheros: el PDF recibido se guarda temporalmente
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+                tmp.write(content)
+            try:
+                text = extractor.extract_text_from_pdf(tmp.name)
+            finally:
+                os.unlink(tmp.name)
+        elif path is None:
+            text = content.decode('utf-8')
+        elif path.lower().endswith('.pdf'):
+            text = extractor.extract_text_from_pdf(path)
+        else:
+            with open(path, 'r', encoding='utf-8') as file:
+                text = file.read()
+
+        if not text:
+            return request_id, {"status": 422, "error": f"No se pudo extraer texto de {filename}"}
+
+        data = extractor.extract_data(text, filename)
+        if not data['valid']:
+            return request_id, {"status": 422, "error": f"{filename} no parece una convocatoria de becas válida",
+                                "result": data}
+
+        result = extractor.create_simplified_json(data) if mode == 'simple' else data
+        return request_id, {"status": 200, "result": result,
+                            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+    except Exception as e:
+        logger.error(f"Error al extraer {filename}: {str(e)}")
+        return request_id, {"status": 500, "error": str(e)}
+
+
+class BatchDispatcher:
+    """Agrupa las peticiones concurrentes en lotes y las reparte entre los trabajadores."""
+
+    def __init__(self, workers: int, batch_window: float = 0.02, max_batch: int = 32,
+                 warmup_path: Optional[str] = None):
+        """
+        Inicializa el despachador y arranca los procesos trabajadores.
+
+        Args:
+            workers: Número de procesos trabajadores
+            batch_window: Tiempo máximo (segundos) que se espera a otras peticiones para formar un lote
+            max_batch: Tamaño máximo de un lote
+            warmup_path: Documento que cada trabajador extrae al arrancar para calentar sus cachés
+        """
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(warmup_path,))
+        self.pending: "queue.Queue[Tuple[Tuple, Future]]" = queue.Queue()
+        self.processed = 0
+        self.batches = 0
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="batch-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, filename: str, path: Optional[str], content: Optional[bytes], mode: str) -> Future:
+        """Encola un documento y devuelve un futuro con la respuesta."""
+        with self._lock:
+            self._counter += 1
+            request_id = str(self._counter)
+        future = Future()
+        self.pending.put(((request_id, filename, path, content, mode), future))
+        return future
+
+    def _run(self) -> None:
+        """Forma lotes con las peticiones que llegan dentro de la ventana y los envía al pool."""
+        while not self._stopped.is_set():
+            try:
+                first = self.pending.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Tuple, Future]]) -> None:
+        """
+        Reparte un lote entre los trabajadores. Cada documento se envía por separado, de
+        modo que su petición se responde en cuanto termina, sin esperar al más lento del lote.
+        """
+        with self._lock:
+            self.batches += 1
+        for item, future in batch:
+            self.pool.apply_async(_extract_one, (item,), callback=partial(self._on_done, future),
+                                  error_callback=partial(self._on_error, future))
+
+    def _on_done(self, future: Future, result: Tuple[str, Dict[str, Any]]) -> None:
+        future.set_result(result[1])
+        with self._lock:
+            self.processed += 1
+
+    @staticmethod
+    def _on_error(future: Future, error: BaseException) -> None:
+        if not future.done():
+            future.set_result({"status": 500, "error": str(error)})
+
+    def close(self) -> None:
+        """Detiene el despachador y los trabajadores."""
+        self._stopped.set()
+        self._thread.join()
+        self.pool.close()
+        self.pool.join()
+
+
+class ExtractionHandler(BaseHTTPRequestHandler):
+    """Manejador HTTP del servicio de extracción."""
+
+    dispatcher: BatchDispatcher = None
+    root_dir: Optional[str] = None
+    request_timeout: float = 300.0
+    max_upload_bytes: int = 50 * 1024 * 1024
+
+    def do_GET(self):
+        if urlparse(self.path).path != '/health':
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+        self._send_json(200, {
+            "status": "ok",
+            "workers": self.dispatcher.workers,
+            "processed": self.dispatcher.processed,
+            "batches": self.dispatcher.batches
+        })
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/extract':
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+
+        params = parse_qs(url.query)
+        # Sin Content-Length (p. ej. con Transfer-Encoding: chunked) no se sabe cuánto leer
+        if self.headers.get('Content-Length') is None:
+            self._send_json(411, {"error": "Falta la cabecera Content-Length"})
+            return
+        try:
+            length = int(self.headers['Content-Length'])
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {"error": "Content-Length no válido"})
+            return
+        if length > self.max_upload_bytes:
+            self._send_json(413, {"error": "Documento demasiado grande"})
+            return
+        body = self.rfile.read(length)
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip()
+
+        try:
+            if content_type == 'application/json':
+                request = json.loads(body.decode('utf-8'))
+                if not isinstance(request, dict):
+                    raise ValueError("Se esperaba un objeto JSON con 'path' o 'paths'")
+                if self.root_dir is None:
+                    self._send_json(403, {"error": "Las rutas locales solo se aceptan si el servicio se arranca con --root"})
+                    return
+                mode = request.get('mode', params.get('mode', ['simple'])[0])
+                paths = request.get('paths') or [request.get('path')]
+                if not isinstance(paths, list):
+                    raise ValueError("'paths' debe ser una lista de rutas")
+                jobs = [(os.path.basename(path), self._resolve_path(path), None) for path in paths]
+            else:
+                mode = params.get('mode', ['simple'])[0]
+                filename = params.get('filename', ['documento.pdf' if content_type != 'text/plain' else 'documento.txt'])[0]
+                jobs = [(os.path.basename(filename), None, body)]
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        if mode not in MODES:
+            self._send_json(400, {"error": f"Modo desconocido: {mode}. Disponibles: {', '.join(MODES)}"})
+            return
+
+        futures = [self.dispatcher.submit(filename, path, content, mode) for filename, path, content in jobs]
+        try:
+            responses = [future.result(timeout=self.request_timeout) for future in futures]
+        except FutureTimeoutError:
+            self._send_json(504, {"error": "Tiempo de extracción agotado"})
+            return
+
+        if len(responses) == 1:
+            response = responses[0]
+            self._send_json(response.pop("status"), response)
+        else:
+            self._send_json(200, {"results": responses})
+
+    def _resolve_path(self, path: Any) -> str:
+        """Valida una ruta local recibida en la petición (las relativas lo son a ``--root``)."""
+        if not isinstance(path, str) or not path:
+            raise ValueError("Se esperaba 'path' o 'paths' con rutas de documentos")
+        full_path = os.path.realpath(os.path.join(self.root_dir, path))
+        if os.path.commonpath([full_path, self.root_dir]) != self.root_dir:
+            raise ValueError(f"La ruta {path} está fuera del directorio permitido")
+        if not os.path.isfile(full_path):
+            raise ValueError(f"No existe el documento {path}")
+        return full_path
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s" % (self.address_string(), format % args))
+
+
+def main():
+    """Arranca el servicio de extracción."""
+    parser = argparse.ArgumentParser(description='Servicio HTTP local de extracción de becas')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Dirección de escucha')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto de escucha')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Procesos trabajadores')
+    parser.add_argument('--batch-window', type=float, default=20.0,
+                        help='Milisegundos que se esperan peticiones concurrentes para formar un lote')
+    parser.add_argument('--max-batch', type=int, default=32, help='Tamaño máximo de un lote')
+    parser.add_argument('--root', type=str, default=None,
+                        help='Directorio de los documentos que se pueden pedir por ruta local; sin él, '
+                             'solo se aceptan documentos en el cuerpo de la petición')
+    parser.add_argument('--warmup', type=str, default=None,
+                        help='Documento (PDF o texto) que cada trabajador extrae al arrancar')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    dispatcher = BatchDispatcher(args.workers, args.batch_window / 1000.0, args.max_batch, args.warmup)
+    ExtractionHandler.dispatcher = dispatcher
+    ExtractionHandler.root_dir = os.path.realpath(args.root) if args.root else None
+
+    server = ThreadingHTTPServer((args.host, args.port), ExtractionHandler)
+    print(f"🚀 Servicio de extracción en http://{args.host}:{args.port} con {args.workers} trabajadores")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Deteniendo el servicio...")
+    finally:
+        server.server_close()
+        dispatcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,91 @@ Permite verificar si los patrones de expresiones regulares funcionan correctamen
 para extraer información de los textos.
 
 Uso:
-python pattern_tester.py --input ./output --text-files "*_pymupdf.txt"
+python herramienta.py --input ./output --text-files "*_pymupdf.txt"
+
+Modo por lotes (sin menú): ejecuta todos los grupos de patrones sobre todos los textos
+en paralelo y guarda la matriz patrón × documento con el número de coincidencias y el
+tiempo de cada patrón:
+python herramienta.py --input ./corpus_txt --text-files "*.txt" --batch --workers 4 -o patrones.csv
 """
 
 import os
 import re
+import csv
+import json
 import glob
+import time
 import argparse
 from pathlib import Path
+from multiprocessing import Pool
+
+import regex_engine
+
+# Patrones de cada grupo: (expresión regular, descripción)
+ACADEMIC_YEAR_PATTERNS = [
+    (r'CURSO ACADÉMICO (\d{4}-\d{4})', "Patrón para 'CURSO ACADÉMICO YYYY-YYYY'"),
+    (r'curso académico (\d{4}-\d{4})', "Patrón para 'curso académico YYYY-YYYY'"),
+    (r'para el curso (\d{4}-\d{4})', "Patrón para 'para el curso YYYY-YYYY'"),
+    (r'BECAS.*?(\d{4}-\d{4})', "Patrón para 'BECAS... YYYY-YYYY'"),
+    (r'BECAS.*?CURSO.*?(\d{4}-\d{4})', "Patrón para 'BECAS... CURSO... YYYY-YYYY'")
+]
+
+AMOUNT_SECTION_PATTERNS = [
+    (r'(?:Artículo\s+\d+\.\s+Cuantías de las becas|CUANTÍAS DE LAS BECAS).*?(?=Artículo\s+\d+\.)', 
+     "Patrón para sección completa de cuantías"),
+    (r'Las cuantías.*?serán las siguientes:.*?(?=Artículo\s+\d+\.)', 
+     "Patrón para sección que comienza con 'Las cuantías...'"),
+    (r'(?:[A-F]\))([^A-F\)]+)(?=[A-F]\)|$)', 
+     "Patrón para componentes con letras mayúsculas (A), B), C)...)"),
+    (r'Cuantía fija ligada a la renta.*?(\d+[,.]\d+)\s*euros', 
+     "Patrón para 'Cuantía fija ligada a la renta'")
+]
+
+AMOUNT_COMPONENT_PATTERNS = [
+    (r'[Bb]eca.*?matrícula.*?(?:\.|$)', "Beca de matrícula"),
+    (r'[Cc]uantía.*?renta.*?(\d+[,.]\d+)\s*euros', "Cuantía ligada a renta"),
+    (r'[Cc]uantía.*?residencia.*?(\d+[,.]\d+)\s*euros', "Cuantía ligada a residencia"),
+    (r'[Cc]uantía.*?excelencia.*?(\d+[,.]\d+).*?(\d+[,.]\d+).*?(\d+)\s*euros', "Cuantía ligada a excelencia"),
+    (r'[Bb]eca básica.*?(\d+[,.]\d+)\s*euros', "Beca básica"),
+    (r'[Cc]uantía variable.*?mínimo.*?(\d+[,.]\d+)\s*euros', "Cuantía variable mínima")
+]
+
+INCOME_THRESHOLD_PATTERNS = [
+    (r'(?:Artículo\s+\d+\.\s+Umbrales de renta|UMBRALES DE RENTA).*?(?=Artículo\s+\d+\.)', 
+     "Patrón para sección completa de umbrales de renta"),
+    (r'Umbral 1:.*?Familias de .*?euros', 
+     "Patrón para Umbral 1 con al menos una familia"),
+    (r'Familias de (\w+) miembros?:\s+(\d+[.,]\d+)', 
+     "Patrón para cada tamaño de familia")
+]
+
+DEADLINE_PATTERNS = [
+    (r'(?:Los plazos para presentar la solicitud|plazos? de presentación).*?(?:A\).*?B\).*?)(?:\d{1,2}\.|Artículo|$)', 
+     "Patrón para sección completa de plazos"),
+    (r'A\).*?(\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4}|El[ \t]+\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4})', 
+     "Patrón para fecha de plazo universitario"),
+    (r'B\).*?(\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4}|El[ \t]+\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4})', 
+     "Patrón para fecha de plazo no universitario")
+]
+
+REQUIREMENT_PATTERNS = [
+    (r'[Pp]ara la concesión de beca.*?primer curso de estudios de grado.*?(\d[,.]\d+).*?puntos', 
+     "Patrón para nota mínima de primer curso universitario"),
+    (r'[Pp]ara obtener beca los solicitantes de segundos y posteriores cursos.*?deberán haber superado.*?porcentajes', 
+     "Patrón para sección de porcentajes por área"),
+    (r'([A-Za-záéíóúñÁÉÍÓÚÑ\s\/]+)\s+(\d+)%', 
+     "Patrón para área y porcentaje")
+]
+
+# Grupos de patrones del modo por lotes
+PATTERN_GROUPS = {
+    'academic_year': ACADEMIC_YEAR_PATTERNS,
+    'amount_sections': AMOUNT_SECTION_PATTERNS,
+    'amount_components': AMOUNT_COMPONENT_PATTERNS,
+    'income_thresholds': INCOME_THRESHOLD_PATTERNS,
+    'application_deadlines': DEADLINE_PATTERNS,
+    'academic_requirements': REQUIREMENT_PATTERNS
+}
 
 def test_pattern(text, pattern_name, pattern, description):
     """Prueba un patrón y muestra los resultados."""
@@ -23,7 +100,9 @@ def test_pattern(text, pattern_name, pattern, description):
     print(f"{'-'*80}")
     
     try:
-        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
+        compiled = regex_engine.compile(pattern, re.DOTALL | re.IGNORECASE)
+        print(f"Motor: {compiled.engine}{f' ({compiled.reason})' if compiled.reason else ''}")
+        matches = compiled.findall(text)
         if matches:
             print(f"✅ Encontradas {len(matches)} coincidencias:")
             for i, match in enumerate(matches[:5], 1):
@@ -48,13 +127,7 @@ def test_pattern(text, pattern_name, pattern, description):
 
 def test_academic_year_pattern(text):
     """Prueba patrones para extraer el año académico."""
-    patterns = [
-        (r'CURSO ACADÉMICO (\d{4}-\d{4})', "Patrón para 'CURSO ACADÉMICO YYYY-YYYY'"),
-        (r'curso académico (\d{4}-\d{4})', "Patrón para 'curso académico YYYY-YYYY'"),
-        (r'para el curso (\d{4}-\d{4})', "Patrón para 'para el curso YYYY-YYYY'"),
-        (r'BECAS.*?(\d{4}-\d{4})', "Patrón para 'BECAS... YYYY-YYYY'"),
-        (r'BECAS.*?CURSO.*?(\d{4}-\d{4})', "Patrón para 'BECAS... CURSO... YYYY-YYYY'")
-    ]
+    patterns = ACADEMIC_YEAR_PATTERNS
     
     print("\n=== PRUEBA DE PATRONES: AÑO ACADÉMICO ===")
     
@@ -69,16 +142,7 @@ def test_academic_year_pattern(text):
 
 def test_scholarship_amounts_pattern(text):
     """Prueba patrones para extraer montos de becas."""
-    patterns = [
-        (r'(?:Artículo\s+\d+\.\s+Cuantías de las becas|CUANTÍAS DE LAS BECAS).*?(?=Artículo\s+\d+\.)', 
-         "Patrón para sección completa de cuantías"),
-        (r'Las cuantías.*?serán las siguientes:.*?(?=Artículo\s+\d+\.)', 
-         "Patrón para sección que comienza con 'Las cuantías...'"),
-        (r'(?:[A-F]\))([^A-F\)]+)(?=[A-F]\)|$)', 
-         "Patrón para componentes con letras mayúsculas (A), B), C)...)"),
-        (r'Cuantía fija ligada a la renta.*?(\d+[,.]\d+)\s*euros', 
-         "Patrón para 'Cuantía fija ligada a la renta'")
-    ]
+    patterns = AMOUNT_SECTION_PATTERNS
     
     print("\n=== PRUEBA DE PATRONES: MONTOS DE BECAS ===")
     
@@ -111,14 +175,7 @@ def test_scholarship_amounts_pattern(text):
         section_text = text
     
     # Ahora buscar componentes específicos en la sección encontrada
-    component_patterns = [
-        (r'[Bb]eca.*?matrícula.*?(?:\.|$)', "Beca de matrícula"),
-        (r'[Cc]uantía.*?renta.*?(\d+[,.]\d+)\s*euros', "Cuantía ligada a renta"),
-        (r'[Cc]uantía.*?residencia.*?(\d+[,.]\d+)\s*euros', "Cuantía ligada a residencia"),
-        (r'[Cc]uantía.*?excelencia.*?(\d+[,.]\d+).*?(\d+[,.]\d+).*?(\d+)\s*euros', "Cuantía ligada a excelencia"),
-        (r'[Bb]eca básica.*?(\d+[,.]\d+)\s*euros', "Beca básica"),
-        (r'[Cc]uantía variable.*?mínimo.*?(\d+[,.]\d+)\s*euros', "Cuantía variable mínima")
-    ]
+    component_patterns = AMOUNT_COMPONENT_PATTERNS
     
     print("\n--- Buscando componentes específicos ---")
     components_found = 0
@@ -137,14 +194,7 @@ def test_scholarship_amounts_pattern(text):
 
 def test_income_thresholds_pattern(text):
     """Prueba patrones para extraer umbrales de renta."""
-    patterns = [
-        (r'(?:Artículo\s+\d+\.\s+Umbrales de renta|UMBRALES DE RENTA).*?(?=Artículo\s+\d+\.)', 
-         "Patrón para sección completa de umbrales de renta"),
-        (r'Umbral 1:.*?Familias de .*?euros', 
-         "Patrón para Umbral 1 con al menos una familia"),
-        (r'Familias de (\w+) miembros?:\s+(\d+[.,]\d+)', 
-         "Patrón para cada tamaño de familia")
-    ]
+    patterns = INCOME_THRESHOLD_PATTERNS
     
     print("\n=== PRUEBA DE PATRONES: UMBRALES DE RENTA ===")
     
@@ -187,14 +237,7 @@ def test_income_thresholds_pattern(text):
 
 def test_application_deadlines_pattern(text):
     """Prueba patrones para extraer plazos de solicitud."""
-    patterns = [
-        (r'(?:Los plazos para presentar la solicitud|plazos? de presentación).*?(?:A\).*?B\).*?)(?:\d{1,2}\.|Artículo|$)', 
-         "Patrón para sección completa de plazos"),
-        (r'A\).*?(\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4}|El[ \t]+\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4})', 
-         "Patrón para fecha de plazo universitario"),
-        (r'B\).*?(\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4}|El[ \t]+\d{1,2}[ \t]+de[ \t]+\w+[ \t]+de[ \t]+\d{4})', 
-         "Patrón para fecha de plazo no universitario")
-    ]
+    patterns = DEADLINE_PATTERNS
     
     print("\n=== PRUEBA DE PATRONES: PLAZOS DE SOLICITUD ===")
     
@@ -241,14 +284,7 @@ def test_application_deadlines_pattern(text):
 
 def test_academic_requirements_pattern(text):
     """Prueba patrones para extraer requisitos académicos."""
-    patterns = [
-        (r'[Pp]ara la concesión de beca.*?primer curso de estudios de grado.*?(\d[,.]\d+).*?puntos', 
-         "Patrón para nota mínima de primer curso universitario"),
-        (r'[Pp]ara obtener beca los solicitantes de segundos y posteriores cursos.*?deberán haber superado.*?porcentajes', 
-         "Patrón para sección de porcentajes por área"),
-        (r'([A-Za-záéíóúñÁÉÍÓÚÑ\s\/]+)\s+(\d+)%', 
-         "Patrón para área y porcentaje")
-    ]
+    patterns = REQUIREMENT_PATTERNS
     
     print("\n=== PRUEBA DE PATRONES: REQUISITOS ACADÉMICOS ===")
     
@@ -330,4 +366,124 @@ def interactive_menu(text_files):
             test_application_deadlines_pattern(text)
             test_academic_requirements_pattern(text)
         elif pattern_choice == 7:
-            return interactive_menu
\ No newline at end of file
+            return interactive_menu(text_files)
+        elif pattern_choice == 8:
+            return
+
+def run_patterns_on_file(args):
+    """
+    Ejecuta los patrones de los grupos indicados sobre un archivo (modo por lotes).
+
+    Returns:
+        (nombre del archivo, lista de (coincidencias, milisegundos) en el orden de los patrones);
+        las coincidencias son -1 si el patrón no es válido
+    """
+    file_path, groups = args
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    cells = []
+    for group in groups:
+        for pattern, _ in PATTERN_GROUPS[group]:
+            start = time.perf_counter()
+            try:
+                count = len(regex_engine.compile(pattern, re.DOTALL | re.IGNORECASE).findall(text))
+            except re.error:
+                count = -1
+            cells.append((count, round((time.perf_counter() - start) * 1000, 3)))
+    return os.path.basename(file_path), cells
+
+def _engine(pattern):
+    """Motor con el que se ejecuta un patrón ('re2' o 're'), o 'error' si no es válido."""
+    try:
+        return regex_engine.compile(pattern, re.DOTALL | re.IGNORECASE).engine
+    except re.error:
+        return 'error'
+
+def run_batch(text_files, groups, workers=1):
+    """
+    Ejecuta todos los patrones de los grupos indicados sobre todos los archivos.
+
+    Returns:
+        Matriz con la lista de documentos y, por patrón, las coincidencias y los
+        milisegundos en cada documento (en el mismo orden que los documentos)
+    """
+    tasks = [(file_path, groups) for file_path in text_files]
+    if workers > 1:
+        with Pool(workers) as pool:
+            results = pool.map(run_patterns_on_file, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+    else:
+        results = [run_patterns_on_file(task) for task in tasks]
+
+    rows = [{"group": group, "index": i, "description": description, "pattern": pattern,
+             "engine": _engine(pattern)}
+            for group in groups for i, (pattern, description) in enumerate(PATTERN_GROUPS[group], 1)]
+    for row_index, row in enumerate(rows):
+        row["matches"] = [cells[row_index][0] for _, cells in results]
+        row["ms"] = [cells[row_index][1] for _, cells in results]
+        row["total_ms"] = round(sum(row["ms"]), 3)
+        row["documents_matched"] = sum(1 for count in row["matches"] if count > 0)
+    return {"documents": [name for name, _ in results], "patterns": rows}
+
+def write_matrix(matrix, output_path):
+    """Guarda la matriz en JSON o en CSV (una fila por patrón, dos columnas por documento)."""
+    if output_path.lower().endswith('.csv'):
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            header = ["group", "index", "description", "engine", "total_ms", "documents_matched"]
+            for document in matrix["documents"]:
+                header += [f"{document}:matches", f"{document}:ms"]
+            writer.writerow(header)
+            for row in matrix["patterns"]:
+                values = [row["group"], row["index"], row["description"], row["engine"], row["total_ms"],
+                          row["documents_matched"]]
+                for count, ms in zip(row["matches"], row["ms"]):
+                    values += [count, ms]
+                writer.writerow(values)
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(matrix, f, ensure_ascii=False, indent=2)
+
+def print_batch_summary(matrix):
+    """Muestra, por patrón, en cuántos documentos coincide y cuánto tarda en total."""
+    total = len(matrix["documents"])
+    print(f"\n=== RESUMEN ({total} documentos) ===")
+    print(f"{'grupo':<24} {'nº':>3} {'motor':<5} {'docs':>9} {'total ms':>10}  descripción")
+    for row in sorted(matrix["patterns"], key=lambda r: -r["total_ms"]):
+        print(f"{row['group']:<24} {row['index']:>3} {row['engine']:<5} {row['documents_matched']:>4}/{total:<4} "
+              f"{row['total_ms']:>10.1f}  {row['description'][:60]}")
+
+def main():
+    """Punto de entrada: menú interactivo o modo por lotes."""
+    parser = argparse.ArgumentParser(description='Prueba de patrones de extracción sobre textos de convocatorias')
+    parser.add_argument('--input', '-i', type=str, default='./output', help='Directorio con los textos')
+    parser.add_argument('--text-files', type=str, default='*.txt', help='Patrón glob de los archivos de texto')
+    parser.add_argument('--batch', action='store_true', help='Ejecuta todos los patrones sobre todos los archivos sin menú')
+    parser.add_argument('--groups', nargs='+', choices=list(PATTERN_GROUPS), default=list(PATTERN_GROUPS),
+                        help='Grupos de patrones del modo por lotes')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1, help='Procesos del modo por lotes')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                        help='Fichero de la matriz del modo por lotes (.json o .csv)')
+    args = parser.parse_args()
+
+    text_files = sorted(glob.glob(os.path.join(args.input, args.text_files)))
+
+    if not args.batch:
+        interactive_menu(text_files)
+        return
+
+    if not text_files:
+        print("No se encontraron archivos de texto para analizar.")
+        return
+
+    start = time.perf_counter()
+    matrix = run_batch(text_files, args.groups, args.workers)
+    print_batch_summary(matrix)
+    print(f"\nTiempo total: {time.perf_counter() - start:.2f} s con {args.workers} procesos")
+
+    if args.output:
+        write_matrix(matrix, args.output)
+        print(f"Matriz guardada en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Autómata de Aho–Corasick para buscar varias palabras clave fijas en una sola pasada.
+
+La validación del documento, la limpieza de líneas de pdfminer y la detección de las
+secciones del Artículo 3 buscaban cada una sus literales con búsquedas separadas sobre
+el mismo texto. ``KeywordAutomaton`` recorre el texto una vez y devuelve todas las
+apariciones (también las solapadas) de todas las palabras clave, con su posición.
+
+- Si está instalado ``pyahocorasick`` (``pip install pyahocorasick``) el recorrido se
+  hace en C; si no, con una implementación en Python que salta con una expresión
+  regular los tramos en los que no empieza ninguna palabra clave.
+- Las palabras clave pueden distinguir mayúsculas o no; las posiciones siempre se
+  refieren al texto original.
+- ``PatternPrefilter`` deduce de cada expresión regular el literal que toda coincidencia
+  debe contener (``Enseñanzas`` en ``Artículo\\s+3\\s*\\.\\s*Enseñanzas``) y solo ejecuta
+  la expresión si el autómata ha encontrado ese literal. Sin distinguir mayúsculas, el
+  texto se pliega como en ``re.IGNORECASE`` ('ſ', 'S' y 's' son la misma letra); los
+  literales con letras que se pliegan en varias ('ß') no se filtran. El resultado es el
+  mismo que ejecutar todas las expresiones.
+- ``document_prefilter()`` es el filtro compartido de los patrones de validación del
+  paquete de patrones, los filtros de limpieza y las palabras de las secciones; recuerda
+  los últimos textos recorridos, de modo que varias comprobaciones sobre el mismo texto
+  comparten la pasada.
+"""
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from collections import deque, OrderedDict
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
+
+try:
+    import re._parser as sre_parse
+    import re._constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+import regex_engine
+from pattern_pack import current_pack
+
+# Literales más cortos no merecen el filtro: aparecen en casi cualquier texto
+MIN_LITERAL_LENGTH = 3
+# Textos cuyo recorrido se recuerda en cada filtro
+SCAN_CACHE_SIZE = 4
+
+# Expresiones de las líneas que la limpieza de pdfminer descarta (códigos CSV y firma)
+CLEANUP_LINE_PATTERNS = (
+    r'CSV\s*:\s*GEN-[a-zA-Z0-9-]+',
+    r'DIRECCIÓN DE VALIDACIÓN',
+    r'FIRMANTE\(\d+\)',
+    r'Código\s+seguro\s+de\s+Verificación',
+    r'consultaCSV'
+)
+# Palabras que marcan las secciones de estudios del Artículo 3
+SECTION_KEYWORDS = ('postobligatorias', 'universitarias')
+
+
+# Equivalencias de ``re.IGNORECASE`` que ``str.casefold()`` no recoge (la i turca)
+_EXTRA_FOLDS = {'ı': 'i', 'İ': 'i'}
+_EXTRA_FOLD_TABLE = str.maketrans(_EXTRA_FOLDS)
+
+
+def _fold_char(char: str) -> str:
+    if char in _EXTRA_FOLDS:
+        return _EXTRA_FOLDS[char]
+    for folded in (char.casefold(), char.lower()):
+        if len(folded) == 1:
+            return folded
+    return char
+
+
+def _fold(text: str) -> str:
+    """
+    Plegado de mayúsculas como el de ``re.IGNORECASE`` ('ſ' y 'S' pasan a 's'), sin
+    cambiar la longitud del texto (para conservar las posiciones).
+    """
+    folded = text.casefold()
+    if len(folded) == len(text):
+        return folded.translate(_EXTRA_FOLD_TABLE)
+    # Algún carácter cambia de longitud al plegarlo (p. ej. 'ß'): se pliega carácter a carácter
+    return ''.join(_fold_char(char) for char in text)
+
+
+def _foldable(literal: str) -> bool:
+    """Si el literal se puede buscar sin distinguir mayúsculas con ``_fold``."""
+    return all(len(char.casefold()) == 1 or char in _EXTRA_FOLDS for char in literal)
+
+
+class KeywordAutomaton:
+    """Autómata de Aho–Corasick sobre un conjunto de palabras clave."""
+
+    def __init__(self, keywords: Iterable[str] = (), ignore_case: Iterable[str] = ()):
+        """
+        Construye el autómata.
+
+        Args:
+            keywords: Palabras clave que distinguen mayúsculas
+            ignore_case: Palabras clave que no distinguen mayúsculas
+        """
+        exact = [keyword for keyword in keywords if keyword]
+        insensitive = [keyword for keyword in ignore_case if keyword]
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(exact + insensitive))
+        self._exact = set(exact) - set(insensitive)
+
+        # Todas las palabras se buscan plegadas; las que distinguen mayúsculas se
+        # comprueban después contra el texto original
+        entries: Dict[str, List[str]] = {}
+        for keyword in self.keywords:
+            entries.setdefault(_fold(keyword), []).append(keyword)
+
+        self._native = None
+        if AHOCORASICK_AVAILABLE and entries:
+            automaton = ahocorasick.Automaton()
+            for key, originals in entries.items():
+                automaton.add_word(key, (len(key), originals))
+            automaton.make_automaton()
+            self._native = automaton
+        else:
+            self._build(entries)
+
+    def _build(self, entries: Dict[str, List[str]]) -> None:
+        """Construye las transiciones, los enlaces de fallo y las salidas en Python."""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[Tuple[int, List[str]]]] = [[]]
+        for key, originals in entries.items():
+            state = 0
+            for char in key:
+                if char not in goto[state]:
+                    goto.append({})
+                    output.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            output[state].append((len(key), originals))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                target = fail[state]
+                while target and char not in goto[target]:
+                    target = fail[target]
+                fail[child] = goto[target].get(char, 0)
+                output[child] = output[child] + output[fail[child]]
+
+        self._goto, self._fail, self._output = goto, fail, output
+        first_chars = ''.join(sorted(goto[0]))
+        self._skip = re.compile(f"[{re.escape(first_chars)}]") if first_chars else None
+
+    def _folded_hits(self, folded: str) -> Iterator[Tuple[int, int, List[str]]]:
+        """Apariciones (inicio, fin, palabras originales) sobre el texto plegado."""
+        if self._native is not None:
+            for end, (length, originals) in self._native.iter(folded):
+                yield end + 1 - length, end + 1, originals
+            return
+        if self._skip is None:
+            return
+
+        goto, fail, output, skip = self._goto, self._fail, self._output, self._skip.search
+        state, position, size = 0, 0, len(folded)
+        while position < size:
+            if state == 0:
+                # En la raíz se salta directamente al siguiente carácter que inicia alguna palabra
+                match = skip(folded, position)
+                if match is None:
+                    return
+                position = match.start()
+            char = folded[position]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            position += 1
+            for length, originals in output[state]:
+                yield position - length, position, originals
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Todas las apariciones (inicio, fin, palabra clave), ordenadas por posición final."""
+        for start, end, originals in self._folded_hits(_fold(text)):
+            for keyword in originals:
+                if keyword in self._exact and text[start:end] != keyword:
+                    continue
+                yield start, end, keyword
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """Posiciones de inicio de cada palabra clave (lista vacía si no aparece)."""
+        hits: Dict[str, List[int]] = {keyword: [] for keyword in self.keywords}
+        for start, _, keyword in self.finditer(text):
+            hits[keyword].append(start)
+        for positions in hits.values():
+            positions.sort()
+        return hits
+
+
+def required_literal(pattern: str, flags: int = 0) -> Optional[str]:
+    """
+    Literal más largo que aparece en toda coincidencia de una expresión regular.
+
+    Solo se consideran los literales del nivel superior del patrón (no los de
+    alternativas, repeticiones ni grupos). Devuelve None si no hay ninguno de al menos
+    ``MIN_LITERAL_LENGTH`` caracteres.
+    """
+    best, run = "", []
+    for op, value in sre_parse.parse(pattern, flags):
+        if op is sre_constants.LITERAL:
+            run.append(chr(value))
+            continue
+        if len(run) > len(best):
+            best = ''.join(run)
+        run = []
+    if len(run) > len(best):
+        best = ''.join(run)
+    return best if len(best) >= MIN_LITERAL_LENGTH else None
+
+
+def _pattern_key(pattern: Any) -> Tuple[str, int]:
+    return pattern.pattern, pattern.flags
+
+
+class PatternPrefilter:
+    """Expresiones regulares que solo se ejecutan si su literal obligatorio aparece en el texto."""
+
+    def __init__(self, patterns: Sequence[Any], keywords: Iterable[str] = ()):
+        """
+        Args:
+            patterns: Patrones compilados (``re.Pattern`` o de ``regex_engine``)
+            keywords: Palabras clave adicionales (distinguen mayúsculas) que se buscan
+                en la misma pasada
+        """
+        self.patterns = list(patterns)
+        self.literals = [self._prefilter_literal(pattern) for pattern in self.patterns]
+        # Por texto y flags del patrón: los llamadores pueden tener otros objetos compilados
+        # de los mismos patrones (p. ej. de otro ``current_pack()`` tras una recarga)
+        self._literal_of = {_pattern_key(pattern): literal for pattern, literal in zip(self.patterns, self.literals)}
+        exact, insensitive = list(keywords), []
+        for pattern, literal in zip(self.patterns, self.literals):
+            if literal:
+                (insensitive if pattern.flags & re.IGNORECASE else exact).append(literal)
+        self.automaton = KeywordAutomaton(exact, insensitive)
+        self._scans: "OrderedDict[str, Dict[str, List[int]]]" = OrderedDict()
+
+    @staticmethod
+    def _prefilter_literal(pattern: Any) -> Optional[str]:
+        """
+        Literal obligatorio del patrón, o None si no lo tiene o si, sin distinguir
+        mayúsculas, su plegado cambia de longitud ('ß' equivale a 'ẞ' en ``re`` pero se
+        pliega a 'ss'): esos patrones se ejecutan siempre.
+        """
+        literal = required_literal(pattern.pattern, pattern.flags)
+        if literal and pattern.flags & re.IGNORECASE and not _foldable(literal):
+            return None
+        return literal
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """Recorrido del autómata sobre un texto (recordado para los últimos textos)."""
+        hits = self._scans.get(text)
+        if hits is None:
+            hits = self._scans[text] = self.automaton.scan(text)
+            if len(self._scans) > SCAN_CACHE_SIZE:
+                self._scans.popitem(last=False)
+        return hits
+
+    def candidates(self, text: str) -> List[bool]:
+        """Por patrón, si su literal aparece (o no tiene literal y hay que ejecutarlo)."""
+        hits = self.scan(text)
+        return [literal is None or bool(hits[literal]) for literal in self.literals]
+
+    def search(self, text: str, patterns: Optional[Sequence[Any]] = None) -> List[Optional[Any]]:
+        """
+        ``pattern.search(text)`` de cada patrón, sin ejecutar los que no pueden coincidir.
+
+        Args:
+            patterns: Patrones a buscar (por defecto, todos los del filtro). Los que no
+                son del filtro se ejecutan siempre
+        """
+        hits = self.scan(text)
+        results = []
+        for pattern in (self.patterns if patterns is None else patterns):
+            literal = self._literal_of.get(_pattern_key(pattern))
+            results.append(pattern.search(text) if literal is None or hits[literal] else None)
+        return results
+
+    def lines_with(self, text: str, keywords: Iterable[str], split: Optional[str] = None) -> Dict[str, set]:
+        """
+        Índices de las líneas en las que aparece cada palabra clave.
+
+        Args:
+            split: Separador de líneas, como en ``text.split(split)``; con None, las
+                líneas de ``text.splitlines()``
+        """
+        hits = self.scan(text)
+        if split is None:
+            line_starts = [0] + list(accumulate(len(line) for line in text.splitlines(True)))
+        else:
+            line_starts = [0] + [match.end() for match in re.finditer(re.escape(split), text)]
+        return {keyword: {bisect_right(line_starts, start) - 1 for start in hits.get(keyword, [])}
+                for keyword in keywords}
+
+    def lines_matching(self, text: str, patterns: Sequence[Any], split: Optional[str] = None) -> Optional[set]:
+        """
+        Índices de las líneas en las que puede coincidir alguno de los patrones (las que
+        contienen su literal), o None si algún patrón no tiene literal o no es del filtro y
+        hay que probar todas.
+        """
+        literals = [self._literal_of.get(_pattern_key(pattern)) for pattern in patterns]
+        if None in literals:
+            return None
+        return set().union(*self.lines_with(text, literals, split).values())
+
+
+def cleanup_patterns() -> List[Any]:
+    """Patrones compilados de ``CLEANUP_LINE_PATTERNS``."""
+    return [regex_engine.compile(pattern) for pattern in CLEANUP_LINE_PATTERNS]
+
+
+_document_prefilter: Optional[PatternPrefilter] = None
+_document_digest = None
+
+
+def document_prefilter() -> PatternPrefilter:
+    """
+    Filtro compartido de los patrones de validación del paquete vigente, los filtros de
+    limpieza y las palabras de las secciones. Se reconstruye si el paquete cambia.
+    """
+    global _document_prefilter, _document_digest
+    pack = current_pack()
+    if _document_prefilter is None or _document_digest != pack.digest:
+        patterns = (pack.get_list('validation_articles') + pack.get_list('validation_key_patterns') +
+                    cleanup_patterns())
+        _document_prefilter = PatternPrefilter(patterns, SECTION_KEYWORDS)
+        _document_digest = pack.digest
+    return _document_prefilter
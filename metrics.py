@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Instrumentación de tiempos por etapa de las ejecuciones de los extractores.
+
+Cada etapa (apertura del PDF, extracción de cada página, limpieza, validación,
+separación de artículos, cada ``extract_*``, simplificación y serialización) se mide
+con ``RunMetrics.stage``, que acumula tiempo, número de llamadas, bytes y páginas por
+etapa y por documento. Al final de la ejecución ``save`` escribe un informe JSON con
+el desglose y el rendimiento global en documentos/s y páginas/s.
+
+Si las métricas están desactivadas, ``stage`` devuelve un contexto vacío compartido y
+la instrumentación no tiene coste apreciable.
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+
+class _Stage:
+    """Medición de una ejecución de una etapa."""
+
+    __slots__ = ('metrics', 'name', 'bytes', 'pages', 'start')
+
+    def __init__(self, metrics: "RunMetrics", name: str, bytes: int, pages: int):
+        self.metrics = metrics
+        self.name = name
+        self.bytes = bytes
+        self.pages = pages
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.metrics.add(self.name, time.perf_counter() - self.start, self.bytes, self.pages)
+
+
+class _NullStage:
+    """
+    Etapa sin medición (métricas desactivadas). Es una sola instancia compartida: admite
+    que se asignen bytes y páginas, pero no los guarda.
+    """
+
+    __slots__ = ()
+
+    @property
+    def bytes(self) -> int:
+        return 0
+
+    @bytes.setter
+    def bytes(self, value: int) -> None:
+        pass
+
+    @property
+    def pages(self) -> int:
+        return 0
+
+    @pages.setter
+    def pages(self, value: int) -> None:
+        pass
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _new_totals() -> Dict[str, float]:
+    return {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0, "pages": 0}
+
+
+class RunMetrics:
+    """Métricas de tiempo por etapa y por documento de una ejecución."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._start = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.documents: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    def stage(self, name: str, bytes: int = 0, pages: int = 0):
+        """
+        Contexto que mide una etapa.
+
+        ``bytes`` y ``pages`` pueden indicarse al entrar o asignarse dentro del bloque
+        (``with metrics.stage('serialization') as stage: ...; stage.bytes = n``).
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, bytes, pages)
+
+    def add(self, name: str, seconds: float, bytes: int = 0, pages: int = 0) -> None:
+        """Acumula una medición en los totales de la etapa y en el documento actual."""
+        if not self.enabled:
+            return
+        targets = [self.stages]
+        if self._current is not None:
+            targets.append(self._current["stages"])
+            self._current["pages"] += pages
+
+        for stages in targets:
+            totals = stages.get(name)
+            if totals is None:
+                totals = stages[name] = _new_totals()
+            totals["count"] += 1
+            totals["seconds"] += seconds
+            totals["bytes"] += bytes
+            totals["pages"] += pages
+            if seconds > totals["max_seconds"]:
+                totals["max_seconds"] = seconds
+
+    def start_document(self, file_name: str, file_path: Optional[str] = None) -> None:
+        """Empieza a atribuir las etapas a un documento."""
+        if not self.enabled:
+            return
+        self.end_document()
+        self._current = {
+            "file_name": file_name,
+            "bytes": os.path.getsize(file_path) if file_path and os.path.exists(file_path) else 0,
+            "pages": 0,
+            "stages": {},
+            "_start": time.perf_counter()
+        }
+
+    def end_document(self, valid: Optional[bool] = None) -> None:
+        """Termina el documento actual (si lo hay) y guarda su desglose."""
+        if not self.enabled or self._current is None:
+            return
+        document = self._current
+        document["seconds"] = time.perf_counter() - document.pop("_start")
+        if valid is not None:
+            document["valid"] = valid
+        self.documents.append(document)
+        self._current = None
+
+    def report(self) -> Dict[str, Any]:
+        """Informe de la ejecución con el desglose por etapa y por documento."""
+        self.end_document()
+        wall = time.perf_counter() - self._start
+        pages = sum(document["pages"] for document in self.documents)
+
+        def stage_report(totals: Dict[str, float], share_of: float) -> Dict[str, Any]:
+            return {
+                "count": totals["count"],
+                "total_seconds": round(totals["seconds"], 6),
+                "mean_ms": round(totals["seconds"] / totals["count"] * 1000, 3) if totals["count"] else 0.0,
+                "max_ms": round(totals["max_seconds"] * 1000, 3),
+                "bytes": totals["bytes"],
+                "pages": totals["pages"],
+                "share": round(totals["seconds"] / share_of, 4)
+            }
+
+        return {
+            "started_at": self.started_at,
+            "wall_seconds": round(wall, 6),
+            "documents": len(self.documents),
+            "pages": pages,
+            "bytes": sum(document["bytes"] for document in self.documents),
+            "docs_per_second": round(len(self.documents) / wall, 3) if wall else 0.0,
+            "pages_per_second": round(pages / wall, 3) if wall else 0.0,
+            # Fracción del tiempo total: las etapas anidadas (cada página dentro de la
+            # extracción) se solapan, así que la suma de fracciones puede superar 1
+            "stages": {name: stage_report(totals, wall or 1.0)
+                       for name, totals in sorted(self.stages.items(), key=lambda kv: -kv[1]["seconds"])},
+            "per_document": [
+                {
+                    "file_name": document["file_name"],
+                    "valid": document.get("valid"),
+                    "seconds": round(document["seconds"], 6),
+                    "bytes": document["bytes"],
+                    "pages": document["pages"],
+                    "stages": {name: round(totals["seconds"], 6) for name, totals in document["stages"].items()}
+                }
+                for document in self.documents
+            ]
+        }
+
+    def save(self, path: str) -> Dict[str, Any]:
+        """Escribe el informe JSON y lo devuelve."""
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        return report
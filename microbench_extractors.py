@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks de las funciones de extracción de campos sobre los textos ya extraídos.
+
+Mide por separado, para cada documento de ``corpus_txt/``, cada función ``extract_*``
+(curso académico, enseñanzas, clases y cuantías, umbrales, requisitos académicos,
+procedimiento y plazos), ``extract_article`` y la validación del documento. Cada
+función se ejecuta muchas veces sobre la misma entrada y se informa de la mediana y de
+los percentiles 90 y 99, para saber qué extractor merece optimizarse.
+
+Con ``--save`` los resultados se guardan en JSON; con ``--baseline`` se comparan con
+unos resultados anteriores y el programa termina con error si alguna función se ha
+vuelto más lenta que el umbral de ``--tolerance`` (por ejemplo, al añadir una
+expresión regular de respaldo).
+
+Uso:
+python microbench_extractors.py --input corpus_txt --iterations 200
+python microbench_extractors.py --save output/microbench_base.json
+python microbench_extractors.py --baseline output/microbench_base.json --tolerance 1.25
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+import contextlib
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+BACKENDS = ('pdfminer2', 'pdfminer', 'pymupdf')
+
+
+def _pdfminer_targets(extractor, text: str) -> List[Tuple[str, Callable[[], Any]]]:
+    """Funciones a medir de un ``BecasExtractor`` de pdfminer, con la entrada que usa ``extract_data``."""
+    targets = [
+        ('is_valid_scholarship_text', lambda: extractor.is_valid_scholarship_text(text)),
+        ('extract_academic_year', lambda: extractor.extract_academic_year(text))
+    ]
+    articles = {}
+    for key, number, title in extractor.ARTICLES:
+        articles[key] = extractor.extract_article(text, number, title)
+        targets.append((f'extract_article[{number}]',
+                        lambda number=number, title=title: extractor.extract_article(text, number, title)))
+    for _, method_name, article_key in extractor.FIELDS:
+        method = getattr(extractor, method_name)
+        targets.append((method_name, lambda method=method, article=articles[article_key]: method(article)))
+    return targets
+
+
+def _pymupdf_targets(module, text: str) -> List[Tuple[str, Callable[[], Any]]]:
+    """Funciones a medir de ``pymupdf_extractor``: todas reciben el texto completo."""
+    names = ['is_valid_scholarship_pdf', 'extract_academic_year', 'extract_eligible_studies',
+             'extract_scholarship_amounts', 'extract_income_thresholds',
+             'extract_application_deadlines', 'extract_academic_requirements']
+    return [(name, lambda function=getattr(module, name): function(text)) for name in names]
+
+
+def load_targets(backend: str) -> Callable[[str], List[Tuple[str, Callable[[], Any]]]]:
+    """
+    Importa un backend y devuelve la función que prepara sus objetivos para un texto.
+
+    Raises:
+        ImportError: Si el backend o sus dependencias no están instalados
+    """
+    if backend == 'pdfminer2':
+        import atexit
+        import shutil
+        import tempfile
+        import pdf_miner_extractor_2
+        # Directorio de trabajo que se borra al terminar el proceso
+        work_dir = tempfile.mkdtemp(prefix='microbench_')
+        atexit.register(shutil.rmtree, work_dir, ignore_errors=True)
+        extractor = pdf_miner_extractor_2.BecasExtractor(input_dir='.', output_dir=work_dir)
+        return lambda text: _pdfminer_targets(extractor, text)
+    if backend == 'pdfminer':
+        import pdf_miner_extractor
+        extractor = pdf_miner_extractor.BecasExtractor()
+        return lambda text: _pdfminer_targets(extractor, text)
+    if backend == 'pymupdf':
+        import pymupdf_extractor
+        return lambda text: _pymupdf_targets(pymupdf_extractor, text)
+    raise ValueError(f"Backend desconocido: {backend}")
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Percentil por interpolación lineal sobre una lista ya ordenada."""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    position = (len(sorted_samples) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def time_function(function: Callable[[], Any], iterations: int, warmup: int) -> Dict[str, float]:
+    """Ejecuta una función ``warmup + iterations`` veces y resume los tiempos (en microsegundos)."""
+    for _ in range(warmup):
+        function()
+
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        start = clock()
+        function()
+        samples.append((clock() - start) / 1000)
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "min_us": round(samples[0], 3),
+        "p50_us": round(percentile(samples, 0.50), 3),
+        "p90_us": round(percentile(samples, 0.90), 3),
+        "p99_us": round(percentile(samples, 0.99), 3),
+        "max_us": round(samples[-1], 3),
+        "mean_us": round(statistics.fmean(samples), 3)
+    }
+
+
+def run_benchmark(backend: str, text_paths: List[str], iterations: int, warmup: int,
+                  only: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Mide todas las funciones de un backend sobre cada texto.
+
+    Returns:
+        Diccionario documento → función → estadísticas
+    """
+    prepare = load_targets(backend)
+    results = {}
+    for path in text_paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+
+        document = {}
+        for name, function in prepare(text):
+            if only and not any(fragment in name for fragment in only):
+                continue
+            document[name] = time_function(function, iterations, warmup)
+        results[os.path.basename(path)] = document
+    return results
+
+
+def summarize(results: Dict[str, Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    """Agrega por función las medianas de todos los documentos (suma y peor documento)."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for document in results.values():
+        for name, stats in document.items():
+            totals = summary.setdefault(name, {"p50_us_total": 0.0, "p99_us_worst": 0.0})
+            totals["p50_us_total"] = round(totals["p50_us_total"] + stats["p50_us"], 3)
+            totals["p99_us_worst"] = max(totals["p99_us_worst"], stats["p99_us"])
+    return dict(sorted(summary.items(), key=lambda kv: -kv[1]["p50_us_total"]))
+
+
+def compare(results: Dict[str, Dict[str, Dict[str, float]]], baseline: Dict[str, Dict[str, Dict[str, float]]],
+            tolerance: float, min_us: float) -> List[str]:
+    """
+    Compara las medianas con las de una ejecución anterior.
+
+    Solo se informa de las funciones cuya mediana supera ``tolerance`` veces la de
+    referencia y además es mayor que ``min_us`` (las funciones de pocos microsegundos
+    tienen demasiado ruido para compararlas).
+    """
+    regressions = []
+    for document, functions in results.items():
+        for name, stats in functions.items():
+            reference = baseline.get(document, {}).get(name)
+            if reference is None or stats["p50_us"] < min_us:
+                continue
+            if stats["p50_us"] > reference["p50_us"] * tolerance:
+                regressions.append(f"{document} · {name}: {reference['p50_us']:.1f} µs → {stats['p50_us']:.1f} µs "
+                                   f"(×{stats['p50_us'] / reference['p50_us']:.2f})")
+    return regressions
+
+
+def print_report(backend: str, results: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    """Imprime una tabla por documento y el resumen por función."""
+    print(f"\n=== {backend} ===")
+    for document, functions in results.items():
+        print(f"\n📄 {document}")
+        print(f"   {'función':<38} {'p50 µs':>10} {'p90 µs':>10} {'p99 µs':>10} {'máx µs':>10}")
+        for name, stats in sorted(functions.items(), key=lambda kv: -kv[1]["p50_us"]):
+            print(f"   {name:<38} {stats['p50_us']:>10.1f} {stats['p90_us']:>10.1f} "
+                  f"{stats['p99_us']:>10.1f} {stats['max_us']:>10.1f}")
+
+    print(f"\n📊 Resumen de {backend} (suma de medianas de todos los documentos)")
+    for name, totals in summarize(results).items():
+        print(f"   {name:<38} {totals['p50_us_total']:>12.1f} µs   peor p99 {totals['p99_us_worst']:>10.1f} µs")
+
+
+def main():
+    """Ejecuta los micro-benchmarks y, si se pide, los compara con una referencia."""
+    parser = argparse.ArgumentParser(description='Micro-benchmarks de las funciones de extracción de campos')
+    parser.add_argument('--input', '-i', type=str, default='./corpus_txt', help='Directorio con los textos extraídos')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=['pdfminer2'], help='Extractores a medir')
+    parser.add_argument('--iterations', '-n', type=int, default=200, help='Repeticiones medidas por función y documento')
+    parser.add_argument('--warmup', type=int, default=5, help='Repeticiones previas sin medir')
+    parser.add_argument('--only', nargs='+', default=None,
+                        help='Solo mide las funciones cuyo nombre contiene alguno de estos fragmentos')
+    parser.add_argument('--save', type=str, default=None, help='Guarda los resultados en este fichero JSON')
+    parser.add_argument('--baseline', type=str, default=None, help='Resultados de referencia (JSON de --save)')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='Factor sobre la mediana de referencia a partir del cual se considera regresión')
+    parser.add_argument('--min-us', type=float, default=20.0,
+                        help='No se comparan las funciones con mediana inferior a estos microsegundos')
+    args = parser.parse_args()
+
+    text_paths = sorted(os.path.join(args.input, f) for f in os.listdir(args.input) if f.endswith('.txt'))
+    if not text_paths:
+        print(f"No se encontraron textos en {args.input}")
+        sys.exit(1)
+
+    report = {
+        "started_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "backends": {}
+    }
+
+    # Los extractores informan por consola y en el log de cada documento; aquí solo estorba
+    logging.disable(logging.CRITICAL)
+    with open(os.devnull, 'w', encoding='utf-8') as quiet:
+        for backend in args.backends:
+            try:
+                with contextlib.redirect_stdout(quiet):
+                    results = run_benchmark(backend, text_paths, args.iterations, args.warmup, args.only)
+            except ImportError as e:
+                print(f"⚠️ {backend} no disponible: {e}")
+                continue
+            report["backends"][backend] = results
+            print_report(backend, results)
+    logging.disable(logging.NOTSET)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\n💾 Resultados guardados en {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+        regressions = []
+        for backend, results in report["backends"].items():
+            reference = baseline.get("backends", {}).get(backend)
+            if reference is None:
+                print(f"⚠️ La referencia no tiene resultados de {backend}")
+                continue
+            regressions += [f"{backend} · {line}" for line in compare(results, reference, args.tolerance, args.min_us)]
+
+        if regressions:
+            print(f"\n❌ {len(regressions)} funciones más lentas que la referencia (×{args.tolerance}):")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"\n✅ Sin regresiones respecto a {args.baseline} (tolerancia ×{args.tolerance})")
+
+
+if __name__ == "__main__":
+    main()
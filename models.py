@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Modelo de datos tipado para los resultados de extracción de convocatorias de becas.
+
+Los extractores generan diccionarios anidados con conjuntos de claves ligeramente
+distintos (``analyze_pdf`` en pymupdf/PyPDF2 y ``BecasExtractor.extract_data`` en
+pdfminer). Estas clases con ``__slots__`` unifican ambos formatos y ocupan mucha menos
+memoria que los diccionarios cuando se cargan miles de documentos a la vez.
+
+``from_dict`` acepta cualquiera de los formatos de los extractores y ``to_dict`` lo
+devuelve en el mismo formato del que procede (con sus claves y las descripciones de cada
+sección), de modo que pasar un resultado por ``Document`` no lo cambia. Un documento
+construido a mano (sin ``id``) se devuelve en el formato de ``BecasExtractor.extract_data``.
+Requiere Python 3.10 o superior (``dataclass(slots=True)``).
+"""
+
+import os
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Iterator
+
+# Descripciones de cada sección en el formato completo (si el resultado original no trae otra)
+STUDIES_DESCRIPTION = "Estudios para los que se puede solicitar beca"
+AMOUNTS_DESCRIPTION = "Cuantías de las becas"
+THRESHOLDS_DESCRIPTION = "Umbrales de renta familiar aplicables para la concesión de las becas"
+REQUIREMENTS_DESCRIPTION = "Requisitos académicos para obtener beca"
+PROCEDURE_DESCRIPTION = "Procedimiento de solicitud y documentación a presentar"
+DEADLINES_DESCRIPTION = "Plazos para presentar la solicitud de beca"
+
+
+@dataclass(slots=True)
+class Study:
+    """Tipo de estudio para el que se puede solicitar beca (Artículo 3)."""
+    identifier: str
+    description: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Study":
+        return cls(data.get('identifier', ''), data.get('description', ''))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"identifier": self.identifier, "description": self.description}
+
+
+@dataclass(slots=True)
+class ScoreRange:
+    """Tramo de nota media de la cuantía ligada a la excelencia académica."""
+    min_score: str
+    max_score: str
+    amount: str
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScoreRange":
+        return cls(data.get('min_score', ''), data.get('max_score', ''),
+                   data.get('amount', ''), data.get('description', ''))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "amount": self.amount,
+            "description": self.description
+        }
+
+
+@dataclass(slots=True)
+class SpecialCase:
+    """Caso especial de una cuantía (por ejemplo, Ciclos Formativos de Grado Básico)."""
+    case: str
+    amount: str
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpecialCase":
+        return cls(data.get('case', ''), data.get('amount', ''), data.get('description', ''))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"case": self.case, "amount": self.amount, "description": self.description}
+
+
+@dataclass(slots=True)
+class Component:
+    """Componente de la beca con su cuantía (Artículo 11)."""
+    identifier: str = ""
+    type: str = ""
+    description: str = ""
+    amount: Optional[str] = None
+    amount_description: Optional[str] = None
+    minimum_amount: Optional[str] = None
+    ranges: Optional[List[ScoreRange]] = None
+    special_case: Optional[SpecialCase] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Component":
+        ranges = data.get('ranges')
+        special_case = data.get('special_case')
+        return cls(
+            identifier=data.get('identifier', ''),
+            type=data.get('type', ''),
+            # pymupdf/PyPDF2 guardan el texto en 'full_description'
+            description=data.get('description', data.get('full_description', '')),
+            amount=data.get('amount'),
+            amount_description=data.get('amount_description'),
+            minimum_amount=data.get('minimum_amount'),
+            ranges=[ScoreRange.from_dict(r) for r in ranges] if ranges is not None else None,
+            special_case=SpecialCase.from_dict(special_case) if special_case else None
+        )
+
+    def to_dict(self, analyze: bool = False) -> Dict[str, Any]:
+        """Con ``analyze``, en el formato de ``analyze_pdf`` (pymupdf/PyPDF2)."""
+        result = {
+            "identifier": self.identifier,
+            "full_description" if analyze else "description": self.description,
+            "type": self.type
+        }
+        if self.ranges is not None:
+            result["ranges"] = [r.to_dict() for r in self.ranges]
+        if self.amount is not None:
+            result["amount"] = self.amount
+        if self.minimum_amount is not None:
+            result["minimum_amount"] = self.minimum_amount
+        if self.amount_description is not None:
+            result["amount_description"] = self.amount_description
+        if self.special_case is not None:
+            result["special_case"] = self.special_case.to_dict()
+        return result
+
+
+@dataclass(slots=True)
+class FamilyThreshold:
+    """Renta máxima para un tamaño de familia dentro de un umbral."""
+    size: str
+    amount: str
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FamilyThreshold":
+        return cls(str(data.get('size', '')), data.get('amount', ''), data.get('description', ''))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"size": self.size, "amount": self.amount, "description": self.description}
+
+
+@dataclass(slots=True)
+class Threshold:
+    """Umbral de renta familiar (Artículo 19)."""
+    number: int
+    family_sizes: List[FamilyThreshold] = field(default_factory=list)
+    amount_per_member: Optional[str] = None
+    additional_description: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Threshold":
+        additional = data.get('additional_info') or {}
+        return cls(
+            number=int(data.get('number', 0) or 0),
+            family_sizes=[FamilyThreshold.from_dict(f) for f in data.get('family_sizes', [])],
+            amount_per_member=additional.get('amount_per_member'),
+            additional_description=additional.get('description')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "number": self.number,
+            "family_sizes": [f.to_dict() for f in self.family_sizes]
+        }
+        if self.amount_per_member is not None or self.additional_description is not None:
+            result["additional_info"] = {
+                "description": self.additional_description or "",
+                "amount_per_member": self.amount_per_member or ""
+            }
+        return result
+
+    def amount_for(self, size: int) -> Optional[str]:
+        """Devuelve la renta máxima para un tamaño de familia, si se extrajo."""
+        size_text = str(size)
+        for family in self.family_sizes:
+            if family.size == size_text:
+                return family.amount
+        return None
+
+
+@dataclass(slots=True)
+class Requirement:
+    """Requisito académico (Artículo 24)."""
+    type: str
+    description: str = ""
+    area: Optional[str] = None
+    percentage: Optional[str] = None
+    grade: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Requirement":
+        return cls(
+            type=data.get('type', ''),
+            description=data.get('description', ''),
+            area=data.get('area'),
+            percentage=data.get('percentage'),
+            # pdfminer usa 'nota'; pymupdf/PyPDF2 usan 'grade'
+            grade=data.get('nota', data.get('grade'))
+        )
+
+    def to_dict(self, analyze: bool = False) -> Dict[str, Any]:
+        """Con ``analyze``, en el formato de ``analyze_pdf`` (pymupdf/PyPDF2)."""
+        result = {"type": self.type}
+        if self.area is not None:
+            result["area"] = self.area
+        if self.percentage is not None:
+            result["percentage"] = self.percentage
+        if self.grade is not None:
+            result["grade" if analyze else "nota"] = self.grade
+        result["description"] = self.description
+        return result
+
+
+@dataclass(slots=True)
+class ProcedureStep:
+    """Paso del procedimiento de solicitud (Artículo 47)."""
+    step: str
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProcedureStep":
+        return cls(data.get('step', ''), data.get('description', ''))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"step": self.step, "description": self.description}
+
+
+@dataclass(slots=True)
+class Deadline:
+    """Plazo de presentación de solicitudes (Artículo 48)."""
+    type: str
+    deadline: str
+    description: str = ""
+    # Fin del plazo en ISO 8601 (ver ``spanish_dates``), si la fecha es completa
+    deadline_iso: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Deadline":
+        return cls(data.get('type', ''), data.get('deadline', ''), data.get('description', ''),
+                   data.get('deadline_iso'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"type": self.type, "deadline": self.deadline, "description": self.description}
+        if self.deadline_iso is not None:
+            result["deadline_iso"] = self.deadline_iso
+        return result
+
+
+@dataclass(slots=True)
+class ExceptionalCase:
+    """Plazo excepcional posterior al plazo general."""
+    deadline: str
+    conditions: str = ""
+    description: str = ""
+    deadline_iso: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExceptionalCase":
+        return cls(data.get('deadline', ''), data.get('conditions', ''), data.get('description', ''),
+                   data.get('deadline_iso'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"deadline": self.deadline, "conditions": self.conditions, "description": self.description}
+        if self.deadline_iso is not None:
+            result["deadline_iso"] = self.deadline_iso
+        return result
+
+
+@dataclass(slots=True)
+class ApplicationWindow:
+    """Plazo general de solicitud, con inicio y fin en ISO 8601 (hora peninsular)."""
+    start: str
+    end: str
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ApplicationWindow":
+        return cls(data.get('start', ''), data.get('end', ''), data.get('description', ''))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"start": self.start, "end": self.end, "description": self.description}
+
+
+@dataclass(slots=True)
+class Document:
+    """Resultado completo de la extracción de una convocatoria."""
+    file_name: str
+    valid: bool = False
+    extraction_date: str = ""
+    academic_year: str = ""
+    academic_year_description: str = ""
+    error: Optional[str] = None
+    # Texto (o referencia compacta) de cada artículo, por clave 'article_N'
+    articles: Dict[str, Any] = field(default_factory=dict)
+    non_university_studies: List[Study] = field(default_factory=list)
+    university_studies: List[Study] = field(default_factory=list)
+    non_university_section: Optional[str] = None
+    university_section: Optional[str] = None
+    # El Artículo 4 no tiene una estructura estable; se conserva tal cual
+    scholarship_types: Optional[Dict[str, Any]] = None
+    components: List[Component] = field(default_factory=list)
+    amounts_introduction: Optional[str] = None
+    thresholds: List[Threshold] = field(default_factory=list)
+    thresholds_introduction: Optional[str] = None
+    requirements: List[Requirement] = field(default_factory=list)
+    procedure: Optional[List[ProcedureStep]] = None
+    deadlines: List[Deadline] = field(default_factory=list)
+    deadlines_introduction: Optional[str] = None
+    exceptional_case: Optional[ExceptionalCase] = None
+    application_window: Optional[ApplicationWindow] = None
+    # Identificador de los resultados de ``analyze_pdf`` (pymupdf/PyPDF2); None en los de pdfminer
+    id: Optional[str] = None
+    # Descripción de cada sección del resultado original, por clave ('scholarship_amounts', ...)
+    descriptions: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Document":
+        """Construye el documento a partir del resultado de cualquiera de los extractores."""
+        academic_year = data.get('academic_year') or {}
+        studies = data.get('eligible_studies') or {}
+        amounts = data.get('scholarship_amounts') or {}
+        thresholds = data.get('income_thresholds') or {}
+        requirements = data.get('academic_requirements') or {}
+        procedure = data.get('application_procedure')
+        deadlines = data.get('application_deadlines') or {}
+        exceptional = deadlines.get('exceptional_cases')
+        window = deadlines.get('application_window')
+        sections = {'eligible_studies': studies, 'scholarship_amounts': amounts, 'income_thresholds': thresholds,
+                    'academic_requirements': requirements, 'application_procedure': procedure or {},
+                    'application_deadlines': deadlines}
+
+        return cls(
+            # pymupdf/PyPDF2 usan 'filename' y 'processing_timestamp'
+            file_name=data.get('file_name', data.get('filename', '')),
+            valid=bool(data.get('valid', False)),
+            extraction_date=data.get('extraction_date', data.get('processing_timestamp', '')),
+            academic_year=academic_year.get('year', ''),
+            academic_year_description=academic_year.get('description', ''),
+            error=data.get('error'),
+            articles={k: v for k, v in data.items() if k.startswith('article_')},
+            non_university_studies=[Study.from_dict(s) for s in studies.get('non_university_studies', [])],
+            university_studies=[Study.from_dict(s) for s in studies.get('university_studies', [])],
+            non_university_section=studies.get('non_university_section'),
+            university_section=studies.get('university_section'),
+            scholarship_types=data.get('scholarship_types'),
+            components=[Component.from_dict(c) for c in amounts.get('components', [])],
+            amounts_introduction=amounts.get('introduction'),
+            thresholds=[Threshold.from_dict(t) for t in thresholds.get('thresholds', [])],
+            thresholds_introduction=thresholds.get('introduction'),
+            requirements=[Requirement.from_dict(r) for r in requirements.get('requirements', [])],
+            procedure=[ProcedureStep.from_dict(s) for s in procedure.get('steps', [])] if procedure is not None else None,
+            deadlines=[Deadline.from_dict(d) for d in deadlines.get('deadlines', [])],
+            deadlines_introduction=deadlines.get('introduction'),
+            exceptional_case=ExceptionalCase.from_dict(exceptional) if exceptional else None,
+            application_window=ApplicationWindow.from_dict(window) if window else None,
+            id=data.get('id'),
+            descriptions={key: section['description'] for key, section in sections.items() if 'description' in section}
+        )
+
+    def to_dict(self, analyze: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Devuelve el documento en el formato del extractor del que procede: el de
+        ``analyze_pdf`` (pymupdf/PyPDF2) si tiene ``id`` y, si no, el formato completo de
+        ``BecasExtractor.extract_data``.
+
+        Args:
+            analyze: Fuerza el formato de ``analyze_pdf`` (True) o el de ``extract_data`` (False)
+        """
+        analyze = self.id is not None if analyze is None else analyze
+        if analyze:
+            result = {'id': self.id or os.path.splitext(self.file_name)[0], 'filename': self.file_name,
+                      'valid': self.valid}
+        else:
+            result = {'file_name': self.file_name, 'valid': self.valid, 'extraction_date': self.extraction_date}
+        if self.error is not None:
+            result['error'] = self.error
+        if not self.valid:
+            if analyze:
+                result['processing_timestamp'] = self.extraction_date
+            return result
+
+        result['academic_year'] = {
+            "year": self.academic_year,
+            "description": self.academic_year_description
+        }
+        result.update(self.articles)
+
+        studies = {
+            "description": self.descriptions.get('eligible_studies', STUDIES_DESCRIPTION),
+            "university_studies": [s.to_dict() for s in self.university_studies],
+            "non_university_studies": [s.to_dict() for s in self.non_university_studies]
+        }
+        if self.non_university_section is not None:
+            studies["non_university_section"] = self.non_university_section
+        if self.university_section is not None:
+            studies["university_section"] = self.university_section
+        result['eligible_studies'] = studies
+
+        if self.scholarship_types is not None:
+            result['scholarship_types'] = self.scholarship_types
+
+        result['scholarship_amounts'] = self._section(
+            'scholarship_amounts', AMOUNTS_DESCRIPTION, self.amounts_introduction,
+            "components", [c.to_dict(analyze) for c in self.components], analyze)
+        result['income_thresholds'] = self._section(
+            'income_thresholds', THRESHOLDS_DESCRIPTION, self.thresholds_introduction,
+            "thresholds", [t.to_dict() for t in self.thresholds], analyze)
+
+        requirements = {
+            "description": self.descriptions.get('academic_requirements', REQUIREMENTS_DESCRIPTION),
+            "requirements": [r.to_dict(analyze) for r in self.requirements]
+        }
+        # analyze_pdf pone los plazos antes que los requisitos
+        if not analyze:
+            result['academic_requirements'] = requirements
+
+        if self.procedure is not None:
+            result['application_procedure'] = {
+                "description": self.descriptions.get('application_procedure', PROCEDURE_DESCRIPTION),
+                "steps": [s.to_dict() for s in self.procedure]
+            }
+
+        deadlines = self._section('application_deadlines', DEADLINES_DESCRIPTION, self.deadlines_introduction,
+                                  "deadlines", [d.to_dict() for d in self.deadlines], analyze)
+        if self.exceptional_case is not None:
+            deadlines["exceptional_cases"] = self.exceptional_case.to_dict()
+        if self.application_window is not None:
+            deadlines["application_window"] = self.application_window.to_dict()
+        result['application_deadlines'] = deadlines
+
+        if analyze:
+            result['academic_requirements'] = requirements
+            result['processing_timestamp'] = self.extraction_date
+        return result
+
+    def _section(self, key: str, default_description: str, introduction: Optional[str],
+                 items_key: str, items: List[Dict[str, Any]], analyze: bool) -> Dict[str, Any]:
+        """Sección con descripción, introducción y lista, en el orden de claves de cada formato."""
+        section = {"description": self.descriptions.get(key, default_description)}
+        # pdfminer pone la introducción antes de la lista; analyze_pdf, después
+        if introduction is not None and not analyze:
+            section["introduction"] = introduction
+        section[items_key] = items
+        if introduction is not None and analyze:
+            section["introduction"] = introduction
+        return section
+
+    def component(self, component_type: str) -> Optional[Component]:
+        """Devuelve el primer componente de un tipo dado, si existe."""
+        for component in self.components:
+            if component.type == component_type:
+                return component
+        return None
+
+    def threshold(self, number: int) -> Optional[Threshold]:
+        """Devuelve el umbral de renta con el número indicado, si existe."""
+        for threshold in self.thresholds:
+            if threshold.number == number:
+                return threshold
+        return None
+
+
+def as_document(data: Any) -> Document:
+    """Devuelve un ``Document`` tanto si recibe un diccionario como un documento ya tipado."""
+    if isinstance(data, Document):
+        return data
+    return Document.from_dict(data)
+
+
+def as_dict(data: Any, analyze: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Devuelve el diccionario de resultado tanto si recibe un ``Document`` como un diccionario
+    (``analyze`` fuerza el formato de un ``Document``, como en ``Document.to_dict``).
+    """
+    if isinstance(data, Document):
+        return data.to_dict(analyze)
+    return data
+
+
+def load_documents(path: str) -> Iterator[Document]:
+    """
+    Carga documentos tipados desde un fichero de resultados.
+
+    Acepta un JSON con un resultado, un JSON con una lista de resultados o un fichero NDJSON.
+    """
+    if path.endswith('.ndjson'):
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield Document.from_dict(json.loads(line))
+        return
+
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+
+    for item in (data if isinstance(data, list) else [data]):
+        yield Document.from_dict(item)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Escritura y lectura incremental de resultados en formato NDJSON (un objeto JSON por línea).
+
+Permite volcar cada documento procesado en cuanto termina, sin acumular el corpus
+completo en memoria, y que otros procesos empiecen a leer antes de que acabe la ejecución.
+"""
+
+import os
+import json
+import time
+from typing import Dict, Any, Iterator, Optional
+
+
+class NDJSONWriter:
+    """Escritor de registros NDJSON que vuelca cada línea a disco al escribirla."""
+
+    def __init__(self, path: str, append: bool = False, fsync: bool = False):
+        """
+        Inicializa el escritor.
+
+        Args:
+            path: Ruta del fichero NDJSON de salida
+            append: Si es True, añade al final del fichero en lugar de sobrescribirlo
+            fsync: Si es True, fuerza la escritura física tras cada registro (más lento)
+        """
+        self.path = path
+        self.fsync = fsync
+        self.count = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Escribe un registro como una línea JSON y la vuelca inmediatamente."""
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.count += 1
+
+    def close(self) -> None:
+        """Cierra el fichero de salida."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "NDJSONWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def iter_ndjson(path: str, follow: bool = False, idle_timeout: float = 5.0,
+                poll_interval: float = 0.2) -> Iterator[Dict[str, Any]]:
+    """
+    Lee los registros de un fichero NDJSON uno a uno.
+
+    Args:
+        path: Ruta del fichero NDJSON
+        follow: Si es True, sigue esperando nuevas líneas mientras otro proceso escribe
+        idle_timeout: Segundos sin datos nuevos tras los que se deja de esperar (solo con follow)
+        poll_interval: Intervalo de sondeo en segundos (solo con follow)
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        pending = ""
+        idle_since: Optional[float] = None
+
+        while True:
+            line = file.readline()
+
+            if line:
+                idle_since = None
+                pending += line
+                # Una línea sin salto final puede estar a medio escribir
+                if not pending.endswith('\n'):
+                    continue
+
+                record_text = pending.strip()
+                pending = ""
+                if record_text:
+                    yield json.loads(record_text)
+                continue
+
+            if not follow:
+                break
+
+            now = time.monotonic()
+            if idle_since is None:
+                idle_since = now
+            elif now - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+
+        # Registro final sin salto de línea (fichero cerrado sin '\n')
+        if pending.strip():
+            yield json.loads(pending)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Paquetes de patrones de extracción externos, con recarga en caliente.
+
+Los patrones que dependen del formato del BOE (cabeceras de artículo, validación del
+documento, curso académico y formatos del Artículo 19) se leen de un fichero versionado
+(``patterns/becas.json`` o un TOML equivalente) en lugar de estar escritos en el código.
+Así se puede corregir un patrón para un formato nuevo sin desplegar otra versión.
+
+- Cada paquete se compila una sola vez y se guarda en caché por el hash SHA-256 de su
+  contenido: volver a cargar un fichero sin cambios no recompila nada.
+- ``PatternPackLoader`` comprueba como mucho una vez por intervalo si el fichero ha
+  cambiado (tamaño y fecha de modificación) y, si su contenido es distinto, carga el
+  nuevo paquete. Un proceso de larga duración (``extraction_service.py``) recoge así los
+  cambios sin reiniciarse. Si el fichero nuevo no es válido se conserva el anterior.
+- ``current_pack()`` devuelve el paquete vigente del fichero por defecto, que puede
+  cambiarse con la variable de entorno ``BECAS_PATTERN_PACK``.
+
+Formato del fichero::
+
+    {
+      "format": 1,
+      "version": "2024.1",
+      "patterns": {
+        "academic_year": {"flags": ["IGNORECASE"], "regex": ["CURSO ACADÉMICO (...)", ...]},
+        "validation_articles": {"flags": ["IGNORECASE"], "regex": [...], "labels": [...]},
+        "article_with_title": {"flags": ["DOTALL", "IGNORECASE"], "template": "Artículo ... {number} ... {title} ..."}
+      }
+    }
+
+``regex`` admite una cadena o una lista; ``template`` es un patrón con huecos ``{nombre}``
+que se rellenan al usarlo (``pack.template('article_with_title', number=3, ...)``) y cuyo
+resultado compilado también se guarda en caché.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+import regex_engine
+
+try:
+    import tomllib
+    TOML_AVAILABLE = True
+except ImportError:
+    TOML_AVAILABLE = False
+
+logger = logging.getLogger("PatternPack")
+
+PACK_FORMAT = 1
+DEFAULT_PACK_PATH = os.environ.get(
+    'BECAS_PATTERN_PACK',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patterns', 'becas.json')
+)
+PLACEHOLDER_PATTERN = re.compile(r'\{([a-z_]+)\}')
+
+
+def _flags(names: List[str]) -> int:
+    """Combina los nombres de las banderas de ``re`` ('IGNORECASE', 'DOTALL', ...)."""
+    value = 0
+    for name in names:
+        flag = getattr(re, name, None)
+        if not isinstance(flag, re.RegexFlag):
+            raise ValueError(f"Bandera de expresión regular desconocida: {name}")
+        value |= flag
+    return value
+
+
+class PatternPack:
+    """Paquete de patrones compilados."""
+
+    def __init__(self, data: Dict[str, Any], digest: str, path: str = ""):
+        """
+        Compila los patrones de un paquete ya leído.
+
+        Raises:
+            ValueError: Si el formato no es compatible o falta algún campo
+            re.error: Si algún patrón no es válido
+        """
+        if data.get('format') != PACK_FORMAT:
+            raise ValueError(f"Formato de paquete de patrones no soportado: {data.get('format')}")
+
+        self.version = str(data.get('version', ''))
+        self.digest = digest
+        self.path = path
+        self._patterns: Dict[str, List[regex_engine.CompiledPattern]] = {}
+        self._labels: Dict[str, List[str]] = {}
+        self._templates: Dict[str, Tuple[str, int]] = {}
+        self._template_cache: Dict[Tuple[str, Tuple], regex_engine.CompiledPattern] = {}
+
+        for name, entry in data.get('patterns', {}).items():
+            flags = _flags(entry.get('flags', []))
+            if 'template' in entry:
+                self._templates[name] = (entry['template'], flags)
+                continue
+            regexes = entry['regex'] if isinstance(entry['regex'], list) else [entry['regex']]
+            self._patterns[name] = [regex_engine.compile(regex, flags) for regex in regexes]
+            if 'labels' in entry:
+                self._labels[name] = list(entry['labels'])
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, path: str = "") -> "PatternPack":
+        """Lee un paquete (JSON, o TOML si la ruta termina en .toml) o lo toma de la caché."""
+        digest = hashlib.sha256(raw).hexdigest()
+        cached = _PACK_CACHE.get(digest)
+        if cached is not None:
+            return cached
+
+        if path.endswith('.toml'):
+            if not TOML_AVAILABLE:
+                raise ValueError("Los paquetes TOML necesitan Python 3.11 o superior (tomllib)")
+            data = tomllib.loads(raw.decode('utf-8'))
+        else:
+            data = json.loads(raw.decode('utf-8'))
+
+        pack = cls(data, digest, path)
+        _PACK_CACHE[digest] = pack
+        return pack
+
+    @classmethod
+    def from_file(cls, path: str) -> "PatternPack":
+        """Lee un paquete de un fichero."""
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read(), path)
+
+    def get(self, name: str) -> regex_engine.CompiledPattern:
+        """Primer (o único) patrón de una entrada."""
+        return self._patterns[name][0]
+
+    def get_list(self, name: str) -> List[regex_engine.CompiledPattern]:
+        """Todos los patrones de una entrada, en orden."""
+        return self._patterns[name]
+
+    def labels(self, name: str) -> List[str]:
+        """Etiquetas legibles de los patrones de una entrada (vacía si no tiene)."""
+        return self._labels.get(name, [])
+
+    def template(self, name: str, **values: Any) -> regex_engine.CompiledPattern:
+        """Patrón de una plantilla con los huecos rellenados (compilado una vez por valores)."""
+        key = (name, tuple(sorted(values.items())))
+        pattern = self._template_cache.get(key)
+        if pattern is None:
+            template, flags = self._templates[name]
+            regex = PLACEHOLDER_PATTERN.sub(
+                lambda m: str(values[m.group(1)]) if m.group(1) in values else m.group(0), template)
+            pattern = self._template_cache[key] = regex_engine.compile(regex, flags)
+        return pattern
+
+    def is_template(self, name: str) -> bool:
+        """Indica si una entrada es una plantilla."""
+        return name in self._templates
+
+    def names(self) -> List[str]:
+        """Nombres de todas las entradas del paquete."""
+        return sorted(list(self._patterns) + list(self._templates))
+
+
+# Paquetes ya compilados, por hash del contenido
+_PACK_CACHE: Dict[str, PatternPack] = {}
+
+
+class PatternPackLoader:
+    """Paquete de patrones de un fichero que se recarga cuando el fichero cambia."""
+
+    def __init__(self, path: str = DEFAULT_PACK_PATH, check_interval: float = 1.0):
+        """
+        Carga el paquete inicial.
+
+        Args:
+            path: Fichero del paquete
+            check_interval: Segundos mínimos entre comprobaciones del fichero (0 comprueba
+                en cada llamada)
+
+        Raises:
+            OSError, ValueError, re.error: Si el paquete inicial no se puede cargar
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._stat = self._file_stat()
+        self._pack = PatternPack.from_file(path)
+        self._next_check = time.monotonic() + check_interval
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self) -> PatternPack:
+        """Paquete vigente, recargado si el fichero ha cambiado desde la última comprobación."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._pack
+
+        with self._lock:
+            self._next_check = now + self.check_interval
+            stat = self._file_stat()
+            if stat is None or stat == self._stat:
+                return self._pack
+            self._stat = stat
+            try:
+                pack = PatternPack.from_file(self.path)
+            except (OSError, ValueError, KeyError, re.error) as e:
+                logger.warning(f"No se pudo recargar el paquete de patrones {self.path}: {e}; se mantiene la versión "
+                               f"{self._pack.version}")
+                return self._pack
+            if pack.digest != self._pack.digest:
+                logger.info(f"Paquete de patrones recargado: versión {self._pack.version} → {pack.version}")
+                self._pack = pack
+                self.reloads += 1
+        return self._pack
+
+
+_default_loader: Optional[PatternPackLoader] = None
+
+
+def current_pack() -> PatternPack:
+    """Paquete vigente del fichero por defecto (se carga en el primer uso)."""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = PatternPackLoader(DEFAULT_PACK_PATH)
+    return _default_loader.get()
+
+
+def main():
+    """Valida un paquete de patrones y muestra su contenido."""
+    import argparse
+    parser = argparse.ArgumentParser(description='Valida un paquete de patrones de extracción')
+    parser.add_argument('path', nargs='?', default=DEFAULT_PACK_PATH, help='Fichero del paquete')
+    args = parser.parse_args()
+
+    pack = PatternPack.from_file(args.path)
+    print(f"Paquete {args.path}: versión {pack.version}, sha256 {pack.digest[:12]}")
+    for name in pack.names():
+        kind = 'plantilla' if pack.is_template(name) else f"{len(pack.get_list(name))} patrones"
+        print(f"   {name}: {kind}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,19 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
+from ndjson_output import NDJSONWriter
+from models import Document
+from summary_renderer import iter_articles_summary, iter_individual_summary, write_summary
+from text_cache import TextCache, make_article_ref
+from checkpoint import CheckpointStore
+from metrics import RunMetrics
+from profiling import DocumentProfiler, add_profile_arguments, profiler_from_args
+from pattern_pack import current_pack
+import regex_engine
+from spanish_numbers import AMOUNT_PATTERN, normalize_amount, number_to_words, words_to_number
+from keyword_automaton import document_prefilter
+from spanish_dates import annotate_deadlines
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,50 +50,129 @@ logger = logging.getLogger("BecasExtractor")
 class BecasExtractor:
     """Extractor de información específica de artículos de becas del Ministerio de Educación."""
     
-    def __init__(self):
+    # Artículos que se extraen de cada convocatoria: (clave, número, título)
+    ARTICLES = [
+        ('article_3', 3, 'Enseñanzas comprendidas'),
+        ('article_4', 4, 'Clases y cuantías de las becas'),
+        ('article_11', 11, 'Cuantías de las becas'),
+        ('article_19', 19, 'Umbrales de renta'),
+        ('article_24', 24, 'Rendimiento académico'),
+        ('article_48', 48, 'Lugar y plazo de presentación de solicitudes')
+    ]
+    
+    # Campos estructurados: (clave del resultado, método de extracción, artículo de origen)
+    FIELDS = [
+        ('eligible_studies', 'extract_eligible_studies', 'article_3'),
+        ('scholarship_types', 'extract_scholarship_types', 'article_4'),
+        ('scholarship_amounts', 'extract_scholarship_amounts', 'article_11'),
+        ('income_thresholds', 'extract_income_thresholds', 'article_19'),
+        ('academic_requirements', 'extract_academic_requirements', 'article_24'),
+        ('application_deadlines', 'extract_application_deadlines', 'article_48')
+    ]
+    
+    def __init__(self, text_cache: Optional[TextCache] = None,
+                 checkpoint: Optional[CheckpointStore] = None,
+                 metrics: Optional[RunMetrics] = None,
+                 profiler: Optional[DocumentProfiler] = None):
+        """
+        Inicializa el extractor.
+        
+        Args:
+            text_cache: Si se indica, los artículos se guardan como referencias
+                (clave, inicio, fin) al texto almacenado en esta caché (modo compacto)
+            checkpoint: Si se indica, cada documento completado se registra en este almacén
+                y, al reanudar, los ya completados se recuperan sin volver a extraerlos
+            metrics: Si se indica, se miden los tiempos de cada etapa de la extracción
+            profiler: Si se indica, el procesamiento de cada documento se perfila por separado
+        """
         self.results = []
+        self.text_cache = text_cache
+        self.checkpoint = checkpoint
+        self.metrics = metrics if metrics is not None else RunMetrics(enabled=False)
+        self.profiler = profiler if profiler is not None else DocumentProfiler(None, '')
     
     def process_files(self, input_dir: str) -> List[Dict[str, Any]]:
         """Procesa todos los archivos en el directorio de entrada."""
+        for result in self.iter_files(input_dir):
+            self.results.append(result)
+        
+        return self.results
+    
+    def iter_files(self, input_dir: str):
+        """Procesa los archivos del directorio de entrada y devuelve cada resultado válido según termina."""
         if not os.path.exists(input_dir):
             logger.error(f"El directorio {input_dir} no existe")
-            return []
+            return
         
         files = [f for f in os.listdir(input_dir) if f.endswith('.txt') or f.endswith('.pdf')]
         logger.info(f"Se encontraron {len(files)} archivos para procesar")
         
         for file_name in files:
             file_path = os.path.join(input_dir, file_name)
+            
+            # Documentos completados en una ejecución anterior
+            record = self.checkpoint.load(file_name, file_path) if self.checkpoint else None
+            if record is not None:
+                logger.info(f"Recuperado del punto de control: {file_name}")
+                if record['valid']:
+                    yield record['result']
+                continue
+            
             logger.info(f"Procesando archivo: {file_name}")
+            self.metrics.start_document(file_name, file_path)
             
             try:
-                # Para archivos PDF, primero convertirlos a texto
-                if file_name.endswith('.pdf'):
+                with self.profiler.profile(file_name):
                     try:
-                        import PyPDF2
-                        with open(file_path, 'rb') as pdf_file:
-                            # Usar PdfReader en lugar de PdfFileReader
-                            pdf_reader = PyPDF2.PdfReader(pdf_file)
-                            text = ""
-                            for page_num in range(len(pdf_reader.pages)):
-                                text += pdf_reader.pages[page_num].extract_text()
+                        text = self.read_text(file_path)
                     except ImportError:
                         logger.error("PyPDF2 no está instalado. No se pueden procesar archivos PDF.")
+                        self.metrics.end_document(valid=False)
                         continue
-                else:
-                    with open(file_path, 'r', encoding='utf-8') as file:
-                        text = file.read()
                     
-                result = self.extract_data(text, file_name)
-                if result['valid']:
-                    self.results.append(result)
-                    logger.info(f"Extracción exitosa para: {file_name}")
-                else:
-                    logger.warning(f"El archivo {file_name} no contiene datos válidos de convocatoria de becas")
+                    result = self.extract_data(text, file_name)
             except Exception as e:
                 logger.error(f"Error al procesar {file_name}: {str(e)}")
+                self.metrics.end_document(valid=False)
+                continue
+            
+            self.metrics.end_document(valid=result['valid'])
+            
+            if self.checkpoint:
+                self.checkpoint.mark_complete(file_name, file_path, result)
+            
+            if result['valid']:
+                logger.info(f"Extracción exitosa para: {file_name}")
+                yield result
+            else:
+                logger.warning(f"El archivo {file_name} no contiene datos válidos de convocatoria de becas")
+    
+    def read_text(self, file_path: str) -> str:
+        """
+        Devuelve el texto de un archivo: los PDF se convierten con PyPDF2 y el resto se lee tal cual.
+        
+        Raises:
+            ImportError: Si el archivo es un PDF y PyPDF2 no está instalado
+        """
+        if file_path.endswith('.pdf'):
+            import PyPDF2
+            with open(file_path, 'rb') as pdf_file:
+                # Usar PdfReader en lugar de PdfFileReader
+                with self.metrics.stage('open', bytes=os.path.getsize(file_path)):
+                    pdf_reader = PyPDF2.PdfReader(pdf_file)
+                text = ""
+                for page_num in range(len(pdf_reader.pages)):
+                    with self.metrics.stage('page_extraction', pages=1):
+                        text += pdf_reader.pages[page_num].extract_text()
+            return text
         
-        return self.results
+        with self.metrics.stage('open', bytes=os.path.getsize(file_path)):
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+    
+    def extract_document(self, text: str, file_name: str) -> Document:
+        """Extrae los datos del texto y los devuelve como documento tipado."""
+        return Document.from_dict(self.extract_data(text, file_name))
     
     def extract_data(self, text: str, file_name: str) -> Dict[str, Any]:
         """Extrae los datos específicos de los artículos mencionados."""
@@ -91,76 +183,82 @@ class BecasExtractor:
         }
         
         # Verificar si es un documento válido de convocatoria de becas
-        if not self.is_valid_scholarship_text(text):
+        with self.metrics.stage('validation', bytes=len(text)):
+            valid = self.is_valid_scholarship_text(text)
+        if not valid:
             return result
         
         # Extraer los diferentes componentes
         result['valid'] = True
-        result['academic_year'] = self.extract_academic_year(text)
+        with self.metrics.stage('extract_academic_year'):
+            result['academic_year'] = self.extract_academic_year(text)
         
         # Extraer artículos específicos
-        result['article_3'] = self.extract_article(text, 3, 'Enseñanzas comprendidas')
-        result['article_4'] = self.extract_article(text, 4, 'Clases y cuantías de las becas')
-        result['article_11'] = self.extract_article(text, 11, 'Cuantías de las becas')
-        result['article_19'] = self.extract_article(text, 19, 'Umbrales de renta')
-        result['article_24'] = self.extract_article(text, 24, 'Rendimiento académico')
-        result['article_48'] = self.extract_article(text, 48, 'Lugar y plazo de presentación de solicitudes')
+        article_spans = {}
+        with self.metrics.stage('article_slicing', bytes=len(text)):
+            for key, number, title in self.ARTICLES:
+                span = self.locate_article(text, number, title)
+                article_spans[key] = span
+                result[key] = text[span[0]:span[1]] if span else ""
         
         # Extraer y estructurar información específica de cada artículo
-        result['eligible_studies'] = self.extract_eligible_studies(result['article_3'] if 'article_3' in result else "")
-        result['scholarship_types'] = self.extract_scholarship_types(result['article_4'] if 'article_4' in result else "")
-        result['scholarship_amounts'] = self.extract_scholarship_amounts(result['article_11'] if 'article_11' in result else "")
-        result['income_thresholds'] = self.extract_income_thresholds(result['article_19'] if 'article_19' in result else "")
-        result['academic_requirements'] = self.extract_academic_requirements(result['article_24'] if 'article_24' in result else "")
-        result['application_deadlines'] = self.extract_application_deadlines(result['article_48'] if 'article_48' in result else "")
+        for key, method_name, article_key in self.FIELDS:
+            article_text = result.get(article_key, "")
+            with self.metrics.stage(method_name, bytes=len(article_text)):
+                result[key] = getattr(self, method_name)(article_text)
+        
+        # En modo compacto, sustituir el texto de cada artículo por su referencia en la caché
+        if self.text_cache is not None:
+            text_key = self.text_cache.put(text)
+            for key, span in article_spans.items():
+                result[key] = make_article_ref(text_key, span)
         
         return result
     
     def is_valid_scholarship_text(self, text: str) -> bool:
         """Verifica si el texto corresponde a una convocatoria de becas."""
         # Buscar presencia de artículos específicos
-        articles_patterns = [
-            r'Artículo\s+3\s*\.\s*Enseñanzas',
-            r'Artículo\s+4\s*\.\s*Clases',
-            r'Artículo\s+11\s*\.\s*Cuantías',
-            r'Artículo\s+19\s*\.\s*Umbrales',
-            r'Artículo\s+24\s*\.\s*Rendimiento',
-            r'Artículo\s+48\s*\.\s*Lugar'
-        ]
-        
-        matches = sum(1 for pattern in articles_patterns if re.search(pattern, text, re.IGNORECASE))
+        articles_patterns = current_pack().get_list('validation_articles')
+        matches = sum(1 for match in document_prefilter().search(text, articles_patterns) if match)
         return matches >= 2  # Si al menos hay 2 artículos, consideramos que es un documento válido
     
     def extract_article(self, text: str, article_number: int, article_title: str = "") -> str:
         """Extrae el contenido completo de un artículo específico."""
+        span = self.locate_article(text, article_number, article_title)
+        if span:
+            return text[span[0]:span[1]]
+        
+        return ""
+    
+    def locate_article(self, text: str, article_number: int, article_title: str = "") -> Optional[Tuple[int, int]]:
+        """Devuelve las posiciones (inicio, fin) de un artículo en el texto, sin espacios en los extremos."""
         # Primero intentamos con el título
+        match = None
+        pack = current_pack()
         if article_title:
-            pattern = rf'Artículo\s+{article_number}\s*\.\s*{article_title}.*?(?=Artículo\s+{article_number+1}\s*\.|\Z)'
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                return match.group(0).strip()
+            pattern = pack.template('article_with_title', number=article_number, title=article_title,
+                                    next=article_number + 1)
+            match = pattern.search(text)
         
         # Si no funciona, intentamos solo con el número
-        pattern = rf'Artículo\s+{article_number}\s*\..*?(?=Artículo\s+{article_number+1}\s*\.|\Z)'
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(0).strip()
-        
-        return ""
+        if not match:
+            pattern = pack.template('article_number_only', number=article_number, next=article_number + 1)
+            match = pattern.search(text)
+        
+        if not match:
+            return None
+        
+        # Equivalente a match.group(0).strip() pero conservando las posiciones
+        content = match.group(0)
+        start = match.start() + (len(content) - len(content.lstrip()))
+        end = match.end() - (len(content) - len(content.rstrip()))
+        return (start, end) if end > start else None
     
     def extract_academic_year(self, text: str) -> Dict[str, str]:
         """Extrae el año académico del texto."""
-        patterns = [
-            r'CURSO ACADÉMICO (\d{4}-\d{4})',
-            r'curso académico (\d{4}-\d{4})',
-            r'para el curso (\d{4}-\d{4})',
-            r'BECAS.*?(\d{4}-\d{4})',
-            r'BECAS.*?CURSO.*?(\d{4}-\d{4})',
-            r'curso.*?(\d{4}-\d{4})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        pack = current_pack()
+        for pattern in pack.get_list('academic_year') + pack.get_list('academic_year_fallback'):
+            match = pattern.search(text)
             if match:
                 return {
                     "year": match.group(1),
@@ -179,14 +277,14 @@ class BecasExtractor:
         
         # Extraer estudios no universitarios (punto 1)
         non_uni_pattern = r'1\.\s+Enseñanzas postobligatorias.*?(?=2\.|$)'
-        non_uni_match = re.search(non_uni_pattern, text, re.DOTALL)
+        non_uni_match = regex_engine.search(non_uni_pattern, text, re.DOTALL)
         
         if non_uni_match:
             non_uni_text = non_uni_match.group(0)
             result["non_university_section"] = "Enseñanzas postobligatorias y superiores no universitarias"
             
             # Extraer cada tipo de estudio no universitario por letras (a, b, c...)
-            non_uni_items = re.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', non_uni_text, re.DOTALL)
+            non_uni_items = regex_engine.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', non_uni_text, re.DOTALL)
             for identifier, description in non_uni_items:
                 result["non_university_studies"].append({
                     "identifier": identifier.strip(),
@@ -195,14 +293,14 @@ class BecasExtractor:
         
         # Extraer estudios universitarios (punto 2)
         uni_pattern = r'2\.\s+Enseñanzas universitarias.*?(?=$)'
-        uni_match = re.search(uni_pattern, text, re.DOTALL)
+        uni_match = regex_engine.search(uni_pattern, text, re.DOTALL)
         
         if uni_match:
             uni_text = uni_match.group(0)
             result["university_section"] = "Enseñanzas universitarias del sistema universitario español"
             
             # Extraer cada tipo de estudio universitario por letras (a, b, c...)
-            uni_items = re.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', uni_text, re.DOTALL)
+            uni_items = regex_engine.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', uni_text, re.DOTALL)
             for identifier, description in uni_items:
                 result["university_studies"].append({
                     "identifier": identifier.strip(),
@@ -221,12 +319,12 @@ class BecasExtractor:
         
         # Extraer cuantías fijas
         fixed_pattern = r'1\.\s+Cuantías fijas.*?(?=2\.|$)'
-        fixed_match = re.search(fixed_pattern, text, re.DOTALL)
+        fixed_match = regex_engine.search(fixed_pattern, text, re.DOTALL)
         
         if fixed_match:
             fixed_text = fixed_match.group(0)
             # Extraer cada tipo de cuantía fija
-            fixed_items = re.findall(r'([a-z]\))([^a-z\)]+)|([A-Za-z][^.\n]+)', fixed_text, re.DOTALL | re.IGNORECASE)
+            fixed_items = regex_engine.findall(r'([a-z]\))([^a-z\)]+)|([A-Za-z][^.\n]+)', fixed_text, re.DOTALL | re.IGNORECASE)
             
             for item in fixed_items:
                 if item[0]:  # Si hay un identificador de letra
@@ -243,7 +341,7 @@ class BecasExtractor:
         
         # Extraer cuantía variable
         variable_pattern = r'2\.\s+Cuantía variable.*?(?=$)'
-        variable_match = re.search(variable_pattern, text, re.DOTALL)
+        variable_match = regex_engine.search(variable_pattern, text, re.DOTALL)
         
         if variable_match:
             variable_text = variable_match.group(0)
@@ -262,7 +360,7 @@ class BecasExtractor:
         
         # Extraer componentes por letras (A, B, C...)
         components_pattern = r'([A-F]\))(.*?)(?=[A-F]\)|$)'
-        components = re.findall(components_pattern, text, re.DOTALL)
+        components = regex_engine.findall(components_pattern, text, re.DOTALL)
         
         for identifier, description in components:
             component = {
@@ -277,16 +375,16 @@ class BecasExtractor:
             
             elif "B)" in identifier:  # Cuantía fija ligada a la renta
                 component["type"] = "Cuantía fija ligada a la renta"
-                amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+                amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
                 if amount_match:
-                    component["amount"] = amount_match.group(1).replace(',', '.')
+                    component["amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"{amount_match.group(1)} euros"
             
             elif "C)" in identifier:  # Cuantía fija ligada a la residencia
                 component["type"] = "Cuantía fija ligada a la residencia"
-                amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+                amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
                 if amount_match:
-                    component["amount"] = amount_match.group(1).replace(',', '.')
+                    component["amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"{amount_match.group(1)} euros"
             
             elif "D)" in identifier:  # Cuantía fija ligada a la excelencia
@@ -294,20 +392,20 @@ class BecasExtractor:
                 component["ranges"] = []
                 
                 # Extraer rangos de notas y cantidades
-                ranges = re.findall(r'Entre\s+(\d+[,.]\d+)\s+y\s+(\d+[,.]\d+).*?(\d+)\s+euros', description)
+                ranges = regex_engine.findall(r'Entre\s+(\d+[,.]\d+)\s+y\s+(\d+[,.]\d+).*?(\d+)\s+euros', description)
                 for min_score, max_score, amount in ranges:
                     component["ranges"].append({
-                        "min_score": min_score.replace(',', '.'),
-                        "max_score": max_score.replace(',', '.'),
+                        "min_score": normalize_amount(min_score),
+                        "max_score": normalize_amount(max_score),
                         "amount": amount,
                         "description": f"Entre {min_score} y {max_score} puntos: {amount} euros"
                     })
                 
                 # Extraer el rango más alto
-                highest_match = re.search(r'(\d+[,.]\d+).*?puntos\s+o\s+más.*?(\d+)\s+euros', description)
+                highest_match = regex_engine.search(r'(\d+[,.]\d+).*?puntos\s+o\s+más.*?(\d+)\s+euros', description)
                 if highest_match:
                     component["ranges"].append({
-                        "min_score": highest_match.group(1).replace(',', '.'),
+                        "min_score": normalize_amount(highest_match.group(1)),
                         "max_score": "10.00",
                         "amount": highest_match.group(2),
                         "description": f"{highest_match.group(1)} puntos o más: {highest_match.group(2)} euros"
@@ -315,13 +413,13 @@ class BecasExtractor:
             
             elif "E)" in identifier:  # Beca básica
                 component["type"] = "Beca básica"
-                amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+                amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
                 if amount_match:
-                    component["amount"] = amount_match.group(1).replace(',', '.')
+                    component["amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"{amount_match.group(1)} euros"
                 
                 # Extraer caso especial para Ciclos Formativos de Grado Básico
-                grado_basico_match = re.search(r'Ciclos Formativos de Grado Básico.*?(\d+)\s*euros', description)
+                grado_basico_match = regex_engine.search(r'Ciclos Formativos de Grado Básico.*?(\d+)\s*euros', description)
                 if grado_basico_match:
                     component["special_case"] = {
                         "case": "Ciclos Formativos de Grado Básico",
@@ -331,9 +429,9 @@ class BecasExtractor:
             
             elif "F)" in identifier:  # Cuantía variable
                 component["type"] = "Cuantía variable"
-                amount_match = re.search(r'mínimo.*?(\d+[,.]\d+)\s*euros', description, re.IGNORECASE)
+                amount_match = regex_engine.search(r'mínimo.*?' + AMOUNT_PATTERN + r'\s*euros', description, re.IGNORECASE)
                 if amount_match:
-                    component["minimum_amount"] = amount_match.group(1).replace(',', '.')
+                    component["minimum_amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"Mínimo de {amount_match.group(1)} euros"
             
             result["components"].append(component)
@@ -350,7 +448,7 @@ class BecasExtractor:
         # Extraer cada umbral (1, 2, 3)
         for threshold_num in range(1, 4):
             threshold_pattern = rf'{threshold_num}\.\s+Umbral\s+{threshold_num}:.*?(?={threshold_num+1}\.|A partir|$)'
-            threshold_match = re.search(threshold_pattern, text, re.DOTALL)
+            threshold_match = regex_engine.search(threshold_pattern, text, re.DOTALL)
             
             if threshold_match:
                 threshold_text = threshold_match.group(0)
@@ -372,9 +470,9 @@ class BecasExtractor:
                 ]
                 
                 for i, pattern in enumerate(family_patterns, 1):
-                    match = re.search(pattern, threshold_text)
+                    match = regex_engine.search(pattern, threshold_text)
                     if match:
-                        amount = match.group(1).replace('.', '').replace(',', '.')
+                        amount = normalize_amount(match.group(1))
                         threshold["family_sizes"].append({
                             "size": str(i),
                             "amount": amount,
@@ -383,11 +481,11 @@ class BecasExtractor:
                 
                 # Extraer información adicional
                 additional_pattern = r'A partir del octavo miembro.*?(\d+[.,]\d+)'
-                additional_match = re.search(additional_pattern, text)
+                additional_match = regex_engine.search(additional_pattern, text)
                 if additional_match:
                     threshold["additional_info"] = {
                         "description": f"A partir del octavo miembro se añadirán {additional_match.group(1)} euros por cada nuevo miembro computable",
-                        "amount_per_member": additional_match.group(1).replace(',', '.')
+                        "amount_per_member": normalize_amount(additional_match.group(1))
                     }
                 
                 if threshold["family_sizes"]:
@@ -404,7 +502,7 @@ class BecasExtractor:
         
         # Extraer porcentajes por rama de conocimiento
         percentages_pattern = r'Rama o área de conocimiento.*?(?=\s*\d+\.\s+|$)'
-        percentages_match = re.search(percentages_pattern, text, re.DOTALL)
+        percentages_match = regex_engine.search(percentages_pattern, text, re.DOTALL)
         
         if percentages_match:
             percentages_text = percentages_match.group(0)
@@ -418,7 +516,7 @@ class BecasExtractor:
                 "Ingeniería o Arquitectura"
             ]
             
-            percentages = re.findall(r'(\d+)%', percentages_text)
+            percentages = regex_engine.findall(r'(\d+)%', percentages_text)
             
             if len(percentages) >= len(areas):
                 for i, area in enumerate(areas):
@@ -430,7 +528,7 @@ class BecasExtractor:
                     })
         
         # Extraer nota mínima para primer curso
-        nota_min_match = re.search(r'primer curso.*?(\d+[,.]\d+) puntos', text, re.IGNORECASE)
+        nota_min_match = regex_engine.search(r'primer curso.*?(\d+[,.]\d+) puntos', text, re.IGNORECASE)
         if nota_min_match:
             result["requirements"].append({
                 "type": "Nota mínima primer curso",
@@ -450,22 +548,22 @@ class BecasExtractor:
         # Extraer plazos específicos
         # Plazo para estudiantes universitarios
         uni_pattern = r'A\)(.*?)(?=B\)|$)'
-        uni_match = re.search(uni_pattern, text, re.DOTALL)
+        uni_match = regex_engine.search(uni_pattern, text, re.DOTALL)
         if uni_match:
             uni_text = uni_match.group(1).strip()
-            date_match = re.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+\s+de\s+\d{4})', uni_text, re.IGNORECASE)
+            date_match = regex_engine.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+\s+de\s+\d{4})', uni_text, re.IGNORECASE)
             
             # Si no encuentra la fecha completa, buscar solo el día y mes
             if not date_match:
-                date_match = re.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+)', uni_text, re.IGNORECASE)
+                date_match = regex_engine.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+)', uni_text, re.IGNORECASE)
             
             # Si aún no encuentra, buscar cualquier fecha con formato dd/mm/yyyy
             if not date_match:
-                date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', uni_text)
+                date_match = regex_engine.search(r'(\d{1,2}/\d{1,2}/\d{4})', uni_text)
             
             # Último intento: buscar cualquier día con un año
             if not date_match:
-                date_match = re.search(r'(\d{1,2}.*?\d{4})', uni_text)
+                date_match = regex_engine.search(r'(\d{1,2}.*?\d{4})', uni_text)
             
             deadline_date = date_match.group(1) if date_match else uni_text
             result["deadlines"].append({
@@ -476,22 +574,22 @@ class BecasExtractor:
         
         # Plazo para estudiantes no universitarios
         non_uni_pattern = r'B\)(.*?)(?=\d+\.|Artículo|$)'
-        non_uni_match = re.search(non_uni_pattern, text, re.DOTALL)
+        non_uni_match = regex_engine.search(non_uni_pattern, text, re.DOTALL)
         if non_uni_match:
             non_uni_text = non_uni_match.group(1).strip()
-            date_match = re.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+\s+de\s+\d{4})', non_uni_text, re.IGNORECASE)
+            date_match = regex_engine.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+\s+de\s+\d{4})', non_uni_text, re.IGNORECASE)
             
             # Si no encuentra la fecha completa, buscar solo el día y mes
             if not date_match:
-                date_match = re.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+)', non_uni_text, re.IGNORECASE)
+                date_match = regex_engine.search(r'(\d{1,2}\s+de\s+[a-zá-úñ]+)', non_uni_text, re.IGNORECASE)
             
             # Si aún no encuentra, buscar cualquier fecha con formato dd/mm/yyyy
             if not date_match:
-                date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', non_uni_text)
+                date_match = regex_engine.search(r'(\d{1,2}/\d{1,2}/\d{4})', non_uni_text)
             
             # Último intento: buscar cualquier día con un año
             if not date_match:
-                date_match = re.search(r'(\d{1,2}.*?\d{4})', non_uni_text)
+                date_match = regex_engine.search(r'(\d{1,2}.*?\d{4})', non_uni_text)
             
             deadline_date = date_match.group(1) if date_match else non_uni_text
             result["deadlines"].append({
@@ -502,7 +600,7 @@ class BecasExtractor:
         
         # Casos excepcionales
         exceptional_pattern = r'2\.\s+.*?después de los plazos.*?hasta el (\d{1,2}.*?\d{4}).*?en caso de (.*?)(?=$|Artículo)'
-        exceptional_match = re.search(exceptional_pattern, text, re.DOTALL | re.IGNORECASE)
+        exceptional_match = regex_engine.search(exceptional_pattern, text, re.DOTALL | re.IGNORECASE)
         if exceptional_match:
             result["exceptional_cases"] = {
                 "deadline": exceptional_match.group(1),
@@ -510,324 +608,37 @@ class BecasExtractor:
                 "description": f"Excepcionalmente hasta el {exceptional_match.group(1)} en caso de {exceptional_match.group(2).strip()}"
             }
         
-        return result
+        return annotate_deadlines(result, text)
     
     def number_to_text(self, number: int) -> str:
         """Convierte un número a texto."""
-        text_numbers = {
-            1: "un",
-            2: "dos",
-            3: "tres",
-            4: "cuatro",
-            5: "cinco",
-            6: "seis",
-            7: "siete",
-            8: "ocho"
-        }
-        return text_numbers.get(number, str(number))
+        return number_to_words(number)
     
     def convert_text_number(self, text: str) -> str:
-        """Convierte texto de número a dígitos."""
-        text_to_num = {
-            "un": "1", "uno": "1",
-            "dos": "2",
-            "tres": "3",
-            "cuatro": "4",
-            "cinco": "5",
-            "seis": "6",
-            "siete": "7",
-            "ocho": "8"
-        }
-        # Si ya es un dígito, devolverlo tal cual
-        if text.isdigit():
-            return text
-        return text_to_num.get(text.lower(), text)
+        """Convierte texto de número a dígitos (devuelve el texto si no es un número)."""
+        number = words_to_number(text)
+        return text if number is None else str(number)
     
-    def generate_summary(self, data: List[Dict[str, Any]]) -> str:
-        """Genera un resumen en formato Markdown."""
-        # Filtrar documentos no válidos
-        valid_data = [item for item in data if item.get('valid', False)]
-        
-        if not valid_data:
-            return "# Resumen de Becas Educativas\n\nNo se encontraron documentos válidos para analizar."
-        
-        # Ordenar por año académico
-        sorted_data = sorted(valid_data, key=lambda x: x.get('academic_year', {}).get('year', ''))
-        
-        # Obtener el documento más reciente para el resumen principal
-        latest_data = sorted_data[-1]
-        
-        summary = "# Resumen de Becas Educativas del Ministerio de Educación y Formación Profesional\n\n"
-        
-        # Sección de información general
-        academic_year = latest_data.get('academic_year', {})
-        if academic_year:
-            summary += f"## Información General\n\n"
-            summary += f"{academic_year.get('description', '')}\n\n"
-        
-        # Sección de estudios elegibles (Artículo 3)
-        eligible_studies = latest_data.get('eligible_studies', {})
-        if eligible_studies:
-            summary += f"## Artículo 3: Estudios Elegibles\n\n"
-            
-            # Estudios no universitarios
-            if 'non_university_studies' in eligible_studies and eligible_studies['non_university_studies']:
-                summary += "### Estudios No Universitarios\n\n"
-                for study in eligible_studies['non_university_studies']:
-                    summary += f"- {study.get('description', '')}\n"
-                summary += "\n"
-            
-            # Estudios universitarios
-            if 'university_studies' in eligible_studies and eligible_studies['university_studies']:
-                summary += "### Estudios Universitarios\n\n"
-                for study in eligible_studies['university_studies']:
-                    summary += f"- {study.get('description', '')}\n"
-                summary += "\n"
-        
-        # Sección de tipos de becas (Artículo 4)
-        scholarship_types = latest_data.get('scholarship_types', {})
-        if scholarship_types:
-            summary += f"## Artículo 4: Clases y Cuantías de las Becas\n\n"
-            
-            # Cuantías fijas
-            if 'fixed_amounts' in scholarship_types and scholarship_types['fixed_amounts']:
-                summary += "### Cuantías Fijas\n\n"
-                for type_info in scholarship_types['fixed_amounts']:
-                    summary += f"- {type_info.get('type', '')}\n"
-                summary += "\n"
-            
-            # Cuantía variable
-            if 'variable_amount' in scholarship_types and 'description' in scholarship_types['variable_amount']:
-                summary += "### Cuantía Variable\n\n"
-                summary += f"{scholarship_types['variable_amount']['description']}\n\n"
-        
-        # Sección de cuantías de las becas (Artículo 11)
-        scholarship_amounts = latest_data.get('scholarship_amounts', {})
-        if scholarship_amounts and 'components' in scholarship_amounts:
-            scholarship_amounts = latest_data.get('scholarship_amounts', {})
-        if scholarship_amounts and 'components' in scholarship_amounts:
-            summary += f"## Artículo 11: Cuantías de las Becas\n\n"
-            
-            for component in scholarship_amounts.get('components', []):
-                component_type = component.get('type', '')
-                summary += f"### {component_type}\n\n"
-                
-                if 'amount_description' in component:
-                    summary += f"{component['amount_description']}\n\n"
-                
-                # Para componentes con rangos (como la excelencia académica)
-                if 'ranges' in component:
-                    for range_info in component['ranges']:
-                        summary += f"- {range_info.get('description', '')}\n"
-                    summary += "\n"
-                
-                # Para casos especiales (como la beca básica para grado básico)
-                if 'special_case' in component:
-                    summary += f"**Caso especial**: {component['special_case'].get('description', '')}\n\n"
-        
-        # Sección de umbrales de renta (Artículo 19)
-        income_thresholds = latest_data.get('income_thresholds', {})
-        if income_thresholds and 'thresholds' in income_thresholds:
-            summary += f"## Artículo 19: Umbrales de Renta Familiar\n\n"
-            
-            for threshold in income_thresholds.get('thresholds', []):
-                summary += f"### Umbral {threshold.get('number', '')}\n\n"
-                
-                for family_size in threshold.get('family_sizes', []):
-                    summary += f"- {family_size.get('description', '')}\n"
-                
-                if 'additional_info' in threshold:
-                    summary += f"\n*{threshold['additional_info'].get('description', '')}*\n"
-                
-                summary += "\n"
-        
-        # Sección de requisitos académicos (Artículo 24)
-        academic_requirements = latest_data.get('academic_requirements', {})
-        if academic_requirements and 'requirements' in academic_requirements:
-            summary += f"## Artículo 24: Requisitos Académicos\n\n"
-            
-            # Agrupar requisitos por tipo
-            requirements_by_type = {}
-            for req in academic_requirements.get('requirements', []):
-                req_type = req.get('type', 'Otros')
-                if req_type not in requirements_by_type:
-                    requirements_by_type[req_type] = []
-                requirements_by_type[req_type].append(req)
-            
-            # Mostrar requisitos agrupados
-            for req_type, reqs in requirements_by_type.items():
-                summary += f"### {req_type}\n\n"
-                for req in reqs:
-                    summary += f"- {req.get('description', '')}\n"
-                summary += "\n"
-        
-        # Sección de plazos de solicitud (Artículo 48)
-        application_deadlines = latest_data.get('application_deadlines', {})
-        if application_deadlines and 'deadlines' in application_deadlines:
-            summary += f"## Artículo 48: Plazos de Solicitud\n\n"
-            
-            for deadline in application_deadlines.get('deadlines', []):
-                summary += f"- **{deadline.get('type', '')}**: {deadline.get('description', '')}\n"
-            
-            if 'exceptional_cases' in application_deadlines:
-                summary += f"\n**Casos excepcionales**: {application_deadlines['exceptional_cases'].get('description', '')}\n"
-            
-            summary += "\n"
-        
-        return summary
+    def generate_summary(self, data: List[Any]) -> str:
+        """Genera un resumen en formato Markdown (acepta diccionarios o ``Document`` tipados)."""
+        return "".join(iter_articles_summary(data))
 
-def generate_individual_summary(data: Dict[str, Any], index: int) -> str:
-    """Genera un resumen en formato Markdown para un solo documento enfocado en artículos específicos."""
-    if not data.get('valid', False):
-        return f"# Resumen de Beca #{index}\n\nEl documento no contiene datos válidos de convocatoria de becas."
-    
-    summary = f"# Resumen de Beca #{index}: {data.get('file_name', '')}\n\n"
-    
-    # Sección de información general
-    academic_year = data.get('academic_year', {})
-    if academic_year:
-        summary += f"## Información General\n\n"
-        summary += f"{academic_year.get('description', '')}\n\n"
-    
-    # Artículo 3: Estudios elegibles
-    eligible_studies = data.get('eligible_studies', {})
-    if eligible_studies:
-        summary += f"## Artículo 3: Estudios Elegibles\n\n"
-        
-        # Incluir texto completo del artículo si está disponible
-        if 'article_3' in data and data['article_3']:
-            summary += "```\n" + data['article_3'] + "\n```\n\n"
-        
-        # Mostrar datos estructurados
-        # Estudios no universitarios
-        if 'non_university_studies' in eligible_studies and eligible_studies['non_university_studies']:
-            summary += "### Estudios No Universitarios\n\n"
-            for study in eligible_studies['non_university_studies']:
-                summary += f"- {study.get('identifier', '')} {study.get('description', '')}\n"
-            summary += "\n"
-        
-        # Estudios universitarios
-        if 'university_studies' in eligible_studies and eligible_studies['university_studies']:
-            summary += "### Estudios Universitarios\n\n"
-            for study in eligible_studies['university_studies']:
-                summary += f"- {study.get('identifier', '')} {study.get('description', '')}\n"
-            summary += "\n"
-    
-    # Artículo 4: Clases y cuantías de becas
-    scholarship_types = data.get('scholarship_types', {})
-    if scholarship_types:
-        summary += f"## Artículo 4: Clases y Cuantías de las Becas\n\n"
-        
-        # Incluir texto completo del artículo si está disponible
-        if 'article_4' in data and data['article_4']:
-            summary += "```\n" + data['article_4'] + "\n```\n\n"
-        
-        # Mostrar datos estructurados
-        # Cuantías fijas
-        if 'fixed_amounts' in scholarship_types and scholarship_types['fixed_amounts']:
-            summary += "### Cuantías Fijas\n\n"
-            for type_info in scholarship_types['fixed_amounts']:
-                summary += f"- {type_info.get('type', '')}\n"
-            summary += "\n"
-        
-        # Cuantía variable
-        if 'variable_amount' in scholarship_types and 'description' in scholarship_types['variable_amount']:
-            summary += "### Cuantía Variable\n\n"
-            summary += f"{scholarship_types['variable_amount']['description']}\n\n"
+def generate_individual_summary(data: Any, index: int, text_cache: Optional[TextCache] = None) -> str:
+    """
+    Genera un resumen en formato Markdown para un solo documento enfocado en artículos específicos.
     
-    # Artículo 11: Cuantías detalladas de las becas
-    scholarship_amounts = data.get('scholarship_amounts', {})
-    if scholarship_amounts and 'components' in scholarship_amounts:
-        summary += f"## Artículo 11: Cuantías de las Becas\n\n"
-        
-        # Incluir texto completo del artículo si está disponible
-        if 'article_11' in data and data['article_11']:
-            summary += "```\n" + data['article_11'] + "\n```\n\n"
-        
-        # Mostrar datos estructurados
-        for component in scholarship_amounts.get('components', []):
-            component_type = component.get('type', '')
-            identifier = component.get('identifier', '')
-            summary += f"### {identifier} {component_type}\n\n"
-            
-            if 'amount_description' in component:
-                summary += f"{component['amount_description']}\n\n"
-            
-            # Para componentes con rangos (como la excelencia académica)
-            if 'ranges' in component:
-                for range_info in component['ranges']:
-                    summary += f"- {range_info.get('description', '')}\n"
-                summary += "\n"
-            
-            # Para casos especiales (como la beca básica para grado básico)
-            if 'special_case' in component:
-                summary += f"**Caso especial**: {component['special_case'].get('description', '')}\n\n"
-    
-    # Artículo 19: Umbrales de renta
-    income_thresholds = data.get('income_thresholds', {})
-    if income_thresholds and 'thresholds' in income_thresholds:
-        summary += f"## Artículo 19: Umbrales de Renta Familiar\n\n"
-        
-        # Incluir texto completo del artículo si está disponible
-        if 'article_19' in data and data['article_19']:
-            summary += "```\n" + data['article_19'] + "\n```\n\n"
-        
-        # Mostrar datos estructurados
-        for threshold in income_thresholds.get('thresholds', []):
-            summary += f"### Umbral {threshold.get('number', '')}\n\n"
-            
-            for family_size in threshold.get('family_sizes', []):
-                summary += f"- {family_size.get('description', '')}\n"
-            
-            if 'additional_info' in threshold:
-                summary += f"\n*{threshold['additional_info'].get('description', '')}*\n"
-            
-            summary += "\n"
-    
-    # Artículo 24: Requisitos académicos
-    academic_requirements = data.get('academic_requirements', {})
-    if academic_requirements and 'requirements' in academic_requirements:
-        summary += f"## Artículo 24: Requisitos Académicos\n\n"
-        
-        # Incluir texto completo del artículo si está disponible
-        if 'article_24' in data and data['article_24']:
-            summary += "```\n" + data['article_24'] + "\n```\n\n"
-        
-        # Mostrar datos estructurados
-        # Agrupar requisitos por tipo
-        requirements_by_type = {}
-        for req in academic_requirements.get('requirements', []):
-            req_type = req.get('type', 'Otros')
-            if req_type not in requirements_by_type:
-                requirements_by_type[req_type] = []
-            requirements_by_type[req_type].append(req)
-        
-        # Mostrar requisitos agrupados
-        for req_type, reqs in requirements_by_type.items():
-            summary += f"### {req_type}\n\n"
-            for req in reqs:
-                summary += f"- {req.get('description', '')}\n"
-            summary += "\n"
-    
-    # Artículo 48: Plazos de solicitud
-    application_deadlines = data.get('application_deadlines', {})
-    if application_deadlines and 'deadlines' in application_deadlines:
-        summary += f"## Artículo 48: Plazos de Solicitud\n\n"
-        
-        # Incluir texto completo del artículo si está disponible
-        if 'article_48' in data and data['article_48']:
-            summary += "```\n" + data['article_48'] + "\n```\n\n"
-        
-        # Mostrar datos estructurados
-        for deadline in application_deadlines.get('deadlines', []):
-            summary += f"- **{deadline.get('type', '')}**: {deadline.get('description', '')}\n"
-        
-        if 'exceptional_cases' in application_deadlines:
-            summary += f"\n**Casos excepcionales**: {application_deadlines['exceptional_cases'].get('description', '')}\n"
-        
-        summary += "\n"
-    
-    return summary
+    Si el documento se extrajo en modo compacto, el texto de los artículos se resuelve
+    bajo demanda a partir de ``text_cache``.
+    """
+    return "".join(iter_individual_summary(data, index, text_cache))
+
+def write_individual_summary(data: Dict[str, Any], index: int, output_dir: str,
+                             text_cache: Optional[TextCache] = None) -> str:
+    """Genera el resumen Markdown numerado de un documento, lo guarda y devuelve su ruta."""
+    individual_summary_path = os.path.join(output_dir, f'beca_{index}.md')
+    with open(individual_summary_path, 'w', encoding='utf-8') as md_file:
+        write_summary(iter_individual_summary(data, index, text_cache), md_file)
+    return individual_summary_path
 
 def main():
     """Función principal del programa."""
@@ -836,44 +647,96 @@ def main():
     parser = argparse.ArgumentParser(description='Extractor de información de becas del Ministerio de Educación')
     parser.add_argument('--input', '-i', required=True, help='Directorio de entrada con archivos de texto')
     parser.add_argument('--output', '-o', required=True, help='Directorio de salida para los resultados')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Escribe los resultados en becas_datos.ndjson según terminan, sin acumularlos en memoria')
+    parser.add_argument('--compact', action='store_true',
+                        help='Guarda los artículos como referencias al texto en <output>/text_cache en lugar de copiarlos')
+    parser.add_argument('--resume', action='store_true',
+                        help='Reanuda una ejecución interrumpida: no vuelve a extraer los documentos ya completados')
+    parser.add_argument('--checkpoint-dir', type=str, default=None,
+                        help='Registra cada documento completado en este directorio (con --resume, por defecto '
+                             '<output>/checkpoints)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Mide los tiempos de cada etapa y guarda el informe en becas_metricas.json')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     # Crear directorio de salida si no existe
     if not os.path.exists(args.output):
         os.makedirs(args.output)
     
-    # Procesar archivos
-    extractor = BecasExtractor()
-    results = extractor.process_files(args.input)
+    text_cache = TextCache(os.path.join(args.output, 'text_cache')) if args.compact else None
+    # Los puntos de control solo se escriben si se van a poder usar
+    checkpoint = (CheckpointStore(args.checkpoint_dir or os.path.join(args.output, 'checkpoints'), resume=args.resume)
+                  if args.resume or args.checkpoint_dir else None)
+    metrics = RunMetrics() if args.metrics else None
+    profiler = profiler_from_args(args, args.output)
+    extractor = BecasExtractor(text_cache=text_cache, checkpoint=checkpoint, metrics=metrics, profiler=profiler)
     
-    # Guardar resultados en JSON
-    json_output_path = os.path.join(args.output, 'becas_datos.json')
-    with open(json_output_path, 'w', encoding='utf-8') as json_file:
-        json.dump(results, json_file, ensure_ascii=False, indent=2)
+    if args.ndjson:
+        # Modo streaming: cada documento se escribe en cuanto termina
+        json_output_path = os.path.join(args.output, 'becas_datos.ndjson')
+        latest_result = None
+        individual_summaries = []
+        
+        with NDJSONWriter(json_output_path) as writer:
+            for i, result in enumerate(extractor.iter_files(args.input), 1):
+                with extractor.metrics.stage('serialization'):
+                    writer.write(result)
+                with extractor.metrics.stage('summary_rendering'):
+                    individual_summaries.append(write_individual_summary(result, i, args.output, text_cache))
+                
+                # El resumen general solo necesita la convocatoria más reciente
+                year = result.get('academic_year', {}).get('year', '')
+                if latest_result is None or year >= latest_result.get('academic_year', {}).get('year', ''):
+                    latest_result = result
+        
+        processed_count = writer.count
+        summary_chunks = iter_articles_summary([latest_result] if latest_result else [])
+    else:
+        # Procesar archivos
+        results = extractor.process_files(args.input)
+        
+        # Guardar resultados en JSON
+        json_output_path = os.path.join(args.output, 'becas_datos.json')
+        with extractor.metrics.stage('serialization') as stage:
+            with open(json_output_path, 'w', encoding='utf-8') as json_file:
+                json.dump(results, json_file, ensure_ascii=False, indent=2)
+                stage.bytes = json_file.tell()
+        
+        # Generar archivos Markdown numerados para cada documento
+        with extractor.metrics.stage('summary_rendering'):
+            individual_summaries = [write_individual_summary(result, i, args.output, text_cache)
+                                    for i, result in enumerate(results, 1)]
+        
+        processed_count = len(results)
+        summary_chunks = iter_articles_summary(results)
     
-    # Generar resumen general en Markdown
-    summary = extractor.generate_summary(results)
+    # Guardar resumen general en Markdown
     markdown_output_path = os.path.join(args.output, 'becas_resumen.md')
-    with open(markdown_output_path, 'w', encoding='utf-8') as md_file:
-        md_file.write(summary)
-    
-    # Generar archivos Markdown numerados para cada documento
-    individual_summaries = []
-    for i, result in enumerate(results, 1):
-        individual_summary = generate_individual_summary(result, i)
-        individual_summary_path = os.path.join(args.output, f'beca_{i}.md')
-        with open(individual_summary_path, 'w', encoding='utf-8') as md_file:
-            md_file.write(individual_summary)
-        individual_summaries.append(individual_summary_path)
+    with extractor.metrics.stage('summary_rendering'):
+        with open(markdown_output_path, 'w', encoding='utf-8') as md_file:
+            write_summary(summary_chunks, md_file)
     
     # Mostrar resumen de resultados
     logger.info(f"Procesamiento completado:")
-    logger.info(f"- Documentos procesados: {len(results)}")
+    logger.info(f"- Documentos procesados: {processed_count}")
+    if args.resume:
+        logger.info(f"- Recuperados de puntos de control: {checkpoint.restored}")
     logger.info(f"- Resultados guardados en: {json_output_path}")
     logger.info(f"- Resumen general generado en: {markdown_output_path}")
     logger.info(f"- Resúmenes individuales generados:")
     for i, path in enumerate(individual_summaries, 1):
         logger.info(f"  {i}. {path}")
+    
+    if profiler.saved:
+        logger.info(f"- Perfiles guardados en {profiler.output_dir} ({len(profiler.saved)} documentos)")
+    
+    if metrics is not None:
+        metrics_path = os.path.join(args.output, 'becas_metricas.json')
+        report = metrics.save(metrics_path)
+        logger.info(f"- Rendimiento: {report['docs_per_second']} documentos/s, "
+                    f"{report['pages_per_second']} páginas/s (métricas en {metrics_path})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
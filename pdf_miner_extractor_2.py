@@ -3,12 +3,25 @@ import re
 import json
 import logging
 import argparse
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from io import StringIO
 from datetime import datetime
+from collections import Counter
 from tqdm import tqdm
 
+from ndjson_output import NDJSONWriter
+from models import Document, as_dict
+from text_cache import TextCache, make_article_ref
+from checkpoint import CheckpointStore
+from metrics import RunMetrics
+from profiling import DocumentProfiler, add_profile_arguments, profiler_from_args
+from pattern_pack import current_pack
+import regex_engine
+from spanish_numbers import AMOUNT_PATTERN, normalize_amount, number_to_words, words_to_number
+from keyword_automaton import SECTION_KEYWORDS, cleanup_patterns, document_prefilter
+from spanish_dates import annotate_deadlines
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,28 +48,98 @@ except ImportError:
 class BecasExtractor:
     """Extractor de información específica de resoluciones de becas del Ministerio de Educación."""
     
-    def __init__(self, input_dir: str, output_dir: str):
+    # Artículos que se extraen de cada convocatoria: (clave, número, título)
+    ARTICLES = [
+        ('article_3', 3, 'Enseñanzas comprendidas'),
+        ('article_4', 4, 'Clases y cuantías de las becas'),
+        ('article_11', 11, 'Cuantías de las becas'),
+        ('article_19', 19, 'Umbrales de renta'),
+        ('article_24', 24, 'Rendimiento académico'),
+        ('article_47', 47, 'Modelo de solicitud y documentación a presentar'),
+        ('article_48', 48, 'Lugar y plazo de presentación de solicitudes')
+    ]
+    
+    # Campos estructurados: (clave del resultado, método de extracción, artículo de origen)
+    FIELDS = [
+        ('eligible_studies', 'extract_eligible_studies', 'article_3'),
+        ('scholarship_types', 'extract_scholarship_types', 'article_4'),
+        ('scholarship_amounts', 'extract_scholarship_amounts', 'article_11'),
+        ('income_thresholds', 'extract_income_thresholds', 'article_19'),
+        ('academic_requirements', 'extract_academic_requirements', 'article_24'),
+        ('application_procedure', 'extract_application_procedure', 'article_47'),
+        ('application_deadlines', 'extract_application_deadlines', 'article_48')
+    ]
+    
+    def __init__(self, input_dir: str, output_dir: str, ndjson_path: Optional[str] = None,
+                 compact: bool = False, resume: bool = False, checkpoint_dir: Optional[str] = None,
+                 metrics: Optional[RunMetrics] = None, profiler: Optional[DocumentProfiler] = None):
         """
         Inicializa el extractor de becas.
         
         Args:
             input_dir: Directorio donde se encuentran los PDFs a procesar
             output_dir: Directorio donde se guardarán los archivos JSON generados
+            ndjson_path: Si se indica, cada resultado se escribe en este fichero NDJSON
+                en cuanto termina su documento, en lugar de acumularse en memoria
+            compact: Si es True, los artículos se guardan como referencias (clave, inicio, fin)
+                al texto del documento almacenado en <output_dir>/text_cache
+            resume: Si es True, los documentos completados en una ejecución anterior
+                (registrados en ``checkpoint_dir``) no se vuelven a extraer
+            checkpoint_dir: Directorio de los puntos de control (por defecto, con ``resume``,
+                <output_dir>/checkpoints). Sin ``resume`` ni ``checkpoint_dir`` no se
+                registra nada
+            metrics: Si se indica, se miden los tiempos de cada etapa de la extracción
+            profiler: Si se indica, el procesamiento de cada PDF se perfila por separado
         """
         self.input_dir = input_dir
         self.output_dir = output_dir
+        self.ndjson_path = ndjson_path
+        self.text_cache = TextCache(os.path.join(output_dir, 'text_cache')) if compact else None
+        self.checkpoint = (CheckpointStore(checkpoint_dir or os.path.join(output_dir, 'checkpoints'), resume=resume)
+                           if resume or checkpoint_dir else None)
+        self.metrics = metrics if metrics is not None else RunMetrics(enabled=False)
+        self.profiler = profiler if profiler is not None else DocumentProfiler(None, output_dir)
         self.results = []
         
+        # Contadores ligeros que se mantienen también en modo NDJSON
+        self.processed_count = 0
+        self.year_counts = Counter()
+        
         # Crear directorio de salida si no existe
         os.makedirs(output_dir, exist_ok=True)
     
     def process_files(self) -> List[Dict[str, Any]]:
-        """Procesa todos los archivos PDF en el directorio de entrada."""
+        """
+        Procesa todos los archivos PDF en el directorio de entrada.
+        
+        En modo NDJSON los resultados no se guardan en ``self.results``: se escriben
+        y se vuelcan a disco uno a uno, de modo que la memoria no crece con el corpus.
+        """
+        writer = NDJSONWriter(self.ndjson_path) if self.ndjson_path else None
+        
+        try:
+            for data in self.iter_processed_files():
+                self.processed_count += 1
+                self.year_counts[data.get('academic_year', {}).get('year', 'Desconocido')] += 1
+                
+                if writer:
+                    writer.write(data)
+                else:
+                    self.results.append(data)
+        finally:
+            if writer:
+                writer.close()
+                print(f"💾 Resultados NDJSON guardados en: {self.ndjson_path}")
+        
+        return self.results
+    
+    def iter_processed_files(self):
+        """Procesa los PDFs del directorio de entrada y devuelve cada resultado válido según termina."""
         pdf_files = [f for f in os.listdir(self.input_dir) if f.lower().endswith('.pdf')]
         
         if not pdf_files:
             print(f"⚠️ No se encontraron archivos PDF en {self.input_dir}")
-            return []
+            return
         
         print(f"📄 Se encontraron {len(pdf_files)} archivos PDF para procesar")
         
@@ -64,29 +147,60 @@ class BecasExtractor:
             print(f"\n[{i}/{len(pdf_files)}] Procesando: {pdf_file}")
             pdf_path = os.path.join(self.input_dir, pdf_file)
             
-            # Extraer texto del PDF
-            text = self.extract_text_from_pdf(pdf_path)
-            
-            if not text:
-                print(f"❌ No se pudo extraer texto de {pdf_file}. Saltando...")
+            # Documentos completados en una ejecución anterior
+            record = self.checkpoint.load(pdf_file, pdf_path) if self.checkpoint else None
+            if record is not None:
+                print(f"⏭️ Recuperado del punto de control: {pdf_file}")
+                if record['valid']:
+                    yield record['result']
                 continue
             
-            # Extraer datos del texto
-            data = self.extract_data(text, pdf_file)
-            
-            if not data['valid']:
-                print(f"❌ El archivo {pdf_file} no parece ser una convocatoria de becas válida. Saltando...")
-                continue
+            with self.profiler.profile(pdf_file):
+                data = self.process_pdf(pdf_file, pdf_path)
             
-            # Crear versión simplificada
+            # Entregar resultado
+            if data is not None:
+                yield data
+    
+    def process_pdf(self, pdf_file: str, pdf_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Extrae un PDF y guarda sus JSON completo y simplificado.
+        
+        Returns:
+            El resultado completo, o None si no se pudo extraer texto o el documento no es válido
+        """
+        self.metrics.start_document(pdf_file, pdf_path)
+        
+        # Extraer texto del PDF
+        text = self.extract_text_from_pdf(pdf_path)
+        
+        if not text:
+            print(f"❌ No se pudo extraer texto de {pdf_file}. Saltando...")
+            self.metrics.end_document(valid=False)
+            return None
+        
+        # Extraer datos del texto
+        data = self.extract_data(text, pdf_file)
+        
+        if not data['valid']:
+            print(f"❌ El archivo {pdf_file} no parece ser una convocatoria de becas válida. Saltando...")
+            if self.checkpoint:
+                self.checkpoint.mark_complete(pdf_file, pdf_path, data)
+            self.metrics.end_document(valid=False)
+            return None
+        
+        # Crear versión simplificada
+        with self.metrics.stage('simplification'):
             simplified_data = self.create_simplified_json(data)
-            
+        
+        with self.metrics.stage('serialization') as stage:
             # Guardar JSON completo
             json_filename = os.path.splitext(pdf_file)[0] + '.json'
             json_path = os.path.join(self.output_dir, json_filename)
             
             with open(json_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+                stage.bytes += f.tell()
                 print(f"💾 JSON completo guardado en: {json_path}")
             
             # Guardar JSON simplificado
@@ -95,12 +209,15 @@ class BecasExtractor:
             
             with open(simplified_json_path, 'w', encoding='utf-8') as f:
                 json.dump(simplified_data, f, ensure_ascii=False, indent=2)
+                stage.bytes += f.tell()
                 print(f"💾 JSON simplificado guardado en: {simplified_json_path}")
-            
-            # Añadir resultados
-            self.results.append(data)
         
-        return self.results
+        # El documento solo se da por completado cuando sus ficheros están escritos
+        if self.checkpoint:
+            self.checkpoint.mark_complete(pdf_file, pdf_path, data)
+        self.metrics.end_document(valid=True)
+        
+        return data
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extrae el texto completo de un archivo PDF."""
@@ -113,53 +230,57 @@ class BecasExtractor:
         try:
             output_string = StringIO()
             with open(pdf_path, 'rb') as in_file:
-                parser = PDFParser(in_file)
-                doc = PDFDocument(parser)
-                rsrcmgr = PDFResourceManager()
-                device = TextConverter(rsrcmgr, output_string, laparams=LAParams())
-                interpreter = PDFPageInterpreter(rsrcmgr, device)
-                
-                # Contador de páginas
-                total_pages = sum(1 for _ in PDFPage.create_pages(doc))
-                
-                # Reiniciar el archivo para volver a leerlo
-                in_file.seek(0)
-                parser = PDFParser(in_file)
-                doc = PDFDocument(parser)
+                with self.metrics.stage('open', bytes=os.path.getsize(pdf_path)):
+                    parser = PDFParser(in_file)
+                    doc = PDFDocument(parser)
+                    rsrcmgr = PDFResourceManager()
+                    device = TextConverter(rsrcmgr, output_string, laparams=LAParams())
+                    interpreter = PDFPageInterpreter(rsrcmgr, device)
+                    
+                    # Contador de páginas
+                    total_pages = sum(1 for _ in PDFPage.create_pages(doc))
+                    
+                    # Reiniciar el archivo para volver a leerlo
+                    in_file.seek(0)
+                    parser = PDFParser(in_file)
+                    doc = PDFDocument(parser)
                 
                 # Procesar páginas con barra de progreso
                 for i, page in enumerate(PDFPage.create_pages(doc)):
                     if i % 5 == 0:  # Actualizar cada 5 páginas para no sobrecargar la salida
                         print(f"      Página {i+1}/{total_pages}...", end='\r')
-                    interpreter.process_page(page)
+                    with self.metrics.stage('page_extraction', pages=1):
+                        interpreter.process_page(page)
                 
                 print(f"      ✅ {total_pages} páginas procesadas exitosamente     ")
             
             # Obtener texto completo extraído
             raw_text = output_string.getvalue()
             
-            # Filtrar líneas problemáticas
-            cleaned_lines = []
-            for line in raw_text.splitlines():
-                # Ignorar líneas con caracteres muy espaciados (patrón de letras individuales)
-                if re.match(r'(\s*[a-zA-Z]\s+){5,}', line):
-                    continue
+            with self.metrics.stage('cleaning', bytes=len(raw_text)):
+                # Filtrar líneas problemáticas: el autómata de palabras clave indica en una
+                # sola pasada qué líneas contienen algún literal de los filtros de CSV y firma
+                prefilter = document_prefilter()
+                cleanup = cleanup_patterns()
+                flagged_lines = prefilter.lines_matching(raw_text, cleanup)
+                cleaned_lines = []
+                for i, line in enumerate(raw_text.splitlines()):
+                    # Ignorar líneas con caracteres muy espaciados (patrón de letras individuales)
+                    if re.match(r'(\s*[a-zA-Z]\s+){5,}', line):
+                        continue
+                        
+                    # Ignorar líneas con códigos CSV y verificación
+                    if ((flagged_lines is None or i in flagged_lines) and
+                            any(pattern.search(line) for pattern in cleanup)):
+                        continue
                     
-                # Ignorar líneas con códigos CSV y verificación
-                if (re.search(r'CSV\s*:\s*GEN-[a-zA-Z0-9-]+', line) or 
-                    re.search(r'DIRECCIÓN DE VALIDACIÓN', line) or
-                    re.search(r'FIRMANTE\(\d+\)', line) or
-                    re.search(r'Código\s+seguro\s+de\s+Verificación', line) or
-                    re.search(r'consultaCSV', line)):
-                    continue
+                    cleaned_lines.append(line)
                 
-                cleaned_lines.append(line)
-            
-            # Unir las líneas limpias
-            cleaned_text = '\n'.join(cleaned_lines)
-            
-            # Eliminar líneas en blanco múltiples
-            cleaned_text = re.sub(r'\n\s*\n', '\n\n', cleaned_text)
+                # Unir las líneas limpias
+                cleaned_text = '\n'.join(cleaned_lines)
+                
+                # Eliminar líneas en blanco múltiples
+                cleaned_text = re.sub(r'\n\s*\n', '\n\n', cleaned_text)
             
             if cleaned_text:
                 print(f"      📊 Texto extraído y limpiado: {len(cleaned_text)} caracteres")
@@ -174,17 +295,9 @@ class BecasExtractor:
     
     def extract_academic_year(self, text: str) -> Dict[str, str]:
         """Extrae el año académico del texto."""
-        patterns = [
-            r'CURSO ACADÉMICO (\d{4}-\d{4})',
-            r'curso académico (\d{4}-\d{4})',
-            r'para el curso (\d{4}-\d{4})',
-            r'BECAS.*?(\d{4}-\d{4})',
-            r'BECAS.*?CURSO.*?(\d{4}-\d{4})',
-            r'curso.*?(\d{4}-\d{4})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        pack = current_pack()
+        for pattern in pack.get_list('academic_year') + pack.get_list('academic_year_fallback'):
+            match = pattern.search(text)
             if match:
                 return {
                     "year": match.group(1),
@@ -195,20 +308,35 @@ class BecasExtractor:
     
     def extract_article(self, text: str, article_number: int, article_title: str = "") -> str:
         """Extrae el contenido completo de un artículo específico."""
+        span = self.locate_article(text, article_number, article_title)
+        if span:
+            return text[span[0]:span[1]]
+        
+        return ""
+    
+    def locate_article(self, text: str, article_number: int, article_title: str = "") -> Optional[Tuple[int, int]]:
+        """Devuelve las posiciones (inicio, fin) de un artículo en el texto, sin espacios en los extremos."""
         # Primero intentamos con el título
+        match = None
+        pack = current_pack()
         if article_title:
-            pattern = rf'Artículo\s+{article_number}\s*\.\s*{article_title}.*?(?=Artículo\s+{article_number+1}\s*\.|\Z)'
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                return match.group(0).strip()
+            pattern = pack.template('article_with_title', number=article_number, title=article_title,
+                                    next=article_number + 1)
+            match = pattern.search(text)
         
         # Si no funciona, intentamos solo con el número
-        pattern = rf'Artículo\s+{article_number}\s*\..*?(?=Artículo\s+{article_number+1}\s*\.|\Z)'
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(0).strip()
-        
-        return ""
+        if not match:
+            pattern = pack.template('article_number_only', number=article_number, next=article_number + 1)
+            match = pattern.search(text)
+        
+        if not match:
+            return None
+        
+        # Equivalente a match.group(0).strip() pero conservando las posiciones
+        content = match.group(0)
+        start = match.start() + (len(content) - len(content.lstrip()))
+        end = match.end() - (len(content) - len(content.rstrip()))
+        return (start, end) if end > start else None
     
     def extract_eligible_studies(self, text: str) -> Dict[str, Any]:
         """
@@ -227,6 +355,7 @@ class BecasExtractor:
         
         # Determinar en qué sección estamos
         current_section = None
+        section_lines = document_prefilter().lines_with(text, SECTION_KEYWORDS, split='\n')
         
         for i, line in enumerate(lines):
             # Limpiar línea de espacios y caracteres raros
@@ -235,10 +364,10 @@ class BecasExtractor:
                 continue
             
             # Detectar secciones principales
-            if "1." in line and "postobligatorias" in line:
+            if "1." in line and i in section_lines["postobligatorias"]:
                 current_section = "non_university"
                 continue
-            elif "2." in line and "universitarias" in line:
+            elif "2." in line and i in section_lines["universitarias"]:
                 current_section = "university"
                 continue
             
@@ -279,10 +408,10 @@ class BecasExtractor:
             
             # Buscar secciones completas
             non_uni_pattern = r'1\.\s+Enseñanzas postobligatorias.*?(?=2\.|CAPÍTULO)'
-            non_uni_match = re.search(non_uni_pattern, cleaned_text, re.DOTALL)
+            non_uni_match = regex_engine.search(non_uni_pattern, cleaned_text, re.DOTALL)
             
             uni_pattern = r'2\.\s+Enseñanzas universitarias.*?(?=CAPÍTULO|$)'
-            uni_match = re.search(uni_pattern, cleaned_text, re.DOTALL)
+            uni_match = regex_engine.search(uni_pattern, cleaned_text, re.DOTALL)
             
             # Extraer estudios no universitarios
             if non_uni_match and len(result["non_university_studies"]) == 0:
@@ -291,7 +420,7 @@ class BecasExtractor:
                 
                 # Extraer cada tipo de estudio
                 item_pattern = r'([a-z]\))(.*?)(?=[a-z]\)|2\.|CAPÍTULO|$)'
-                items = re.findall(item_pattern, non_uni_text, re.DOTALL)
+                items = regex_engine.findall(item_pattern, non_uni_text, re.DOTALL)
                 
                 for identifier, description in items:
                     # Limpiar descripción
@@ -313,7 +442,7 @@ class BecasExtractor:
                 
                 # Extraer cada tipo de estudio
                 item_pattern = r'([a-z]\))(.*?)(?=[a-z]\)|CAPÍTULO|$)'
-                items = re.findall(item_pattern, uni_text, re.DOTALL)
+                items = regex_engine.findall(item_pattern, uni_text, re.DOTALL)
                 
                 for identifier, description in items:
                     # Limpiar descripción
@@ -394,12 +523,12 @@ class BecasExtractor:
         
         # Extraer cuantías fijas
         fixed_pattern = r'1\.\s+Cuantías fijas.*?(?=2\.|$)'
-        fixed_match = re.search(fixed_pattern, text, re.DOTALL)
+        fixed_match = regex_engine.search(fixed_pattern, text, re.DOTALL)
         
         if fixed_match:
             fixed_text = fixed_match.group(0)
             # Extraer cada tipo de cuantía fija
-            fixed_items = re.findall(r'([a-z]\))([^a-z\)]+)|([A-Za-z][^.\n]+)', fixed_text, re.DOTALL | re.IGNORECASE)
+            fixed_items = regex_engine.findall(r'([a-z]\))([^a-z\)]+)|([A-Za-z][^.\n]+)', fixed_text, re.DOTALL | re.IGNORECASE)
             
             for item in fixed_items:
                 if item[0]:  # Si hay un identificador de letra
@@ -416,7 +545,7 @@ class BecasExtractor:
         
         # Extraer cuantía variable
         variable_pattern = r'2\.\s+Cuantía variable.*?(?=$)'
-        variable_match = re.search(variable_pattern, text, re.DOTALL)
+        variable_match = regex_engine.search(variable_pattern, text, re.DOTALL)
         
         if variable_match:
             variable_text = variable_match.group(0)
@@ -435,7 +564,7 @@ class BecasExtractor:
         
         # Extraer componentes por letras (A, B, C...)
         components_pattern = r'([A-F]\))(.*?)(?=[A-F]\)|$)'
-        components = re.findall(components_pattern, text, re.DOTALL)
+        components = regex_engine.findall(components_pattern, text, re.DOTALL)
         
         for identifier, description in components:
             component = {
@@ -450,16 +579,16 @@ class BecasExtractor:
             
             elif "B)" in identifier:  # Cuantía fija ligada a la renta
                 component["type"] = "Cuantía fija ligada a la renta del solicitante"
-                amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+                amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
                 if amount_match:
-                    component["amount"] = amount_match.group(1).replace(',', '.')
+                    component["amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"{amount_match.group(1)} euros"
             
             elif "C)" in identifier:  # Cuantía fija ligada a la residencia
                 component["type"] = "Cuantía fija ligada a la residencia del solicitante durante el curso"
-                amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+                amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
                 if amount_match:
-                    component["amount"] = amount_match.group(1).replace(',', '.')
+                    component["amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"{amount_match.group(1)} euros"
             
             elif "D)" in identifier:  # Cuantía fija ligada a la excelencia
@@ -467,20 +596,20 @@ class BecasExtractor:
                 component["ranges"] = []
                 
                 # Extraer rangos de notas y cantidades
-                ranges = re.findall(r'Entre\s+(\d+[,.]\d+)\s+y\s+(\d+[,.]\d+).*?(\d+)\s+euros', description)
+                ranges = regex_engine.findall(r'Entre\s+(\d+[,.]\d+)\s+y\s+(\d+[,.]\d+).*?(\d+)\s+euros', description)
                 for min_score, max_score, amount in ranges:
                     component["ranges"].append({
-                        "min_score": min_score.replace(',', '.'),
-                        "max_score": max_score.replace(',', '.'),
+                        "min_score": normalize_amount(min_score),
+                        "max_score": normalize_amount(max_score),
                         "amount": amount,
                         "description": f"Entre {min_score} y {max_score} puntos: {amount} euros"
                     })
                 
                 # Extraer el rango más alto
-                highest_match = re.search(r'(\d+[,.]\d+).*?puntos\s+o\s+más.*?(\d+)\s+euros', description)
+                highest_match = regex_engine.search(r'(\d+[,.]\d+).*?puntos\s+o\s+más.*?(\d+)\s+euros', description)
                 if highest_match:
                     component["ranges"].append({
-                        "min_score": highest_match.group(1).replace(',', '.'),
+                        "min_score": normalize_amount(highest_match.group(1)),
                         "max_score": "10.00",
                         "amount": highest_match.group(2),
                         "description": f"{highest_match.group(1)} puntos o más: {highest_match.group(2)} euros"
@@ -488,13 +617,13 @@ class BecasExtractor:
             
             elif "E)" in identifier:  # Beca básica
                 component["type"] = "Beca básica"
-                amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+                amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
                 if amount_match:
-                    component["amount"] = amount_match.group(1).replace(',', '.')
+                    component["amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"{amount_match.group(1)} euros"
                 
                 # Extraer caso especial para Ciclos Formativos de Grado Básico
-                grado_basico_match = re.search(r'Ciclos Formativos de Grado Básico.*?(\d+)\s*euros', description)
+                grado_basico_match = regex_engine.search(r'Ciclos Formativos de Grado Básico.*?(\d+)\s*euros', description)
                 if grado_basico_match:
                     component["special_case"] = {
                         "case": "Ciclos Formativos de Grado Básico",
@@ -504,9 +633,9 @@ class BecasExtractor:
             
             elif "F)" in identifier:  # Cuantía variable
                 component["type"] = "Cuantía variable"
-                amount_match = re.search(r'mínimo.*?(\d+[,.]\d+)\s*euros', description, re.IGNORECASE)
+                amount_match = regex_engine.search(r'mínimo.*?' + AMOUNT_PATTERN + r'\s*euros', description, re.IGNORECASE)
                 if amount_match:
-                    component["minimum_amount"] = amount_match.group(1).replace(',', '.')
+                    component["minimum_amount"] = normalize_amount(amount_match.group(1))
                     component["amount_description"] = f"Mínimo de {amount_match.group(1)} euros"
             
             result["components"].append(component)
@@ -520,19 +649,20 @@ class BecasExtractor:
             "thresholds": []
         }
         
+        pack = current_pack()
+        
         # Verificar si el texto contiene el formato de tabla
-        table_format = re.search(r'nº\s+de\s+miembros.*?de\s+la\s+familia.*?Umbral', text, re.DOTALL | re.IGNORECASE)
+        table_format = pack.get('thresholds_table_marker').search(text)
         
         if table_format:
             # Procesar en formato de tabla
             # Buscar los umbrales en formato de números
-            umbral_numbers = re.findall(r'Umbral\s+(\d)\s+\(euros\)', text)
+            umbral_numbers = pack.get('thresholds_table_header').findall(text)
             umbral_numbers = [int(num) for num in umbral_numbers if num.isdigit()]
             
             # Buscar los valores por filas
             # Primero busquemos las filas con datos
-            rows_pattern = r'(\d+)(?:\s+|(?:\S+\s+){0,3})(\d+[\.,]\d+)\s+(\d+[\.,]\d+)\s+(\d+[\.,]\d+)'
-            rows = re.findall(rows_pattern, text)
+            rows = pack.get('thresholds_table_row').findall(text)
             
             # Procesar los datos por familias
             family_sizes = []
@@ -542,21 +672,20 @@ class BecasExtractor:
                     if family_size.isdigit() and int(family_size) <= 8:
                         family_sizes.append({
                             "size": family_size,
-                            "umbral1": row[1].replace('.', '').replace(',', '.'),
-                            "umbral2": row[2].replace('.', '').replace(',', '.'),
-                            "umbral3": row[3].replace('.', '').replace(',', '.')
+                            "umbral1": normalize_amount(row[1]),
+                            "umbral2": normalize_amount(row[2]),
+                            "umbral3": normalize_amount(row[3])
                         })
             
             # Buscar información adicional para cada umbral
             additional_info = []
-            addition_pattern = r'Cada\s+miembro\s+adicional.*?(\d+[\.,]\d+)'
-            additions = re.findall(addition_pattern, text)
+            additions = pack.get('thresholds_table_additional').findall(text)
             
             if len(additions) >= 3:
                 additional_info = [
-                    additions[0].replace('.', '').replace(',', '.'),
-                    additions[1].replace('.', '').replace(',', '.'),
-                    additions[2].replace('.', '').replace(',', '.')
+                    normalize_amount(additions[0]),
+                    normalize_amount(additions[1]),
+                    normalize_amount(additions[2])
                 ]
             
             # Crear los umbrales
@@ -589,8 +718,8 @@ class BecasExtractor:
             # Extraer cada umbral (1, 2, 3)
             for threshold_num in range(1, 4):
                 # Patrón mejorado para capturar mejor los umbrales
-                threshold_pattern = rf'{threshold_num}\.\s+Umbral\s+{threshold_num}:.*?(?={threshold_num+1}\.|A partir|$)'
-                threshold_match = re.search(threshold_pattern, text, re.DOTALL)
+                threshold_pattern = pack.template('thresholds_section', number=threshold_num, next=threshold_num + 1)
+                threshold_match = threshold_pattern.search(text)
                 
                 if threshold_match:
                     threshold_text = threshold_match.group(0)
@@ -601,14 +730,13 @@ class BecasExtractor:
                     
                     # Extraer información para cada tamaño de familia
                     # Patrón mejorado para capturar los importes
-                    family_pattern = r'(?:•\s*)?Familias\s+de\s+(\w+|un)\s+miembros?:[\s•]*(\d+[\.,]\d+)'
-                    family_matches = re.findall(family_pattern, threshold_text, re.IGNORECASE)
+                    family_matches = pack.get('thresholds_family').findall(threshold_text)
                     
                     for family_text, amount in family_matches:
                         # Convertir texto de número a dígito
                         family_size = self.text_to_number(family_text)
                         if family_size > 0:
-                            clean_amount = amount.replace('.', '').replace(',', '.')
+                            clean_amount = normalize_amount(amount)
                             threshold["family_sizes"].append({
                                 "size": str(family_size),
                                 "amount": clean_amount,
@@ -616,10 +744,9 @@ class BecasExtractor:
                             })
                     
                     # Extraer información adicional
-                    additional_pattern = r'A partir del octavo miembro.*?(\d+[\.,]\d+)'
-                    additional_match = re.search(additional_pattern, threshold_text)
+                    additional_match = pack.get('thresholds_additional').search(threshold_text)
                     if additional_match:
-                        amount = additional_match.group(1).replace('.', '').replace(',', '.')
+                        amount = normalize_amount(additional_match.group(1))
                         threshold["additional_info"] = {
                             "description": f"A partir del octavo miembro se añadirán {additional_match.group(1)} euros por cada nuevo miembro computable",
                             "amount_per_member": amount
@@ -631,9 +758,9 @@ class BecasExtractor:
         # Si no se encontró ningún umbral, probar un último método de extracción
         if not result["thresholds"]:
             # Buscar directamente patrones de familias con importes en todo el texto
-            umbral1_text = re.search(r'1\.\s*Umbral\s+1.*?(?=2\.\s*Umbral|$)', text, re.DOTALL)
-            umbral2_text = re.search(r'2\.\s*Umbral\s+2.*?(?=3\.\s*Umbral|$)', text, re.DOTALL)
-            umbral3_text = re.search(r'3\.\s*Umbral\s+3.*?(?=$)', text, re.DOTALL)
+            umbral1_text = regex_engine.search(r'1\.\s*Umbral\s+1.*?(?=2\.\s*Umbral|$)', text, re.DOTALL)
+            umbral2_text = regex_engine.search(r'2\.\s*Umbral\s+2.*?(?=3\.\s*Umbral|$)', text, re.DOTALL)
+            umbral3_text = regex_engine.search(r'3\.\s*Umbral\s+3.*?(?=$)', text, re.DOTALL)
             
             umbrales_texts = [
                 (1, umbral1_text.group(0) if umbral1_text else ""),
@@ -661,10 +788,10 @@ class BecasExtractor:
                     ]
                     
                     for size, pattern in family_patterns:
-                        amount_match = re.search(pattern, umbral_text, re.IGNORECASE)
+                        amount_match = regex_engine.search(pattern, umbral_text, re.IGNORECASE)
                         if amount_match:
                             amount = amount_match.group(1)
-                            clean_amount = amount.replace('.', '').replace(',', '.')
+                            clean_amount = normalize_amount(amount)
                             threshold["family_sizes"].append({
                                 "size": str(size),
                                 "amount": clean_amount,
@@ -672,9 +799,9 @@ class BecasExtractor:
                             })
                     
                     # Buscar miembro adicional
-                    additional_match = re.search(r'A partir del octavo miembro.*?(\d+[\.,]\d+)', umbral_text)
+                    additional_match = regex_engine.search(r'A partir del octavo miembro.*?(\d+[\.,]\d+)', umbral_text)
                     if additional_match:
-                        amount = additional_match.group(1).replace('.', '').replace(',', '.')
+                        amount = normalize_amount(additional_match.group(1))
                         threshold["additional_info"] = {
                             "description": f"A partir del octavo miembro se añadirán {additional_match.group(1)} euros por cada nuevo miembro computable",
                             "amount_per_member": amount
@@ -695,7 +822,7 @@ class BecasExtractor:
         # Buscar patrones de fecha
         # 1. Buscar primero plazos generales
         general_pattern = r'[Ee]l plazo.*?hasta.*?(\d{1,2}\s+de\s+[a-zé]+\s+de\s+\d{4})'
-        general_match = re.search(general_pattern, text, re.DOTALL)
+        general_match = regex_engine.search(general_pattern, text, re.DOTALL)
         
         if general_match:
             result["deadlines"].append({
@@ -707,7 +834,7 @@ class BecasExtractor:
         # 2. Buscar plazos específicos para tipos de estudiantes (formato A/B)
         # Patrón para estudiantes universitarios
         uni_pattern = r'A\).*?(\d{1,2}).*?de.*?([a-zé]+).*?de.*?(\d{4}).*?estudiantes universitarios'
-        uni_match = re.search(uni_pattern, text, re.DOTALL | re.IGNORECASE)
+        uni_match = regex_engine.search(uni_pattern, text, re.DOTALL | re.IGNORECASE)
         
         if uni_match:
             day = uni_match.group(1)
@@ -722,7 +849,7 @@ class BecasExtractor:
         
         # Patrón para estudiantes no universitarios
         non_uni_pattern = r'B\).*?(\d{1,2}).*?de.*?([a-zé]+).*?de.*?(\d{4}).*?estudiantes no universitarios'
-        non_uni_match = re.search(non_uni_pattern, text, re.DOTALL | re.IGNORECASE)
+        non_uni_match = regex_engine.search(non_uni_pattern, text, re.DOTALL | re.IGNORECASE)
         
         if non_uni_match:
             day = non_uni_match.group(1)
@@ -739,7 +866,7 @@ class BecasExtractor:
         if not result["deadlines"]:
             # Buscar una fecha para todos los estudiantes
             all_pattern = r'tanto.*?como.*?hasta\s+el\s+(\d{1,2})\s+de\s+([a-zé]+)\s+de\s+(\d{4})'
-            all_match = re.search(all_pattern, text, re.DOTALL | re.IGNORECASE)
+            all_match = regex_engine.search(all_pattern, text, re.DOTALL | re.IGNORECASE)
             
             if all_match:
                 day = all_match.group(1)
@@ -754,7 +881,7 @@ class BecasExtractor:
             else:
                 # Intentar cualquier mención de fecha como plazo
                 single_date_pattern = r'plazo.*?se extenderá.*?hasta.*?(\d{1,2}).*?de.*?([a-zé]+).*?de.*?(\d{4})'
-                single_match = re.search(single_date_pattern, text, re.DOTALL | re.IGNORECASE)
+                single_match = regex_engine.search(single_date_pattern, text, re.DOTALL | re.IGNORECASE)
                 
                 if single_match:
                     day = single_match.group(1)
@@ -777,7 +904,7 @@ class BecasExtractor:
             ]
             
             for pattern in date_patterns:
-                dates = re.findall(pattern, text)
+                dates = regex_engine.findall(pattern, text)
                 if dates:
                     for date_parts in dates:
                         if len(date_parts) == 3:  # Asegurarse de que tenemos día, mes y año
@@ -790,7 +917,7 @@ class BecasExtractor:
         
         # 5. Casos excepcionales (plazos posteriores)
         exceptional_pattern = r'después de.*?plazo.*?hasta el (\d{1,2}).*?de.*?(\w+).*?de.*?(\d{4}).*?en caso de (.*?)(?=\.|$)'
-        exceptional_match = re.search(exceptional_pattern, text, re.DOTALL | re.IGNORECASE)
+        exceptional_match = regex_engine.search(exceptional_pattern, text, re.DOTALL | re.IGNORECASE)
         
         if exceptional_match:
             day = exceptional_match.group(1)
@@ -804,42 +931,15 @@ class BecasExtractor:
                 "description": f"Excepcionalmente hasta el {day} de {month} de {year} en caso de {conditions}"
             }
         
-        return result
+        return annotate_deadlines(result, text)
     
     def text_to_number(self, text: str) -> int:
-        """Convierte un texto de número a un entero."""
-        text = text.lower().strip()
-        number_texts = {
-            "un": 1,
-            "uno": 1,
-            "dos": 2,
-            "tres": 3,
-            "cuatro": 4,
-            "cinco": 5,
-            "seis": 6,
-            "siete": 7,
-            "ocho": 8
-        }
-        
-        if text in number_texts:
-            return number_texts[text]
-        elif text.isdigit():
-            return int(text)
-        return 0
+        """Convierte un texto de número a un entero (0 si no es un número)."""
+        return words_to_number(text) or 0
     
     def number_to_text(self, number: int) -> str:
         """Convierte un número a texto."""
-        text_numbers = {
-            1: "un",
-            2: "dos",
-            3: "tres",
-            4: "cuatro",
-            5: "cinco",
-            6: "seis",
-            7: "siete",
-            8: "ocho"
-        }
-        return text_numbers.get(number, str(number))
+        return number_to_words(number)
     
     def extract_academic_requirements(self, text: str) -> Dict[str, Any]:
         """Extrae los requisitos académicos del Artículo 24."""
@@ -850,7 +950,7 @@ class BecasExtractor:
         
         # Extraer porcentajes por rama de conocimiento
         percentages_pattern = r'Rama o área de conocimiento.*?(?=\s*\d+\.\s+|$)'
-        percentages_match = re.search(percentages_pattern, text, re.DOTALL)
+        percentages_match = regex_engine.search(percentages_pattern, text, re.DOTALL)
         
         if percentages_match:
             percentages_text = percentages_match.group(0)
@@ -864,7 +964,7 @@ class BecasExtractor:
                 "Ingeniería o Arquitectura"
             ]
             
-            percentages = re.findall(r'(\d+)%', percentages_text)
+            percentages = regex_engine.findall(r'(\d+)%', percentages_text)
             
             if len(percentages) >= len(areas):
                 for i, area in enumerate(areas):
@@ -876,7 +976,7 @@ class BecasExtractor:
                     })
         
         # Extraer nota mínima para primer curso
-        nota_min_match = re.search(r'primer curso.*?(\d+[,.]\d+) puntos', text, re.IGNORECASE)
+        nota_min_match = regex_engine.search(r'primer curso.*?(\d+[,.]\d+) puntos', text, re.IGNORECASE)
         if nota_min_match:
             result["requirements"].append({
                 "type": "Nota mínima primer curso",
@@ -895,7 +995,7 @@ class BecasExtractor:
         
         # Buscar información sobre la solicitud electrónica
         electronic_pattern = r'La solicitud se deberá cumplimentar mediante.*?(?=\d+\.|Asimismo|$)'
-        electronic_match = re.search(electronic_pattern, text, re.DOTALL)
+        electronic_match = regex_engine.search(electronic_pattern, text, re.DOTALL)
         if electronic_match:
             result["steps"].append({
                 "step": "Cumplimentación del formulario",
@@ -904,7 +1004,7 @@ class BecasExtractor:
         
         # Buscar información sobre la firma
         signature_pattern = r'Una vez cumplimentada la solicitud.*?(?=\d+\.|Asimismo|$)'
-        signature_match = re.search(signature_pattern, text, re.DOTALL)
+        signature_match = regex_engine.search(signature_pattern, text, re.DOTALL)
         if signature_match:
             result["steps"].append({
                 "step": "Firma electrónica",
@@ -913,7 +1013,7 @@ class BecasExtractor:
         
         # Buscar información sobre la autorización
         auth_pattern = r'Asimismo, el solicitante.*?autorizarán.*?(?=\d+\.|En cualquier|$)'
-        auth_match = re.search(auth_pattern, text, re.DOTALL)
+        auth_match = regex_engine.search(auth_pattern, text, re.DOTALL)
         if auth_match:
             result["steps"].append({
                 "step": "Autorización de datos",
@@ -922,7 +1022,7 @@ class BecasExtractor:
         
         # Buscar información sobre documentación adicional
         docs_pattern = r'Los solicitantes que tengan derecho a.*?(?=\d+\.|El solicitante|$)'
-        docs_match = re.search(docs_pattern, text, re.DOTALL)
+        docs_match = regex_engine.search(docs_pattern, text, re.DOTALL)
         if docs_match:
             result["steps"].append({
                 "step": "Documentación específica",
@@ -934,30 +1034,16 @@ class BecasExtractor:
     def is_valid_scholarship_text(self, text: str) -> bool:
         """Verifica si el texto corresponde a una convocatoria de becas."""
         # Buscar presencia de artículos específicos
-        articles_patterns = [
-            r'Artículo\s+3\s*\.\s*Enseñanzas',
-            r'Artículo\s+4\s*\.\s*Clases',
-            r'Artículo\s+11\s*\.\s*Cuantías',
-            r'Artículo\s+19\s*\.\s*Umbrales',
-            r'Artículo\s+24\s*\.\s*Rendimiento',
-            r'Artículo\s+48\s*\.\s*Lugar'
-        ]
-        
-        pattern_names = [
-            "Artículo 3 (Enseñanzas comprendidas)",
-            "Artículo 4 (Clases y cuantías)",
-            "Artículo 11 (Cuantías de las becas)",
-            "Artículo 19 (Umbrales de renta)",
-            "Artículo 24 (Rendimiento académico)",
-            "Artículo 48 (Lugar y plazo de solicitudes)"
-        ]
+        pack = current_pack()
+        articles_patterns = pack.get_list('validation_articles')
+        pattern_names = pack.labels('validation_articles')
         
         print(f"   🔍 Verificando contenido del documento...")
         
         # Verificar cada patrón
         found_patterns = []
-        for i, pattern in enumerate(articles_patterns):
-            if re.search(pattern, text, re.IGNORECASE):
+        for i, match in enumerate(document_prefilter().search(text, articles_patterns)):
+            if match:
                 found_patterns.append(pattern_names[i])
         
         matches = len(found_patterns)
@@ -972,6 +1058,10 @@ class BecasExtractor:
             print(f"      Se necesitan al menos 2 artículos para considerarlo una convocatoria de becas")
             return False
     
+    def extract_document(self, text: str, filename: str) -> Document:
+        """Extrae los datos del texto y los devuelve como documento tipado."""
+        return Document.from_dict(self.extract_data(text, filename))
+    
     def extract_data(self, text: str, filename: str) -> Dict[str, Any]:
         """Extrae los datos específicos de los artículos mencionados."""
         result = {
@@ -981,35 +1071,46 @@ class BecasExtractor:
         }
         
         # Verificar si es un documento válido de convocatoria de becas
-        if not self.is_valid_scholarship_text(text):
+        with self.metrics.stage('validation', bytes=len(text)):
+            valid = self.is_valid_scholarship_text(text)
+        if not valid:
             return result
         
         # Extraer los diferentes componentes
         result['valid'] = True
-        result['academic_year'] = self.extract_academic_year(text)
+        with self.metrics.stage('extract_academic_year'):
+            result['academic_year'] = self.extract_academic_year(text)
         
         # Extraer artículos específicos
-        result['article_3'] = self.extract_article(text, 3, 'Enseñanzas comprendidas')
-        result['article_4'] = self.extract_article(text, 4, 'Clases y cuantías de las becas')
-        result['article_11'] = self.extract_article(text, 11, 'Cuantías de las becas')
-        result['article_19'] = self.extract_article(text, 19, 'Umbrales de renta')
-        result['article_24'] = self.extract_article(text, 24, 'Rendimiento académico')
-        result['article_47'] = self.extract_article(text, 47, 'Modelo de solicitud y documentación a presentar')
-        result['article_48'] = self.extract_article(text, 48, 'Lugar y plazo de presentación de solicitudes')
+        article_spans = {}
+        with self.metrics.stage('article_slicing', bytes=len(text)):
+            for key, number, title in self.ARTICLES:
+                span = self.locate_article(text, number, title)
+                article_spans[key] = span
+                result[key] = text[span[0]:span[1]] if span else ""
         
         # Extraer y estructurar información específica de cada artículo
-        result['eligible_studies'] = self.extract_eligible_studies(result['article_3'] if 'article_3' in result else "")
-        result['scholarship_types'] = self.extract_scholarship_types(result['article_4'] if 'article_4' in result else "")
-        result['scholarship_amounts'] = self.extract_scholarship_amounts(result['article_11'] if 'article_11' in result else "")
-        result['income_thresholds'] = self.extract_income_thresholds(result['article_19'] if 'article_19' in result else "")
-        result['academic_requirements'] = self.extract_academic_requirements(result['article_24'] if 'article_24' in result else "")
-        result['application_procedure'] = self.extract_application_procedure(result['article_47'] if 'article_47' in result else "")
-        result['application_deadlines'] = self.extract_application_deadlines(result['article_48'] if 'article_48' in result else "")
+        for key, method_name, article_key in self.FIELDS:
+            article_text = result.get(article_key, "")
+            with self.metrics.stage(method_name, bytes=len(article_text)):
+                result[key] = getattr(self, method_name)(article_text)
+        
+        # En modo compacto, sustituir el texto de cada artículo por su referencia en la caché
+        if self.text_cache is not None:
+            text_key = self.text_cache.put(text)
+            for key, span in article_spans.items():
+                result[key] = make_article_ref(text_key, span)
         
         return result
     
-    def create_simplified_json(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Crea una versión simplificada del JSON con solo la información más relevante."""
+    def create_simplified_json(self, data: Any) -> Dict[str, Any]:
+        """
+        Crea una versión simplificada del JSON con solo la información más relevante.
+        
+        Acepta tanto el diccionario de ``extract_data`` como un ``Document`` tipado
+        (por ejemplo, el resultado de ``pymupdf_extractor.analyze_pdf_document``).
+        """
+        data = as_dict(data, analyze=False)
         academic_year = data.get('academic_year', {}).get('year', '')
         
         simplified_data = {
@@ -1139,10 +1240,21 @@ class BecasExtractor:
         
         # Poblar datos del artículo 48
         for deadline in data.get('application_deadlines', {}).get('deadlines', []):
-            simplified_data["articulo_48"]["plazos"].append({
+            plazo = {
                 "tipo": deadline.get('type', ''),
                 "fecha_limite": deadline.get('deadline', '')
-            })
+            }
+            if 'deadline_iso' in deadline:
+                plazo["fecha_limite_iso"] = deadline['deadline_iso']
+            simplified_data["articulo_48"]["plazos"].append(plazo)
+        
+        # Plazo general de solicitud (inicio y fin)
+        window = data.get('application_deadlines', {}).get('application_window')
+        if window:
+            simplified_data["articulo_48"]["plazo_solicitud"] = {
+                "inicio": window.get('start', ''),
+                "fin": window.get('end', '')
+            }
         
         # Lugares de presentación
         if 'application_deadlines' in data:
@@ -1161,6 +1273,8 @@ class BecasExtractor:
                 "plazo": exceptional.get('deadline', ''),
                 "condiciones": exceptional.get('conditions', '')
             }
+            if 'deadline_iso' in exceptional:
+                simplified_data["articulo_48"]["casos_excepcionales"]["plazo_iso"] = exceptional['deadline_iso']
         
         return simplified_data
 
@@ -1170,6 +1284,18 @@ def main():
     parser = argparse.ArgumentParser(description='Extractor de información de becas del Ministerio de Educación')
     parser.add_argument('--input', '-i', required=True, help='Directorio donde se encuentran los PDFs a procesar')
     parser.add_argument('--output', '-o', required=True, help='Directorio donde se guardarán los archivos JSON generados')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Escribe además cada resultado en becas_datos.ndjson según termina, sin acumularlos en memoria')
+    parser.add_argument('--compact', action='store_true',
+                        help='Guarda los artículos como referencias al texto en <output>/text_cache en lugar de copiarlos')
+    parser.add_argument('--resume', action='store_true',
+                        help='Reanuda una ejecución interrumpida: no vuelve a extraer los documentos ya completados')
+    parser.add_argument('--checkpoint-dir', type=str, default=None,
+                        help='Registra cada documento completado en este directorio (con --resume, por defecto '
+                             '<output>/checkpoints)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Mide los tiempos de cada etapa y guarda el informe en becas_metricas.json')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     print("🔍 Iniciando el proceso de extracción de datos de las convocatorias de becas...")
@@ -1177,21 +1303,35 @@ def main():
     print(f"💾 Los archivos JSON se guardarán en: {args.output}")
     
     # Crear e iniciar el extractor
-    extractor = BecasExtractor(args.input, args.output)
-    results = extractor.process_files()
+    ndjson_path = os.path.join(args.output, 'becas_datos.ndjson') if args.ndjson else None
+    metrics = RunMetrics() if args.metrics else None
+    extractor = BecasExtractor(args.input, args.output, ndjson_path=ndjson_path, compact=args.compact,
+                               resume=args.resume, checkpoint_dir=args.checkpoint_dir, metrics=metrics,
+                               profiler=profiler_from_args(args, args.output))
+    extractor.process_files()
     
     # Mostrar resumen
     print(f"\n✅ ¡PROCESO COMPLETADO! ✅")
     print(f"📊 RESUMEN DE LA EXTRACCIÓN:")
-    print(f"   📑 PDFs procesados: {len(results)}")
-    print(f"   📋 Archivos JSON generados: {len(results) * 2}")  # Completo y simplificado
+    print(f"   📑 PDFs procesados: {extractor.processed_count}")
+    if args.resume:
+        print(f"   ⏭️ Recuperados de puntos de control: {extractor.checkpoint.restored}")
+    print(f"   📋 Archivos JSON generados: {extractor.processed_count * 2}")  # Completo y simplificado
     print(f"   📂 Resultados guardados en: {args.output}")
     
+    if extractor.profiler.saved:
+        print(f"   🔬 Perfiles guardados en {extractor.profiler.output_dir} ({len(extractor.profiler.saved)} documentos)")
+    
+    if metrics is not None:
+        metrics_path = os.path.join(args.output, 'becas_metricas.json')
+        report = metrics.save(metrics_path)
+        print(f"   ⏱️ {report['docs_per_second']} documentos/s, {report['pages_per_second']} páginas/s "
+              f"(métricas en {metrics_path})")
+    
     # Mostrar un resumen de los años académicos encontrados
-    academic_years = [r.get('academic_year', {}).get('year', 'Desconocido') for r in results]
     print(f"\n📚 CONVOCATORIAS PROCESADAS:")
-    for year in sorted(set(academic_years)):
-        count = academic_years.count(year)
+    for year in sorted(extractor.year_counts):
+        count = extractor.year_counts[year]
         print(f"   📆 Curso {year}: {count} archivo{'s' if count > 1 else ''}")
     
     print("\n💡 CONSEJO: Revisa los archivos generados para verificar la calidad de la extracción.")
@@ -10,6 +10,15 @@ import json
 import PyPDF2
 from datetime import datetime
 
+from models import Document
+from summary_renderer import iter_corpus_summary, write_summary
+from profiling import add_profile_arguments, profiler_from_args
+from pattern_pack import current_pack
+import regex_engine
+from spanish_numbers import AMOUNT_PATTERN, normalize_amount, words_to_number
+from keyword_automaton import document_prefilter
+from spanish_dates import annotate_deadlines
+
 def extract_text_from_pdf(pdf_path):
     """Extrae el texto de un archivo PDF usando PyPDF2."""
     try:
@@ -26,29 +35,16 @@ def extract_text_from_pdf(pdf_path):
 def is_valid_scholarship_pdf(text):
     """Verifica si el PDF es una convocatoria de becas válida con la estructura esperada."""
     # Comprobar patrones clave que debe tener una convocatoria de becas
-    key_patterns = [
-        r'RESOLUCI[ÓO]N.*BECAS',
-        r'Artículo.*?Enseñanzas comprendidas',
-        r'Artículo.*?Cuantías de las becas',
-        r'Artículo.*?Umbrales de renta'
-    ]
+    key_patterns = current_pack().get_list('validation_key_patterns')
     
     # Verificar si al menos 2 de los patrones clave se encuentran
-    matches = sum(1 for pattern in key_patterns if re.search(pattern, text, re.IGNORECASE | re.DOTALL))
+    matches = sum(1 for match in document_prefilter().search(text, key_patterns) if match)
     return matches >= 2
 
 def extract_academic_year(text):
     """Extrae el año académico del texto."""
-    patterns = [
-        r'CURSO ACADÉMICO (\d{4}-\d{4})',
-        r'curso académico (\d{4}-\d{4})',
-        r'para el curso (\d{4}-\d{4})',
-        r'BECAS.*?(\d{4}-\d{4})',
-        r'BECAS.*?CURSO.*?(\d{4}-\d{4})'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in current_pack().get_list('academic_year'):
+        match = pattern.search(text)
         if match:
             return {
                 "year": match.group(1),
@@ -73,7 +69,7 @@ def extract_eligible_studies(text):
     
     studies_section = ""
     for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        match = regex_engine.search(pattern, text, re.DOTALL | re.IGNORECASE)
         if match:
             studies_section = match.group(0)
             break
@@ -86,13 +82,13 @@ def extract_eligible_studies(text):
         ]
         
         for pattern in non_uni_patterns:
-            non_uni_match = re.search(pattern, studies_section, re.DOTALL)
+            non_uni_match = regex_engine.search(pattern, studies_section, re.DOTALL)
             if non_uni_match:
                 non_uni_text = non_uni_match.group(0)
                 result["non_university_section"] = "Enseñanzas postobligatorias y superiores no universitarias del sistema educativo español"
                 
                 # Extraer cada tipo de estudio
-                study_items = re.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', non_uni_text, re.DOTALL)
+                study_items = regex_engine.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', non_uni_text, re.DOTALL)
                 if study_items:
                     for identifier, description in study_items:
                         result["non_university_studies"].append({
@@ -117,13 +113,13 @@ def extract_eligible_studies(text):
         ]
         
         for pattern in uni_patterns:
-            uni_match = re.search(pattern, studies_section, re.DOTALL)
+            uni_match = regex_engine.search(pattern, studies_section, re.DOTALL)
             if uni_match:
                 uni_text = uni_match.group(0)
                 result["university_section"] = "Enseñanzas universitarias del sistema universitario español"
                 
                 # Extraer cada tipo de estudio
-                study_items = re.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', uni_text, re.DOTALL)
+                study_items = regex_engine.findall(r'([a-z]\))([^a-z\)]+)(?=[a-z]\)|$)', uni_text, re.DOTALL)
                 if study_items:
                     for identifier, description in study_items:
                         result["university_studies"].append({
@@ -154,7 +150,7 @@ def extract_scholarship_amounts(text):
     
     amounts_section = ""
     for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        match = regex_engine.search(pattern, text, re.DOTALL | re.IGNORECASE)
         if match:
             amounts_section = match.group(0)
             break
@@ -168,24 +164,24 @@ def extract_scholarship_amounts(text):
         return result
         
     # Extraer la introducción
-    intro_match = re.search(r'Las cuantías.*?serán las siguientes:', amounts_section, re.DOTALL)
+    intro_match = regex_engine.search(r'Las cuantías.*?serán las siguientes:', amounts_section, re.DOTALL)
     if intro_match:
         result["introduction"] = intro_match.group(0).strip()
     
     # Intentar diferentes patrones para extraer componentes
     # 1. Patrón por letras mayúsculas (A, B, C...)
     components_pattern = r'([A-F]\))([^A-F\)]+)(?=[A-F]\)|$)'
-    components = re.findall(components_pattern, amounts_section, re.DOTALL)
+    components = regex_engine.findall(components_pattern, amounts_section, re.DOTALL)
     
     # 2. Si no encuentra con el patrón anterior, intentar otro basado en guiones o puntos
     if not components:
         components_pattern = r'[-•]\s*([^-•\n]+?):([^-•]+)(?=[-•]|$)'
-        components_raw = re.findall(components_pattern, amounts_section, re.DOTALL)
+        components_raw = regex_engine.findall(components_pattern, amounts_section, re.DOTALL)
         components = [(f"{i+1})", desc + ":" + val) for i, (desc, val) in enumerate(components_raw)]
     
     # 3. Si aún no hay componentes, buscar por líneas que contengan "euros"
     if not components:
-        euro_lines = re.findall(r'([^\n]+?\d+[,.]\d+\s*euros[^\n]*)', amounts_section)
+        euro_lines = regex_engine.findall(r'([^\n]+?\d+[,.]\d+\s*euros[^\n]*)', amounts_section)
         components = [(f"{i+1})", line) for i, line in enumerate(euro_lines)]
     
     for identifier, description in components:
@@ -201,66 +197,66 @@ def extract_scholarship_amounts(text):
             component["amount_description"] = "Cobertura del precio público oficial de los servicios académicos universitarios"
         elif "renta" in description.lower():
             component["type"] = "Cuantía fija ligada a la renta"
-            amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+            amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
             if amount_match:
-                component["amount"] = amount_match.group(1).replace(',', '.')
+                component["amount"] = normalize_amount(amount_match.group(1))
                 component["amount_description"] = f"{amount_match.group(1)} euros"
         elif "residencia" in description.lower():
             component["type"] = "Cuantía fija ligada a la residencia"
-            amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+            amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
             if amount_match:
-                component["amount"] = amount_match.group(1).replace(',', '.')
+                component["amount"] = normalize_amount(amount_match.group(1))
                 component["amount_description"] = f"{amount_match.group(1)} euros"
         elif "excelencia" in description.lower():
             component["type"] = "Cuantía fija ligada a la excelencia académica"
             component["ranges"] = []
             
             # Buscar rangos basados en patrones de puntos
-            excellence_ranges = re.findall(r'([Ee]ntre|[Dd]e)\s+(\d+[,.]\d+)\s+y\s+(\d+[,.]\d+).*?(\d+)\s+euros', description)
+            excellence_ranges = regex_engine.findall(r'([Ee]ntre|[Dd]e)\s+(\d+[,.]\d+)\s+y\s+(\d+[,.]\d+).*?(\d+)\s+euros', description)
             for _, min_score, max_score, amount in excellence_ranges:
                 component["ranges"].append({
-                    "min_score": min_score.replace(',', '.'),
-                    "max_score": max_score.replace(',', '.'),
+                    "min_score": normalize_amount(min_score),
+                    "max_score": normalize_amount(max_score),
                     "amount": amount,
                     "description": f"Nota media entre {min_score} y {max_score} puntos: {amount} euros"
                 })
             
             # Buscar el rango más alto
-            highest_match = re.search(r'(\d+[,.]\d+).*?puntos? o más.*?(\d+)\s+euros', description)
+            highest_match = regex_engine.search(r'(\d+[,.]\d+).*?puntos? o más.*?(\d+)\s+euros', description)
             if highest_match:
                 component["ranges"].append({
-                    "min_score": highest_match.group(1).replace(',', '.'),
+                    "min_score": normalize_amount(highest_match.group(1)),
                     "max_score": "10.00",
                     "amount": highest_match.group(2),
                     "description": f"Nota media de {highest_match.group(1)} puntos o más: {highest_match.group(2)} euros"
                 })
         elif "básica" in description.lower():
             component["type"] = "Beca básica"
-            amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+            amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
             if amount_match:
-                component["amount"] = amount_match.group(1).replace(',', '.')
+                component["amount"] = normalize_amount(amount_match.group(1))
                 component["amount_description"] = f"{amount_match.group(1)} euros"
             
             # Buscar casos especiales como Grado Básico
-            basic_grade_match = re.search(r'[Gg]rado [Bb]ásico.*?(\d+[,.]\d+) euros', description)
+            basic_grade_match = regex_engine.search(r'[Gg]rado [Bb]ásico.*?(\d+[,.]\d+) euros', description)
             if basic_grade_match:
                 component["special_case"] = {
                     "case": "Ciclos Formativos de Grado Básico",
-                    "amount": basic_grade_match.group(1).replace(',', '.'),
+                    "amount": normalize_amount(basic_grade_match.group(1)),
                     "description": f"Para Ciclos Formativos de Grado Básico: {basic_grade_match.group(1)} euros"
                 }
         elif "variable" in description.lower():
             component["type"] = "Cuantía variable"
-            min_match = re.search(r'[Mm]ínimo.*?(\d+[,.]\d+)\s*euros', description)
+            min_match = regex_engine.search(r'[Mm]ínimo.*?' + AMOUNT_PATTERN + r'\s*euros', description)
             if min_match:
-                component["minimum_amount"] = min_match.group(1).replace(',', '.')
+                component["minimum_amount"] = normalize_amount(min_match.group(1))
                 component["amount_description"] = f"Mínimo de {min_match.group(1)} euros"
         else:
             # Para componentes no identificados específicamente
             component["type"] = "Otro componente"
-            amount_match = re.search(r'(\d+[,.]\d+)\s*euros', description)
+            amount_match = regex_engine.search(AMOUNT_PATTERN + r'\s*euros', description)
             if amount_match:
-                component["amount"] = amount_match.group(1).replace(',', '.')
+                component["amount"] = normalize_amount(amount_match.group(1))
                 component["amount_description"] = f"{amount_match.group(1)} euros"
         
         result["components"].append(component)
@@ -277,7 +273,7 @@ def extract_income_thresholds(text):
     
     thresholds_section = ""
     for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        match = regex_engine.search(pattern, text, re.DOTALL | re.IGNORECASE)
         if match:
             thresholds_section = match.group(0)
             break
@@ -291,7 +287,7 @@ def extract_income_thresholds(text):
         return result
     
     # Extraer la introducción
-    intro_match = re.search(r'Los umbrales de renta familiar aplicables.*?a continuación:', thresholds_section, re.DOTALL)
+    intro_match = regex_engine.search(r'Los umbrales de renta familiar aplicables.*?a continuación:', thresholds_section, re.DOTALL)
     if intro_match:
         result["introduction"] = intro_match.group(0).strip()
     
@@ -304,7 +300,7 @@ def extract_income_thresholds(text):
         
         threshold_text = ""
         for pattern in threshold_patterns:
-            threshold_match = re.search(pattern, thresholds_section, re.DOTALL)
+            threshold_match = regex_engine.search(pattern, thresholds_section, re.DOTALL)
             if threshold_match:
                 threshold_text = threshold_match.group(1)
                 break
@@ -323,13 +319,13 @@ def extract_income_thresholds(text):
             
             family_sizes_found = False
             for pattern in family_patterns:
-                family_matches = re.findall(pattern, threshold_text)
+                family_matches = regex_engine.findall(pattern, threshold_text)
                 if family_matches:
                     for size_text, amount in family_matches:
                         size = convert_text_number(size_text)
                         threshold["family_sizes"].append({
                             "size": size,
-                            "amount": amount.replace(',', '.'),
+                            "amount": normalize_amount(amount),
                             "description": f"Familias de {size} miembros: {amount} euros"
                         })
                     family_sizes_found = True
@@ -338,12 +334,12 @@ def extract_income_thresholds(text):
             # Si no encuentra con los patrones anteriores, buscar líneas con números
             if not family_sizes_found:
                 for line in threshold_text.split('\n'):
-                    amount_match = re.search(r'(\d+)\s*miembros?:?\s+(\d+[.,]\d+)', line)
+                    amount_match = regex_engine.search(r'(\d+)\s*miembros?:?\s+(\d+[.,]\d+)', line)
                     if amount_match:
                         size, amount = amount_match.groups()
                         threshold["family_sizes"].append({
                             "size": size,
-                            "amount": amount.replace(',', '.'),
+                            "amount": normalize_amount(amount),
                             "description": f"Familias de {size} miembros: {amount} euros"
                         })
             
@@ -354,11 +350,11 @@ def extract_income_thresholds(text):
             ]
             
             for pattern in additional_patterns:
-                additional_match = re.search(pattern, threshold_text)
+                additional_match = regex_engine.search(pattern, threshold_text)
                 if additional_match:
                     threshold["additional_info"] = {
                         "description": f"A partir del octavo miembro se añadirán {additional_match.group(1)} euros por cada nuevo miembro computable",
-                        "amount_per_member": additional_match.group(1).replace(',', '.')
+                        "amount_per_member": normalize_amount(additional_match.group(1))
                     }
                     break
             
@@ -368,21 +364,9 @@ def extract_income_thresholds(text):
     return result
 
 def convert_text_number(text):
-    """Convierte texto de número a dígitos."""
-    text_to_num = {
-        "un": "1", "uno": "1",
-        "dos": "2",
-        "tres": "3",
-        "cuatro": "4",
-        "cinco": "5",
-        "seis": "6",
-        "siete": "7",
-        "ocho": "8"
-    }
-    # Si ya es un dígito, devolverlo tal cual
-    if text.isdigit():
-        return text
-    return text_to_num.get(text.lower(), text)
+    """Convierte texto de número a dígitos (devuelve el texto si no es un número)."""
+    number = words_to_number(text)
+    return text if number is None else str(number)
 
 def extract_application_deadlines(text):
     """Extrae los plazos de solicitud con descripciones completas."""
@@ -394,7 +378,7 @@ def extract_application_deadlines(text):
     
     deadlines_section = ""
     for pattern in patterns:
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        match = regex_engine.search(pattern, text, re.DOTALL | re.IGNORECASE)
         if match:
             deadlines_section = match.group(0)
             break
@@ -416,7 +400,7 @@ def extract_application_deadlines(text):
     ]
     
     for pattern in intro_patterns:
-        intro_match = re.search(pattern, deadlines_section, re.DOTALL)
+        intro_match = regex_engine.search(pattern, deadlines_section, re.DOTALL)
         if intro_match:
             result["introduction"] = intro_match.group(0).strip()
             break
@@ -430,10 +414,10 @@ def extract_application_deadlines(text):
     ]
     
     for pattern in uni_patterns:
-        uni_match = re.search(pattern, deadlines_section, re.DOTALL)
+        uni_match = regex_engine.search(pattern, deadlines_section, re.DOTALL)
         if uni_match:
             uni_text = uni_match.group(1).strip() if len(uni_match.groups()) > 0 else uni_match.group(0)
-            deadline_match = re.search(r'(\d{1,2}.*?\d{4})', uni_text)
+            deadline_match = regex_engine.search(r'(\d{1,2}.*?\d{4})', uni_text)
             if deadline_match:
                 uni_deadline = deadline_match.group(1).strip()
                 result["deadlines"].append({
@@ -452,10 +436,10 @@ def extract_application_deadlines(text):
     ]
     
     for pattern in non_uni_patterns:
-        non_uni_match = re.search(pattern, deadlines_section, re.DOTALL)
+        non_uni_match = regex_engine.search(pattern, deadlines_section, re.DOTALL)
         if non_uni_match:
             non_uni_text = non_uni_match.group(1).strip() if len(non_uni_match.groups()) > 0 else non_uni_match.group(0)
-            deadline_match = re.search(r'(\d{1,2}.*?\d{4})', non_uni_text)
+            deadline_match = regex_engine.search(r'(\d{1,2}.*?\d{4})', non_uni_text)
             if deadline_match:
                 non_uni_deadline = deadline_match.group(1).strip()
                 result["deadlines"].append({
@@ -472,7 +456,7 @@ def extract_application_deadlines(text):
     ]
     
     for pattern in exceptional_patterns:
-        exceptional_match = re.search(pattern, deadlines_section, re.DOTALL)
+        exceptional_match = regex_engine.search(pattern, deadlines_section, re.DOTALL)
         if exceptional_match:
             result["exceptional_cases"] = {
                 "deadline": exceptional_match.group(1).strip(),
@@ -481,7 +465,7 @@ def extract_application_deadlines(text):
             }
             break
     
-    return result
+    return annotate_deadlines(result, deadlines_section)
 
 def extract_academic_requirements(text):
     """Extrae los requisitos académicos con descripciones completas."""
@@ -493,7 +477,7 @@ def extract_academic_requirements(text):
     
     req_section = ""
     for pattern in req_section_patterns:
-        section_match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        section_match = regex_engine.search(pattern, text, re.DOTALL | re.IGNORECASE)
         if section_match:
             req_section = section_match.group(0)
             break
@@ -515,11 +499,11 @@ def extract_academic_requirements(text):
     ]
     
     for pattern in first_year_patterns:
-        first_year_match = re.search(pattern, req_section, re.DOTALL)
+        first_year_match = regex_engine.search(pattern, req_section, re.DOTALL)
         if first_year_match:
             result["requirements"].append({
                 "type": "Primer curso de estudios de grado",
-                "grade": first_year_match.group(1).replace(',', '.'),
+                "grade": normalize_amount(first_year_match.group(1)),
                 "description": f"Para estudiantes de primer curso de grado: nota mínima de {first_year_match.group(1)} puntos"
             })
             break
@@ -531,12 +515,12 @@ def extract_academic_requirements(text):
     ]
     
     for pattern in continuing_patterns:
-        continuing_match = re.search(pattern, req_section, re.DOTALL)
+        continuing_match = regex_engine.search(pattern, req_section, re.DOTALL)
         if continuing_match:
             area_text = continuing_match.group(0)
             
             # Extraer las áreas y sus porcentajes
-            areas = re.findall(r'([A-Za-záéíóúñÁÉÍÓÚÑ\s\/]+)\s+(\d+)%', area_text)
+            areas = regex_engine.findall(r'([A-Za-záéíóúñÁÉÍÓÚÑ\s\/]+)\s+(\d+)%', area_text)
             
             for area, percentage in areas:
                 result["requirements"].append({
@@ -557,11 +541,11 @@ def extract_academic_requirements(text):
     ]
     
     for pattern in master_patterns:
-        master_match = re.search(pattern, req_section)
+        master_match = regex_engine.search(pattern, req_section)
         if master_match:
             result["requirements"].append({
                 "type": "Estudios de máster",
-                "grade": master_match.group(1).replace(',', '.'),
+                "grade": normalize_amount(master_match.group(1)),
                 "description": f"Para estudios de máster: nota media mínima de {master_match.group(1)} puntos"
             })
             break
@@ -573,11 +557,11 @@ def extract_academic_requirements(text):
     ]
     
     for pattern in ciclos_patterns:
-        ciclos_match = re.search(pattern, req_section)
+        ciclos_match = regex_engine.search(pattern, req_section)
         if ciclos_match:
             result["requirements"].append({
                 "type": "Ciclos formativos",
-                "grade": ciclos_match.group(1).replace(',', '.'),
+                "grade": normalize_amount(ciclos_match.group(1)),
                 "description": f"Para ciclos formativos: nota mínima de {ciclos_match.group(1)} puntos"
             })
             break
@@ -595,6 +579,10 @@ def analyze_pdf(pdf_path):
         f.write(text)
     print(f"Texto extraído guardado en: {debug_path}")
     
+    return analyze_text(text, pdf_path)
+
+def analyze_text(text, pdf_path):
+    """Extrae toda la información relevante sobre becas del texto ya extraído de un PDF."""
     # Verificar si el PDF tiene la estructura esperada
     if not is_valid_scholarship_pdf(text):
         print(f"Advertencia: {pdf_path} no parece ser una convocatoria de becas válida")
@@ -633,14 +621,26 @@ def analyze_pdf(pdf_path):
     
     return result
 
-def process_pdf_corpus(pdf_dir):
-    """Procesa todos los PDFs en un directorio y extrae información sobre becas."""
+def analyze_pdf_document(pdf_path):
+    """Analiza un PDF y devuelve el resultado como documento tipado (``models.Document``)."""
+    return Document.from_dict(analyze_pdf(pdf_path))
+
+def process_pdf_corpus(pdf_dir, profiler=None):
+    """
+    Procesa todos los PDFs en un directorio y extrae información sobre becas.
+    
+    Si se indica ``profiler``, el análisis de cada PDF se perfila por separado.
+    """
     results = []
     
     for filename in os.listdir(pdf_dir):
         if filename.endswith('.pdf'):
             pdf_path = os.path.join(pdf_dir, filename)
-            result = analyze_pdf(pdf_path)
+            if profiler is not None:
+                with profiler.profile(filename):
+                    result = analyze_pdf(pdf_path)
+            else:
+                result = analyze_pdf(pdf_path)
             results.append(result)
     
     return results
@@ -652,197 +652,8 @@ def save_to_json(data, output_path):
     print(f"Datos guardados en {output_path}")
 
 def generate_summary(data):
-    """Genera un resumen a partir de los datos extraídos."""
-    # Filtrar documentos no válidos
-    valid_data = [item for item in data if item.get('valid', False)]
-    
-    if not valid_data:
-        return "# Resumen de Becas Educativas\n\nNo se encontraron documentos válidos para analizar."
-    
-    # Ordenar por año académico
-    sorted_data = sorted(valid_data, key=lambda x: x.get('academic_year', {}).get('year', ''))
-    
-    # Obtener el documento más reciente para el resumen principal
-    latest_data = sorted_data[-1]
-    
-    summary = "# Resumen de Becas Educativas del Ministerio de Educación y Formación Profesional\n\n"
-    
-    # Sección de información general
-    academic_year = latest_data.get('academic_year', {})
-    if academic_year:
-        summary += f"## Información General\n\n"
-        summary += f"{academic_year.get('description', '')}\n\n"
-    
-    # Sección de estudios elegibles
-    eligible_studies = latest_data.get('eligible_studies', {})
-    if eligible_studies:
-        summary += f"## Estudios Elegibles\n\n"
-        summary += f"{eligible_studies.get('description', '')}\n\n"
-        
-        # Estudios no universitarios
-        if 'non_university_studies' in eligible_studies and eligible_studies['non_university_studies']:
-            summary += "### Estudios No Universitarios\n\n"
-            if 'non_university_section' in eligible_studies:
-                summary += f"{eligible_studies['non_university_section']}\n\n"
-            
-            for study in eligible_studies['non_university_studies']:
-                summary += f"- {study.get('description', '')}\n"
-            summary += "\n"
-        
-        # Estudios universitarios
-        if 'university_studies' in eligible_studies and eligible_studies['university_studies']:
-            summary += "### Estudios Universitarios\n\n"
-            if 'university_section' in eligible_studies:
-                summary += f"{eligible_studies['university_section']}\n\n"
-            
-            for study in eligible_studies['university_studies']:
-                summary += f"- {study.get('description', '')}\n"
-            summary += "\n"
-    
-    # Sección de cuantías de las becas
-    scholarship_amounts = latest_data.get('scholarship_amounts', {})
-    if scholarship_amounts:
-        summary += f"## Cuantías de las Becas\n\n"
-        summary += f"{scholarship_amounts.get('description', '')}\n\n"
-        
-        if 'introduction' in scholarship_amounts:
-            summary += f"{scholarship_amounts['introduction']}\n\n"
-        
-        for component in scholarship_amounts.get('components', []):
-            component_type = component.get('type', '')
-            summary += f"### {component_type}\n\n"
-            
-            if 'amount_description' in component:
-                summary += f"{component['amount_description']}\n\n"
-            
-            # Para componentes con rangos (como la excelencia académica)
-            if 'ranges' in component:
-                for range_info in component['ranges']:
-                    summary += f"- {range_info.get('description', '')}\n"
-                summary += "\n"
-            
-            # Para casos especiales (como la beca básica para grado básico)
-            if 'special_case' in component:
-                summary += f"**Caso especial**: {component['special_case'].get('description', '')}\n\n"
-            
-            # Para componentes con fórmulas (como la cuantía variable)
-            if 'formula_description' in component:
-                summary += f"**Nota**: {component['formula_description']}\n\n"
-    
-    # Sección de umbrales de renta
-    income_thresholds = latest_data.get('income_thresholds', {})
-    if income_thresholds:
-        summary += f"## Umbrales de Renta Familiar\n\n"
-        summary += f"{income_thresholds.get('description', '')}\n\n"
-        
-        if 'introduction' in income_thresholds:
-            summary += f"{income_thresholds['introduction']}\n\n"
-        
-        for threshold in income_thresholds.get('thresholds', []):
-            summary += f"### Umbral {threshold.get('number', '')}\n\n"
-            
-            for family_size in threshold.get('family_sizes', []):
-                summary += f"- {family_size.get('description', '')}\n"
-            
-            if 'additional_info' in threshold:
-                summary += f"\n*{threshold['additional_info'].get('description', '')}*\n"
-            
-            summary += "\n"
-    
-    # Sección de plazos de solicitud
-    application_deadlines = latest_data.get('application_deadlines', {})
-    if application_deadlines:
-        summary += f"## Plazos de Solicitud\n\n"
-        summary += f"{application_deadlines.get('description', '')}\n\n"
-        
-        if 'introduction' in application_deadlines:
-            summary += f"{application_deadlines['introduction']}\n\n"
-        
-        for deadline in application_deadlines.get('deadlines', []):
-            summary += f"- **{deadline.get('type', '')}**: {deadline.get('description', '')}\n"
-        
-        if 'exceptional_cases' in application_deadlines:
-            summary += f"\n**Casos excepcionales**: {application_deadlines['exceptional_cases'].get('description', '')}\n"
-        
-        summary += "\n"
-    
-    # Sección de requisitos académicos
-    academic_requirements = latest_data.get('academic_requirements', {})
-    if academic_requirements:
-        summary += f"## Requisitos Académicos\n\n"
-        summary += f"{academic_requirements.get('description', '')}\n\n"
-        
-        # Agrupar requisitos por tipo
-        requirements_by_type = {}
-        for req in academic_requirements.get('requirements', []):
-            req_type = req.get('type', 'Otros')
-            if req_type not in requirements_by_type:
-                requirements_by_type[req_type] = []
-            requirements_by_type[req_type].append(req)
-        
-        # Mostrar requisitos agrupados
-        for req_type, reqs in requirements_by_type.items():
-            summary += f"### {req_type}\n\n"
-            for req in reqs:
-                summary += f"- {req.get('description', '')}\n"
-            summary += "\n"
-    
-    # Comparación entre años (si hay más de un año)
-    if len(sorted_data) > 1:
-        summary += "## Evolución de las Becas\n\n"
-        summary += "Comparación de las cuantías y requisitos a lo largo de los diferentes cursos académicos:\n\n"
-        
-        # Comparar cuantías de beca básica
-        basic_grants = []
-        for item in sorted_data:
-            year = item.get('academic_year', {}).get('year', 'N/A')
-            for component in item.get('scholarship_amounts', {}).get('components', []):
-                if component.get('type', '') == 'Beca básica' and 'amount' in component:
-                    basic_grants.append((year, component['amount']))
-        
-        if len(basic_grants) > 1:
-            summary += "### Evolución de la Beca Básica\n\n"
-            for year, amount in basic_grants:
-                summary += f"- **{year}**: {amount} euros\n"
-            summary += "\n"
-        
-        # Comparar cuantías ligadas a renta
-        income_linked = []
-        for item in sorted_data:
-            year = item.get('academic_year', {}).get('year', 'N/A')
-            for component in item.get('scholarship_amounts', {}).get('components', []):
-                if component.get('type', '') == 'Cuantía fija ligada a la renta' and 'amount' in component:
-                    income_linked.append((year, component['amount']))
-        
-        if len(income_linked) > 1:
-            summary += "### Evolución de la Cuantía Ligada a la Renta\n\n"
-            for year, amount in income_linked:
-                summary += f"- **{year}**: {amount} euros\n"
-            summary += "\n"
-        
-        # Comparar umbrales de renta (primer umbral, familia de 4 miembros)
-        thresholds = []
-        for item in sorted_data:
-            year = item.get('academic_year', {}).get('year', 'N/A')
-            for threshold in item.get('income_thresholds', {}).get('thresholds', []):
-                if threshold.get('number') == 1:
-                    for family in threshold.get('family_sizes', []):
-                        if family.get('size') == '4':
-                            thresholds.append((year, family.get('amount', 'N/A')))
-        
-        if len(thresholds) > 1:
-            summary += "### Evolución del Umbral 1 de Renta (Familia de 4 miembros)\n\n"
-            for year, amount in thresholds:
-                summary += f"- **{year}**: {amount} euros\n"
-            summary += "\n"
-    
-    # Nota final
-    summary += "## Notas Adicionales\n\n"
-    summary += "- La concesión de las becas está sujeta al cumplimiento de requisitos académicos y económicos establecidos en la convocatoria.\n"
-    summary += "- Las solicitudes deben presentarse dentro de los plazos establecidos, aunque no coincidan con el plazo de matrícula.\n"
-    summary += "- Para información completa, consulte la convocatoria oficial publicada en el Boletín Oficial del Estado.\n"
-    
-    return summary
+    """Genera un resumen a partir de los datos extraídos (diccionarios o ``Document`` tipados)."""
+    return "".join(iter_corpus_summary(data))
 
 def main():
     """Función principal para procesar el corpus de PDFs."""
@@ -852,6 +663,7 @@ def main():
     parser = argparse.ArgumentParser(description='Extrae información sobre becas de documentos PDF')
     parser.add_argument('--input', '-i', type=str, default='./corpus', help='Directorio que contiene los archivos PDF')
     parser.add_argument('--output', '-o', type=str, default='./output', help='Directorio de salida')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     # Crear directorio de salida si no existe
@@ -860,19 +672,22 @@ def main():
     
     # Procesar todos los PDFs
     print(f"Procesando archivos PDF de {args.input}...")
-    data = process_pdf_corpus(args.input)
+    profiler = profiler_from_args(args, args.output)
+    data = process_pdf_corpus(args.input, profiler)
     
     # Guardar datos en JSON
     output_json = os.path.join(args.output, "becas_datos.json")
     save_to_json(data, output_json)
     
     # Generar y guardar el resumen
-    summary = generate_summary(data)
     summary_path = os.path.join(args.output, "becas_resumen.md")
     with open(summary_path, 'w', encoding='utf-8') as file:
-        file.write(summary)
+        write_summary(iter_corpus_summary(data), file)
     print(f"Resumen guardado en {summary_path}")
     
+    if profiler.saved:
+        print(f"Perfiles guardados en {profiler.output_dir} ({len(profiler.saved)} documentos)")
+    
     print("¡Procesamiento completado!")
 
 if __name__ == "__main__":
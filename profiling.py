@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Perfilado por documento de los extractores (cProfile y tracemalloc).
+
+Todos los ``main()`` de los extractores aceptan ``--profile cpu|memory``. Con ``cpu``,
+cada documento se ejecuta bajo cProfile y se guardan sus estadísticas (``.prof``,
+legible con ``pstats`` o snakeviz) junto con un resumen de las funciones más costosas.
+Con ``memory``, se registra con tracemalloc lo que reserva cada documento y se guarda
+un resumen con las líneas que más memoria reservan y el pico alcanzado.
+
+Con ``--profile-min-seconds`` solo se guardan los perfiles de los documentos que tardan
+más que el umbral indicado, para localizar los PDFs problemáticos de un corpus grande.
+"""
+
+import io
+import os
+import time
+import pstats
+import cProfile
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Optional
+
+PROFILE_MODES = ('cpu', 'memory')
+
+
+class DocumentProfiler:
+    """Perfilador que envuelve el procesamiento de cada documento."""
+
+    def __init__(self, mode: Optional[str], output_dir: str, min_seconds: float = 0.0,
+                 top: int = 30, frames: int = 10):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            mode: 'cpu', 'memory' o None (sin perfilado)
+            output_dir: Directorio donde se guardan los perfiles
+            min_seconds: Solo se guardan los perfiles de documentos que tardan al menos esto
+            top: Número de entradas de los resúmenes de texto
+            frames: Profundidad de las trazas de tracemalloc
+        """
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Modo de perfilado desconocido: {mode}. Disponibles: {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.min_seconds = min_seconds
+        self.top = top
+        self.frames = frames
+        self.saved: List[str] = []
+
+        if mode is not None:
+            os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def profile(self, name: str):
+        """Contexto que perfila el procesamiento de un documento."""
+        if self.mode is None:
+            yield
+            return
+
+        if self.mode == 'cpu':
+            with self._profile_cpu(name):
+                yield
+        else:
+            with self._profile_memory(name):
+                yield
+
+    def _base_path(self, name: str) -> str:
+        safe_name = "".join(c if c.isalnum() or c in '-_.' else '_' for c in os.path.splitext(name)[0])
+        return os.path.join(self.output_dir, safe_name)
+
+    @contextmanager
+    def _profile_cpu(self, name: str):
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+
+            if elapsed >= self.min_seconds:
+                base_path = self._base_path(name)
+                profiler.dump_stats(f"{base_path}.cpu.prof")
+
+                summary = io.StringIO()
+                summary.write(f"Documento: {name}\nTiempo: {elapsed:.3f} s\n\n")
+                stats = pstats.Stats(profiler, stream=summary)
+                stats.sort_stats('cumulative').print_stats(self.top)
+                with open(f"{base_path}.cpu.txt", 'w', encoding='utf-8') as file:
+                    file.write(summary.getvalue())
+
+                self.saved.append(f"{base_path}.cpu.prof")
+
+    @contextmanager
+    def _profile_memory(self, name: str):
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_here:
+                tracemalloc.stop()
+
+            if elapsed >= self.min_seconds:
+                base_path = self._base_path(name)
+                # Excluir las reservas del propio tracemalloc
+                filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+                differences = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+
+                with open(f"{base_path}.memory.txt", 'w', encoding='utf-8') as file:
+                    file.write(f"Documento: {name}\nTiempo: {elapsed:.3f} s\n")
+                    file.write(f"Memoria actual: {current / 1024:.1f} KiB, pico: {peak / 1024:.1f} KiB\n\n")
+                    file.write(f"Líneas con más memoria reservada durante el documento (top {self.top}):\n")
+                    for stat in differences[:self.top]:
+                        file.write(f"{stat}\n")
+
+                self.saved.append(f"{base_path}.memory.txt")
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Añade las opciones de perfilado a la línea de comandos de un extractor."""
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                        help='Perfila cada documento (cpu: cProfile, memory: tracemalloc) y guarda los '
+                             'resultados en <output>/profiles')
+    parser.add_argument('--profile-min-seconds', type=float, default=0.0,
+                        help='Solo guarda los perfiles de los documentos que tardan al menos estos segundos')
+    parser.add_argument('--profile-top', type=int, default=30,
+                        help='Número de entradas de los resúmenes de perfilado')
+
+
+def profiler_from_args(args: argparse.Namespace, output_dir: str) -> DocumentProfiler:
+    """Crea el perfilador indicado en la línea de comandos (inactivo si no se pidió)."""
+    return DocumentProfiler(args.profile, os.path.join(output_dir, 'profiles'),
+                            min_seconds=args.profile_min_seconds, top=args.profile_top)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Compactación de los resultados de extracción en entradas para el generador.
+
+Convierte el resultado de ``BecasExtractor.extract_data`` o de ``analyze_pdf`` en una
+representación clave-valor mínima y determinista, sin los textos completos de los
+artículos, que no supera un presupuesto de tokens configurable. Las líneas se añaden
+por orden de prioridad (cuantías, umbrales, plazos, requisitos, estudios y
+procedimiento) y las que no caben se descartan.
+
+Los tokens se estiman a partir del número de caracteres, suficiente para comparar
+tamaños de entrada sin depender del tokenizador de un modelo concreto.
+
+Uso:
+python prompt_compaction.py -i output/ayudas_22-23.json --budget 300
+"""
+
+import json
+import argparse
+from dataclasses import dataclass
+from typing import List, Any, Callable, Iterator, Tuple
+
+from models import Document, as_document, as_dict, load_documents
+
+# Caracteres por token aproximados para texto en español
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 400
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimación del número de tokens de un texto."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _amount_lines(document: Document) -> Iterator[str]:
+    """Cuantías de cada componente, con tramos, mínimos y casos especiales."""
+    for component in document.components:
+        if component.amount is not None:
+            yield f"cuantía | {component.type}: {component.amount} euros"
+        if component.minimum_amount is not None:
+            yield f"cuantía | {component.type} (mínimo): {component.minimum_amount} euros"
+        for score_range in component.ranges or []:
+            yield f"cuantía | {component.type} ({score_range.min_score}-{score_range.max_score}): {score_range.amount} euros"
+        if component.special_case is not None:
+            yield f"cuantía | {component.type} ({component.special_case.case}): {component.special_case.amount} euros"
+
+
+def _threshold_lines(document: Document) -> Iterator[str]:
+    """Una línea por umbral con el límite de cada tamaño de familia."""
+    for threshold in document.thresholds:
+        cells = "; ".join(f"{family.size}: {family.amount}" for family in threshold.family_sizes)
+        if cells:
+            yield f"umbral {threshold.number} | {cells} euros"
+        if threshold.amount_per_member:
+            yield f"umbral {threshold.number} | por miembro adicional: {threshold.amount_per_member} euros"
+
+
+def _deadline_lines(document: Document) -> Iterator[str]:
+    """Plazos de solicitud."""
+    for deadline in document.deadlines:
+        yield f"plazo | {deadline.type}: {deadline.deadline or deadline.description}"
+    if document.exceptional_case is not None:
+        yield f"plazo | Casos excepcionales: {document.exceptional_case.deadline}"
+
+
+def _requirement_lines(document: Document) -> Iterator[str]:
+    """Requisitos académicos, con la nota o el porcentaje cuando se conocen."""
+    for requirement in document.requirements:
+        detail = requirement.percentage or requirement.grade or requirement.description
+        area = f" ({requirement.area})" if requirement.area else ""
+        yield f"requisito | {requirement.type}{area}: {detail}"
+
+
+def _study_lines(document: Document) -> Iterator[str]:
+    """Estudios elegibles."""
+    for study in document.non_university_studies:
+        yield f"estudio | no universitario: {study.description}"
+    for study in document.university_studies:
+        yield f"estudio | universitario: {study.description}"
+
+
+def _procedure_lines(document: Document) -> Iterator[str]:
+    """Pasos del procedimiento de solicitud."""
+    for step in document.procedure or []:
+        yield f"procedimiento | {step.step}: {step.description}"
+
+
+# Secciones en orden de prioridad
+SECTIONS: List[Tuple[str, Callable[[Document], Iterator[str]]]] = [
+    ("amounts", _amount_lines),
+    ("thresholds", _threshold_lines),
+    ("deadlines", _deadline_lines),
+    ("requirements", _requirement_lines),
+    ("studies", _study_lines),
+    ("procedure", _procedure_lines)
+]
+
+
+@dataclass(slots=True)
+class CompactInput:
+    """Entrada compacta del generador con su estimación de tokens."""
+    text: str
+    tokens: int
+    original_tokens: int
+    included_lines: int
+    dropped_lines: int
+
+    @property
+    def saved_tokens(self) -> int:
+        """Tokens estimados que se ahorran frente al JSON completo."""
+        return max(0, self.original_tokens - self.tokens)
+
+    def report(self) -> str:
+        """Resumen de una línea del ahorro conseguido."""
+        ratio = self.tokens / self.original_tokens * 100 if self.original_tokens else 0.0
+        return (f"{self.tokens} tokens de {self.original_tokens} ({ratio:.1f}%), "
+                f"ahorro estimado de {self.saved_tokens} tokens; "
+                f"{self.included_lines} líneas incluidas, {self.dropped_lines} descartadas")
+
+
+def compact_document(data: Any, token_budget: int = DEFAULT_TOKEN_BUDGET) -> CompactInput:
+    """
+    Compacta el resultado de un extractor dentro de un presupuesto de tokens.
+
+    Args:
+        data: Resultado de ``extract_data``, de ``analyze_pdf`` o un ``Document``
+        token_budget: Número máximo de tokens estimados de la entrada
+
+    Returns:
+        Entrada compacta con el texto y las estimaciones de tokens
+    """
+    document = as_document(data)
+    lines = [f"curso: {document.academic_year or 'N/A'}"]
+    used = estimate_tokens(lines[0])
+    dropped = 0
+
+    for _, section_lines in SECTIONS:
+        for line in section_lines(document):
+            # Cada línea adicional cuesta también el salto de línea
+            cost = estimate_tokens(line) + 1
+            if used + cost > token_budget:
+                dropped += 1
+                continue
+            lines.append(line)
+            used += cost
+
+    text = "\n".join(lines)
+    original = estimate_tokens(json.dumps(as_dict(data), ensure_ascii=False))
+    return CompactInput(text, estimate_tokens(text), original, len(lines) - 1, dropped)
+
+
+def main():
+    """Muestra la entrada compacta y el ahorro estimado de cada documento de un fichero."""
+    parser = argparse.ArgumentParser(description='Compacta los resultados de extracción para el generador')
+    parser.add_argument('--input', '-i', type=str, required=True, help='Fichero JSON o NDJSON con los resultados')
+    parser.add_argument('--budget', '-b', type=int, default=DEFAULT_TOKEN_BUDGET, help='Presupuesto de tokens')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Mostrar solo el informe de tokens')
+    args = parser.parse_args()
+
+    total_tokens = total_original = 0
+    for document in load_documents(args.input):
+        if not document.valid:
+            continue
+        compact = compact_document(document, args.budget)
+        total_tokens += compact.tokens
+        total_original += compact.original_tokens
+
+        print(f"== {document.file_name} ({document.academic_year}): {compact.report()}")
+        if not args.quiet:
+            print(compact.text)
+            print()
+
+    print(f"Total: {total_tokens} tokens de {total_original}, ahorro estimado de {total_original - total_tokens} tokens")
+
+
+if __name__ == "__main__":
+    main()
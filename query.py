@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Consultas sobre el corpus de convocatorias ya extraídas, sin volver a procesar documentos.
+
+A partir de los resultados de los extractores se construye una vez un índice en disco
+con dos tablas alineadas por curso académico (ver ``year_diff.YearDiff``):
+- curso → componente → cuantía
+- curso × umbral × tamaño de familia → umbral de renta
+
+Las consultas son búsquedas en diccionarios y las consultas por rango de cursos usan
+búsqueda binaria sobre la lista ordenada de cursos.
+
+Uso:
+python query.py build -i output/ayudas_*.json -o output/indice_consultas.json
+python query.py threshold 2022-2023 1 4
+python query.py component 2023-2024 "beca básica"
+python query.py threshold 1 4 --from 2021-2022 --to 2024-2025
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from models import load_documents
+from year_diff import YearDiff
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = './output/indice_consultas.json'
+
+
+def _normalize_name(name: str) -> str:
+    """Nombre de componente en minúsculas, sin tildes ni espacios repetidos."""
+    decomposed = unicodedata.normalize('NFD', name.lower())
+    return ' '.join(''.join(c for c in decomposed if unicodedata.category(c) != 'Mn').split())
+
+
+def normalize_year(year: str) -> str:
+    """
+    Normaliza un curso académico a la forma 'AAAA-AAAA'.
+
+    Acepta '2022-2023', '2022/2023', '22-23' o solo el año de inicio ('2022').
+    """
+    numbers = re.findall(r'\d+', str(year))
+    if not numbers:
+        raise ValueError(f"Curso académico no válido: {year}")
+    start = int(numbers[0])
+    if start < 100:
+        start += 2000
+    return f"{start}-{start + 1}"
+
+
+class CorpusQuery:
+    """Índice de consultas de cuantías y umbrales por curso académico."""
+
+    def __init__(self, years: List[str], components: Dict[str, List[Optional[str]]],
+                 thresholds: Dict[Tuple[int, str], List[Optional[str]]]):
+        self.years = years
+        self.components = components
+        self.thresholds = thresholds
+        self._year_positions = {year: i for i, year in enumerate(years)}
+        self._component_names = {_normalize_name(name): name for name in components}
+
+    @classmethod
+    def build(cls, documents: Iterable[Any]) -> "CorpusQuery":
+        """
+        Construye el índice a partir de los resultados de los extractores.
+
+        Si varios documentos son del mismo curso (por ejemplo, el PDF y su texto), se
+        fusionan en una sola posición con el primer valor no nulo de cada celda.
+        """
+        diff = YearDiff.build(documents)
+        years = list(dict.fromkeys(diff.years))
+        positions = {year: i for i, year in enumerate(years)}
+
+        def merge(raw: List[Optional[str]]) -> List[Optional[str]]:
+            merged: List[Optional[str]] = [None] * len(years)
+            for year, value in zip(diff.years, raw):
+                if merged[positions[year]] is None:
+                    merged[positions[year]] = value
+            return merged
+
+        return cls(
+            years,
+            {name: merge(series.raw) for name, series in diff.components.items()},
+            {key: merge(series.raw) for key, series in diff.thresholds.items()}
+        )
+
+    def save(self, path: str) -> None:
+        """Guarda el índice en un fichero JSON."""
+        data = {
+            "version": INDEX_VERSION,
+            "years": self.years,
+            "components": self.components,
+            "thresholds": {f"{number}|{size}": values for (number, size), values in self.thresholds.items()}
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "CorpusQuery":
+        """Carga un índice guardado con ``save``."""
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Versión de índice no soportada en {path}: {data.get('version')}")
+
+        thresholds = {}
+        for key, values in data["thresholds"].items():
+            number, size = key.split('|', 1)
+            thresholds[(int(number) if number.isdigit() else number, size)] = values
+        return cls(data["years"], data["components"], thresholds)
+
+    def resolve_component(self, name: str) -> Optional[str]:
+        """
+        Nombre exacto de un componente a partir de un nombre aproximado.
+
+        Se admite el nombre sin tildes ni mayúsculas o un fragmento de él
+        ('beca basica', 'residencia'); si hay varias coincidencias se toma la más corta.
+        """
+        normalized = _normalize_name(name)
+        if normalized in self._component_names:
+            return self._component_names[normalized]
+        matches = [key for key in self._component_names if normalized in key]
+        if not matches:
+            return None
+        return self._component_names[min(matches, key=len)]
+
+    def component_amount(self, year: str, component: str) -> Optional[str]:
+        """Cuantía de un componente en un curso (None si no consta)."""
+        position = self._year_positions.get(normalize_year(year))
+        name = self.resolve_component(component)
+        if position is None or name is None:
+            return None
+        return self.components[name][position]
+
+    def threshold(self, year: str, number: int, family_size: int) -> Optional[str]:
+        """Umbral de renta de un curso para un número de umbral y un tamaño de familia."""
+        position = self._year_positions.get(normalize_year(year))
+        values = self.thresholds.get((number, str(family_size)))
+        if position is None or values is None:
+            return None
+        return values[position]
+
+    def _year_range(self, from_year: Optional[str], to_year: Optional[str]) -> range:
+        """Posiciones de los cursos comprendidos entre dos cursos (ambos incluidos)."""
+        start = bisect_left(self.years, normalize_year(from_year)) if from_year else 0
+        end = bisect_right(self.years, normalize_year(to_year)) if to_year else len(self.years)
+        return range(start, end)
+
+    def component_range(self, component: str, from_year: Optional[str] = None,
+                        to_year: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """Cuantías de un componente en un rango de cursos, como pares (curso, cuantía)."""
+        name = self.resolve_component(component)
+        if name is None:
+            return []
+        values = self.components[name]
+        return [(self.years[i], values[i]) for i in self._year_range(from_year, to_year)]
+
+    def threshold_range(self, number: int, family_size: int, from_year: Optional[str] = None,
+                        to_year: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """Umbrales de renta en un rango de cursos, como pares (curso, umbral)."""
+        values = self.thresholds.get((number, str(family_size)))
+        if values is None:
+            return []
+        return [(self.years[i], values[i]) for i in self._year_range(from_year, to_year)]
+
+
+def _print_answer(label: str, value: Optional[str], elapsed: float) -> None:
+    print(f"{label}: {value + ' euros' if value is not None else 'sin datos'}  ({elapsed * 1e6:.0f} µs)")
+
+
+def _print_series(label: str, points: List[Tuple[str, Optional[str]]], elapsed: float) -> None:
+    print(f"{label} ({elapsed * 1e6:.0f} µs)")
+    for year, value in points:
+        print(f"   {year}: {value + ' euros' if value is not None else 'sin datos'}")
+
+
+def main():
+    """Construye el índice de consultas o responde a una consulta."""
+    parser = argparse.ArgumentParser(description='Consultas de cuantías y umbrales de las convocatorias de becas')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Construye el índice a partir de ficheros de resultados')
+    build_parser.add_argument('--input', '-i', type=str, nargs='+', required=True,
+                              help='Ficheros JSON o NDJSON con los resultados de los extractores')
+    build_parser.add_argument('--output', '-o', type=str, default=DEFAULT_INDEX_PATH, help='Fichero del índice')
+
+    component_parser = subparsers.add_parser('component', help='Cuantía de un componente de la beca')
+    component_parser.add_argument('args', nargs='+', metavar='[CURSO] COMPONENTE',
+                                  help="Curso (opcional con --from/--to) y componente, por ejemplo 2022-2023 'beca básica'")
+
+    threshold_parser = subparsers.add_parser('threshold', help='Umbral de renta por tamaño de familia')
+    threshold_parser.add_argument('args', nargs='+', metavar='[CURSO] UMBRAL MIEMBROS',
+                                  help='Curso (opcional con --from/--to), número de umbral y miembros de la familia')
+
+    for sub in (component_parser, threshold_parser):
+        sub.add_argument('--index', '-x', type=str, default=DEFAULT_INDEX_PATH, help='Fichero del índice')
+        sub.add_argument('--from', dest='from_year', type=str, default=None, help='Primer curso del rango')
+        sub.add_argument('--to', dest='to_year', type=str, default=None, help='Último curso del rango')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        documents = (document for path in args.input for document in load_documents(path))
+        index = CorpusQuery.build(documents)
+        index.save(args.output)
+        print(f"Índice de consultas con {len(index.years)} cursos, {len(index.components)} componentes y "
+              f"{len(index.thresholds)} celdas de umbrales guardado en {args.output}")
+        return
+
+    index = CorpusQuery.load(args.index)
+    is_range = args.from_year is not None or args.to_year is not None
+
+    if args.command == 'component':
+        expected = 1 if is_range else 2
+        if len(args.args) != expected:
+            parser.error("component espera CURSO COMPONENTE, o COMPONENTE con --from/--to")
+        component = args.args[-1]
+        start = time.perf_counter()
+        if is_range:
+            points = index.component_range(component, args.from_year, args.to_year)
+            _print_series(f"{index.resolve_component(component) or component}", points, time.perf_counter() - start)
+            found = bool(points)
+        else:
+            value = index.component_amount(args.args[0], component)
+            _print_answer(f"{normalize_year(args.args[0])} · {index.resolve_component(component) or component}",
+                          value, time.perf_counter() - start)
+            found = value is not None
+        sys.exit(0 if found else 1)
+
+    expected = 2 if is_range else 3
+    if len(args.args) != expected:
+        parser.error("threshold espera CURSO UMBRAL MIEMBROS, o UMBRAL MIEMBROS con --from/--to")
+    try:
+        number, size = int(args.args[-2]), int(args.args[-1])
+    except ValueError:
+        parser.error("UMBRAL y MIEMBROS deben ser números enteros")
+
+    start = time.perf_counter()
+    if is_range:
+        points = index.threshold_range(number, size, args.from_year, args.to_year)
+        _print_series(f"Umbral {number}, familia de {size} miembros", points, time.perf_counter() - start)
+        found = bool(points)
+    else:
+        value = index.threshold(args.args[0], number, size)
+        _print_answer(f"{normalize_year(args.args[0])} · Umbral {number}, familia de {size} miembros",
+                      value, time.perf_counter() - start)
+        found = value is not None
+    sys.exit(0 if found else 1)
+
+
+if __name__ == "__main__":
+    main()
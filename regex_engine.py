@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Motor de expresiones regulares de los patrones de extracción.
+
+Varios patrones combinan ``re.DOTALL`` con varios ``.*?``. Cuando falta el ancla que
+esperan, el motor de ``re`` (con vuelta atrás) puede tardar un tiempo cuadrático o peor
+en documentos grandes. Si está instalado RE2 (``pip install google-re2``), este módulo
+ejecuta en él los patrones compatibles, con tiempo lineal garantizado en el tamaño del
+texto. Los demás patrones siguen en ``re``.
+
+- ``compile(pattern, flags)`` sustituye a ``re.compile``. Devuelve un patrón con la
+  misma interfaz (``search``, ``match``, ``findall``, ``finditer``, ``sub``...) y con
+  los atributos ``engine`` ('re2' o 're') y ``reason`` (por qué no se usa RE2).
+- El patrón no se pasa tal cual a RE2: se traduce desde el árbol del analizador de
+  ``re``. Así se conserva el significado Unicode de ``\\d``, ``\\s`` y ``\\w`` de Python
+  (en RE2 solo abarcan ASCII, y los PDF traen espacios no separables).
+- Van a ``re`` los patrones que necesitan vuelta atrás o que RE2 interpreta de otra
+  forma: búsquedas hacia delante o hacia atrás (``(?=``, ``(?!``...), referencias a
+  grupos, grupos atómicos, ``\\b`` (en RE2 solo ASCII) y ``$`` sin ``re.MULTILINE``
+  (en Python también coincide antes del salto de línea final).
+- ``engine_report()`` lista todos los patrones compilados hasta el momento con su motor.
+  ``python regex_engine.py`` muestra el motor de los patrones del paquete de patrones y
+  de ``herramienta.py``.
+
+La variable de entorno ``BECAS_REGEX_ENGINE=re`` desactiva RE2 aunque esté instalado.
+Solo los patrones que van a RE2 tienen un límite de tiempo garantizado; el informe
+indica cuáles quedan en ``re``.
+"""
+
+import os
+import re
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import re._parser as sre_parse
+    import re._constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+logger = logging.getLogger("RegexEngine")
+
+ENGINE = os.environ.get('BECAS_REGEX_ENGINE', 'auto')
+
+# Caracteres que Python considera espacio en blanco (str.isspace) y, por tanto, \s
+_SPACE_CLASS = r'\t-\r\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}'
+# \d y \w de Python sobre texto: dígitos decimales Unicode y letras, números y '_'
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: (r'\p{Nd}', None),
+    sre_constants.CATEGORY_NOT_DIGIT: (r'\P{Nd}', None),
+    sre_constants.CATEGORY_SPACE: (_SPACE_CLASS, None),
+    sre_constants.CATEGORY_NOT_SPACE: (None, _SPACE_CLASS),
+    sre_constants.CATEGORY_WORD: (r'\p{L}\p{N}_', None),
+    sre_constants.CATEGORY_NOT_WORD: (None, r'\p{L}\p{N}_'),
+}
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+_SUPPORTED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE
+
+
+class UnsupportedPattern(Exception):
+    """El patrón usa una construcción que RE2 no admite o interpreta de otra forma."""
+
+
+def _literal(code: int) -> str:
+    char = chr(code)
+    if char.isascii() and char.isalnum():
+        return char
+    return f'\\x{{{code:x}}}'
+
+
+def _translate_class(items: List[Tuple[Any, Any]]) -> str:
+    """Traduce una clase de caracteres (``[...]``, ``\\s``, ``\\w``...)."""
+    negate = bool(items) and items[0][0] is sre_constants.NEGATE
+    if negate:
+        items = items[1:]
+
+    parts = []
+    for op, value in items:
+        if op is sre_constants.LITERAL:
+            parts.append(_literal(value))
+        elif op is sre_constants.RANGE:
+            parts.append(f"{_literal(value[0])}-{_literal(value[1])}")
+        elif op is sre_constants.CATEGORY:
+            positive, negative = _CATEGORIES.get(value, (None, None))
+            if positive is not None:
+                parts.append(positive)
+            elif negative is not None and len(items) == 1:
+                # \S y \W solo se pueden expresar como clase negada completa
+                return f"[{'' if negate else '^'}{negative}]"
+            else:
+                raise UnsupportedPattern(f"categoría {value} dentro de una clase")
+        else:
+            raise UnsupportedPattern(f"elemento de clase {op}")
+    return f"[{'^' if negate else ''}{''.join(parts)}]"
+
+
+def _translate(pattern: Any, flags: int, groupnames: Dict[int, str]) -> str:
+    """Traduce una secuencia del árbol de ``re`` a sintaxis de RE2."""
+    out = []
+    for op, value in pattern:
+        if op is sre_constants.LITERAL:
+            out.append(_literal(value))
+        elif op is sre_constants.NOT_LITERAL:
+            out.append(f"[^{_literal(value)}]")
+        elif op is sre_constants.ANY:
+            out.append('.')
+        elif op is sre_constants.IN:
+            out.append(_translate_class(value))
+        elif op is sre_constants.BRANCH:
+            out.append('(?:' + '|'.join(_translate(branch, flags, groupnames) for branch in value[1]) + ')')
+        elif op is sre_constants.SUBPATTERN:
+            group, add_flags, del_flags, sub = value
+            if (add_flags | del_flags) & ~_SUPPORTED_FLAGS:
+                raise UnsupportedPattern("banderas locales no admitidas")
+            if (add_flags | del_flags) & re.MULTILINE:
+                raise UnsupportedPattern("re.MULTILINE local")
+            inline = ''.join(letter for flag, letter in _INLINE_FLAGS if add_flags & flag)
+            removed = ''.join(letter for flag, letter in _INLINE_FLAGS if del_flags & flag)
+            body = _translate(sub, (flags | add_flags) & ~del_flags, groupnames)
+            if inline or removed:
+                body = f"(?{inline}{'-' + removed if removed else ''}:{body})"
+            if group is None:
+                out.append(f"(?:{body})")
+            elif group in groupnames:
+                out.append(f"(?P<{groupnames[group]}>{body})")
+            else:
+                out.append(f"({body})")
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub = value
+            if high is sre_constants.MAXREPEAT:
+                quantifier = {0: '*', 1: '+'}.get(low, f'{{{low},}}')
+            elif (low, high) == (0, 1):
+                quantifier = '?'
+            elif high > 1000:
+                raise UnsupportedPattern("repetición de más de 1000")
+            else:
+                quantifier = f'{{{low}}}' if low == high else f'{{{low},{high}}}'
+            if op is sre_constants.MIN_REPEAT:
+                quantifier += '?'
+            out.append(f"(?:{_translate(sub, flags, groupnames)}){quantifier}")
+        elif op is sre_constants.AT:
+            if value is sre_constants.AT_BEGINNING_STRING:
+                out.append(r'\A')
+            elif value is sre_constants.AT_END_STRING:
+                out.append(r'\z')
+            elif value is sre_constants.AT_BEGINNING:
+                out.append('^')
+            elif value is sre_constants.AT_END and flags & re.MULTILINE:
+                out.append('$')
+            elif value is sre_constants.AT_END:
+                raise UnsupportedPattern("$ sin re.MULTILINE")
+            else:
+                raise UnsupportedPattern("límite de palabra \\b/\\B")
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            raise UnsupportedPattern("búsqueda hacia delante o hacia atrás")
+        elif op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+            raise UnsupportedPattern("referencia a un grupo")
+        else:
+            raise UnsupportedPattern(f"construcción {op}")
+    return ''.join(out)
+
+
+def to_re2(pattern: str, flags: int = 0) -> str:
+    """
+    Traduce un patrón de ``re`` a un patrón equivalente de RE2.
+
+    Raises:
+        UnsupportedPattern: Si el patrón necesita un motor con vuelta atrás
+        re.error: Si el patrón no es válido
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    flags = parsed.state.flags
+    if flags & ~_SUPPORTED_FLAGS:
+        raise UnsupportedPattern("banderas no admitidas (re.VERBOSE se resuelve al analizar; re.ASCII no)")
+    groupnames = {index: name for name, index in parsed.state.groupdict.items()}
+    prefix = ''.join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+    body = _translate(parsed, flags, groupnames)
+    return f"(?{prefix}){body}" if prefix else body
+
+
+class CompiledPattern:
+    """Patrón compilado en RE2 o en ``re``, con la interfaz de ``re.Pattern``."""
+
+    __slots__ = ('pattern', 'flags', 'engine', 'reason', 'compiled',
+                 'search', 'match', 'fullmatch', 'findall', 'finditer', 'sub', 'subn', 'split')
+
+    def __init__(self, pattern: str, flags: int, engine: str, reason: str, compiled: Any):
+        self.pattern = pattern
+        self.flags = flags
+        self.engine = engine
+        self.reason = reason
+        self.compiled = compiled
+        for name in ('search', 'match', 'fullmatch', 'findall', 'finditer', 'sub', 'subn', 'split'):
+            setattr(self, name, getattr(compiled, name))
+
+    @property
+    def groups(self) -> int:
+        return self.compiled.groups
+
+    @property
+    def groupindex(self) -> Dict[str, int]:
+        return dict(self.compiled.groupindex)
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.pattern!r}, engine={self.engine!r})"
+
+
+# Patrones ya compilados, por (patrón, banderas)
+_CACHE: Dict[Tuple[str, int], CompiledPattern] = {}
+
+
+def compile(pattern: str, flags: int = 0) -> CompiledPattern:
+    """
+    Compila un patrón en RE2 si es posible y, si no, en ``re``.
+
+    Raises:
+        re.error: Si el patrón no es válido
+    """
+    key = (pattern, int(flags))
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    compiled = re.compile(pattern, flags)  # valida el patrón y es el respaldo
+    engine, reason = 're', ''
+    if not RE2_AVAILABLE:
+        reason = "RE2 no instalado"
+    elif ENGINE == 're':
+        reason = "desactivado con BECAS_REGEX_ENGINE=re"
+    else:
+        try:
+            compiled = re2.compile(to_re2(pattern, flags))
+            engine = 're2'
+        except UnsupportedPattern as e:
+            reason = str(e)
+        except re2.error as e:
+            reason = f"RE2 no lo acepta: {e}"
+
+    result = _CACHE[key] = CompiledPattern(pattern, compiled.flags if engine == 're' else int(flags),
+                                           engine, reason, compiled)
+    logger.debug(f"Patrón en {engine}{f' ({reason})' if reason else ''}: {pattern}")
+    return result
+
+
+def search(pattern: str, string: str, flags: int = 0) -> Optional[Any]:
+    """Equivalente a ``re.search`` con el motor elegido por ``compile``."""
+    return compile(pattern, flags).search(string)
+
+
+def findall(pattern: str, string: str, flags: int = 0) -> List[Any]:
+    """Equivalente a ``re.findall`` con el motor elegido por ``compile``."""
+    return compile(pattern, flags).findall(string)
+
+
+def engine_report() -> List[Dict[str, Any]]:
+    """Motor de cada patrón compilado hasta ahora, en orden de compilación."""
+    return [{"pattern": item.pattern, "flags": item.flags, "engine": item.engine, "reason": item.reason}
+            for item in _CACHE.values()]
+
+
+def main():
+    """Muestra qué motor usa cada patrón del paquete de patrones y de la herramienta de patrones."""
+    import argparse
+    parser = argparse.ArgumentParser(description='Motor de expresiones regulares de cada patrón de extracción')
+    parser.add_argument('--only-re', action='store_true', help='Muestra solo los patrones que quedan en re')
+    args = parser.parse_args()
+
+    import pattern_pack
+    import herramienta
+
+    rows = []
+    pack = pattern_pack.PatternPack.from_file(pattern_pack.DEFAULT_PACK_PATH)
+    for name in pack.names():
+        if pack.is_template(name):
+            # Las plantillas se compilan al rellenarlas; basta un ejemplo para conocer el motor
+            example = pack.template(name, number=3, next=4, title='Enseñanzas')
+            rows.append((f"pack:{name}", example))
+        else:
+            rows += [(f"pack:{name}[{i}]", pattern) for i, pattern in enumerate(pack.get_list(name), 1)]
+    for group, patterns in herramienta.PATTERN_GROUPS.items():
+        rows += [(f"herramienta:{group}[{i}]", compile(pattern, re.DOTALL | re.IGNORECASE))
+                 for i, (pattern, _) in enumerate(patterns, 1)]
+
+    print(f"RE2 {'disponible' if RE2_AVAILABLE else 'no disponible'} (BECAS_REGEX_ENGINE={ENGINE})")
+    counts: Dict[str, int] = {}
+    for label, compiled in rows:
+        counts[compiled.engine] = counts.get(compiled.engine, 0) + 1
+        if args.only_re and compiled.engine != 're':
+            continue
+        reason = f"  ({compiled.reason})" if compiled.reason else ""
+        print(f"   {compiled.engine:<4} {label:<40}{reason}".rstrip())
+    print("\n" + ", ".join(f"{engine}: {count} patrones" for engine, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Pruebas de regresión de los extractores contra resultados de referencia.
+
+A diferencia de ``test.py`` (interactivo), este programa se ejecuta sin intervención:
+pasa cada extractor por todos los documentos de ``corpus/`` (PDF) y ``corpus_txt/``
+(texto ya extraído), compara el resultado campo a campo con el JSON de referencia
+guardado en el repositorio y comprueba que ningún documento supere el presupuesto de
+tiempo y de memoria configurado. Termina con código 1 si algo falla, de modo que puede
+usarse antes de aceptar cambios en las expresiones regulares.
+
+Referencias:
+- ``golden/<extractor>/<documento>.json``: resultado esperado, sin los campos que cambian
+  en cada ejecución (fechas de extracción). Para ``pdfminer2`` se compara la versión
+  simplificada (``create_simplified_json``) y, si no hay referencia en ``golden/``, se usa
+  ``output/<documento>_simple.json``. Un documento sin referencia cuenta como fallo.
+- ``golden/budgets.json``: presupuestos por documento, con claves ``default``,
+  ``<extractor>`` o ``<extractor>/<pdf|txt>`` (de menos a más específica).
+
+Los extractores cuya biblioteca de PDF no está instalada se omiten (con ``--strict``,
+cuentan como fallo).
+
+Además se comprueba el calendario de plazos construido con ``output/ayudas_*.json`` (ver
+``deadline_timeline.py``): tras el cierre de cada plazo general no debe quedar abierto
+ningún otro plazo del mismo curso salvo el excepcional.
+
+Uso:
+python regression.py
+python regression.py --extractors pdfminer2 --sources txt
+python regression.py --update            # regenera las referencias tras un cambio intencionado
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import atexit
+import shutil
+import logging
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+EXTRACTORS = ('pdfminer2', 'pdfminer', 'pymupdf', 'pypdf2')
+SOURCES = {'pdf': ('./corpus', '.pdf'), 'txt': ('./corpus_txt', '.txt')}
+GOLDEN_DIR = './golden'
+DEFAULT_BUDGET = {"seconds": 60.0, "memory_mib": 512.0}
+
+# Campos que dependen del momento de la ejecución y no se comparan
+VOLATILE_FIELDS = ('extraction_date', 'processing_timestamp')
+
+
+def _load_extractor(name: str) -> Tuple[Callable[[str], Dict[str, Any]], Tuple[str, ...]]:
+    """
+    Importa un extractor y devuelve la función documento → resultado comparable, junto
+    con los tipos de fuente que puede procesar en este entorno.
+
+    Raises:
+        ImportError: Si el extractor no se puede importar
+    """
+    if name == 'pdfminer2':
+        import pdf_miner_extractor_2
+        # Directorio de trabajo que se borra al terminar el proceso
+        work_dir = tempfile.mkdtemp(prefix='regression_')
+        atexit.register(shutil.rmtree, work_dir, ignore_errors=True)
+        extractor = pdf_miner_extractor_2.BecasExtractor(input_dir='.', output_dir=work_dir)
+
+        def run(path: str) -> Dict[str, Any]:
+            if path.endswith('.pdf'):
+                text = extractor.extract_text_from_pdf(path)
+            else:
+                with open(path, 'r', encoding='utf-8') as file:
+                    text = file.read()
+            return extractor.create_simplified_json(extractor.extract_data(text, os.path.basename(path)))
+
+        sources = ('pdf', 'txt') if pdf_miner_extractor_2.PDFMINER_AVAILABLE else ('txt',)
+        return run, sources
+
+    if name == 'pdfminer':
+        import pdf_miner_extractor
+        extractor = pdf_miner_extractor.BecasExtractor()
+        try:
+            import PyPDF2  # noqa: F401
+            sources = ('pdf', 'txt')
+        except ImportError:
+            sources = ('txt',)
+        return lambda path: extractor.extract_data(extractor.read_text(path), os.path.basename(path)), sources
+
+    if name == 'pymupdf':
+        import pymupdf_extractor
+
+        def run(path: str) -> Dict[str, Any]:
+            if path.endswith('.pdf'):
+                text = pymupdf_extractor.extract_text_from_pdf(path)
+            else:
+                with open(path, 'r', encoding='utf-8') as file:
+                    text = file.read()
+            return pymupdf_extractor.analyze_text(text, path)
+
+        return run, ('pdf', 'txt')
+
+    if name == 'pypdf2':
+        import pdyd2_extractor
+
+        def run(path: str) -> Dict[str, Any]:
+            if path.endswith('.pdf'):
+                text = pdyd2_extractor.extract_text_from_pdf(path)
+            else:
+                with open(path, 'r', encoding='utf-8') as file:
+                    text = file.read()
+            return pdyd2_extractor.analyze_text(text, path)
+
+        return run, ('pdf', 'txt')
+
+    raise ValueError(f"Extractor desconocido: {name}")
+
+
+def comparable(value: Any) -> Any:
+    """Resultado sin los campos volátiles y con la forma que tendría tras pasar por JSON."""
+    if isinstance(value, dict):
+        return {key: comparable(item) for key, item in value.items() if key not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [comparable(item) for item in value]
+    return value
+
+
+def diff_values(expected: Any, actual: Any, path: str = "") -> List[Tuple[str, Any, Any]]:
+    """
+    Diferencias campo a campo entre dos resultados.
+
+    Returns:
+        Lista de (ruta del campo, valor esperado, valor obtenido); la ruta usa la forma
+        ``income_thresholds.thresholds[2].family_sizes[0].amount``
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in list(expected) + [key for key in actual if key not in expected]:
+            child = f"{path}.{key}" if path else str(key)
+            if key not in actual:
+                differences.append((child, expected[key], "<falta>"))
+            elif key not in expected:
+                differences.append((child, "<falta>", actual[key]))
+            else:
+                differences += diff_values(expected[key], actual[key], child)
+        return differences
+
+    if isinstance(expected, list) and isinstance(actual, list):
+        differences = []
+        for i, (left, right) in enumerate(zip(expected, actual)):
+            differences += diff_values(left, right, f"{path}[{i}]")
+        if len(expected) != len(actual):
+            differences.append((f"{path}.length", len(expected), len(actual)))
+        return differences
+
+    return [] if expected == actual else [(path or "<raíz>", expected, actual)]
+
+
+def golden_path(extractor: str, document_path: str, golden_dir: str, fallback: bool = True) -> str:
+    """
+    Ruta de la referencia de un documento: la de ``golden/`` o, si no existe y se admite
+    ``fallback``, la de ``output/`` (solo para ``pdfminer2``).
+    """
+    stem = os.path.splitext(os.path.basename(document_path))[0]
+    path = os.path.join(golden_dir, extractor, f"{stem}.json")
+    if fallback and extractor == 'pdfminer2' and not os.path.exists(path):
+        output_path = os.path.join('./output', f"{stem}_simple.json")
+        if os.path.exists(output_path):
+            return output_path
+    return path
+
+
+def timeline_problems(output_dir: str = './output') -> List[str]:
+    """Problemas del calendario de plazos construido con los resultados de ``output/``."""
+    from models import load_documents
+    from deadline_timeline import DeadlineTimeline, closed_window_problems
+
+    paths = sorted(path for path in glob.glob(os.path.join(output_dir, 'ayudas_*.json'))
+                   if not path.endswith('_simple.json'))
+    timeline = DeadlineTimeline.build(document for path in paths for document in load_documents(path))
+    return closed_window_problems(timeline)
+
+
+def load_budgets(path: str) -> Dict[str, Dict[str, float]]:
+    """Presupuestos de ``golden/budgets.json`` (vacío si no existe)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def budget_for(budgets: Dict[str, Dict[str, float]], extractor: str, source: str) -> Dict[str, float]:
+    """Presupuesto de un extractor y tipo de fuente, de la clave menos a la más específica."""
+    budget = dict(DEFAULT_BUDGET)
+    for key in ('default', extractor, f"{extractor}/{source}"):
+        budget.update(budgets.get(key, {}))
+    return budget
+
+
+def run_document(run: Callable[[str], Dict[str, Any]], path: str, measure_memory: bool) -> Tuple[Any, float, Optional[float]]:
+    """
+    Ejecuta un extractor sobre un documento.
+
+    El tiempo se mide en una ejecución sin trazas; la memoria (pico de reservas de Python
+    con tracemalloc) en una segunda ejecución, para que el coste de las trazas no cuente
+    en el tiempo.
+
+    Returns:
+        (resultado comparable, segundos, pico de memoria en MiB o None)
+    """
+    start = time.perf_counter()
+    result = comparable(run(path))
+    seconds = time.perf_counter() - start
+
+    peak_mib = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            run(path)
+            peak_mib = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak_mib
+
+
+def main():
+    """Ejecuta las pruebas de regresión (o regenera las referencias con --update)."""
+    parser = argparse.ArgumentParser(description='Pruebas de regresión de los extractores de becas')
+    parser.add_argument('--extractors', nargs='+', choices=EXTRACTORS, default=list(EXTRACTORS),
+                        help='Extractores a probar')
+    parser.add_argument('--sources', nargs='+', choices=sorted(SOURCES), default=sorted(SOURCES),
+                        help='Tipos de documento: pdf (corpus/) y txt (corpus_txt/)')
+    parser.add_argument('--golden', type=str, default=GOLDEN_DIR, help='Directorio de las referencias')
+    parser.add_argument('--update', action='store_true',
+                        help='Escribe los resultados actuales como nuevas referencias en lugar de comparar')
+    parser.add_argument('--max-seconds', type=float, default=None, help='Presupuesto de tiempo por documento (s)')
+    parser.add_argument('--max-memory-mib', type=float, default=None, help='Presupuesto de memoria por documento (MiB)')
+    parser.add_argument('--no-memory', action='store_true', help='No mide la memoria (evita la segunda ejecución)')
+    parser.add_argument('--max-diffs', type=int, default=10, help='Diferencias que se muestran por documento')
+    parser.add_argument('--strict', action='store_true',
+                        help='Falla también si un extractor o su biblioteca de PDF no están disponibles')
+    args = parser.parse_args()
+
+    budgets = load_budgets(os.path.join(args.golden, 'budgets.json'))
+    failures = skipped = passed = 0
+
+    # Los extractores informan por consola y en el log de cada documento; aquí solo estorba
+    logging.disable(logging.CRITICAL)
+    quiet = open(os.devnull, 'w', encoding='utf-8')
+
+    for extractor in args.extractors:
+        try:
+            with contextlib.redirect_stdout(quiet):
+                run, available_sources = _load_extractor(extractor)
+        except ImportError as e:
+            print(f"⚠️ {extractor}: no disponible ({e})")
+            skipped += 1
+            continue
+
+        for source in args.sources:
+            if source not in available_sources:
+                print(f"⚠️ {extractor}/{source}: falta la biblioteca de extracción de PDF")
+                skipped += 1
+                continue
+
+            directory, extension = SOURCES[source]
+            budget = budget_for(budgets, extractor, source)
+            if args.max_seconds is not None:
+                budget["seconds"] = args.max_seconds
+            if args.max_memory_mib is not None:
+                budget["memory_mib"] = args.max_memory_mib
+
+            paths = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(extension))
+            for path in paths:
+                label = f"{extractor}/{source} · {os.path.basename(path)}"
+                try:
+                    with contextlib.redirect_stdout(quiet):
+                        result, seconds, peak_mib = run_document(run, path, not args.no_memory and not args.update)
+                except Exception as e:
+                    print(f"❌ {label}: error al extraer ({e})")
+                    failures += 1
+                    continue
+
+                reference = golden_path(extractor, path, args.golden, fallback=not args.update)
+                if args.update:
+                    os.makedirs(os.path.dirname(reference), exist_ok=True)
+                    with open(reference, 'w', encoding='utf-8') as file:
+                        json.dump(result, file, ensure_ascii=False, indent=2)
+                    print(f"💾 {label}: referencia guardada en {reference}")
+                    continue
+
+                problems = []
+                if not os.path.exists(reference):
+                    print(f"❌ {label}: sin referencia ({reference}); usa --update para crearla")
+                    failures += 1
+                    continue
+
+                with open(reference, 'r', encoding='utf-8') as file:
+                    differences = diff_values(comparable(json.load(file)), result)
+                for field, expected, actual in differences[:args.max_diffs]:
+                    problems.append(f"{field}: esperado {json.dumps(expected, ensure_ascii=False)[:80]}, "
+                                    f"obtenido {json.dumps(actual, ensure_ascii=False)[:80]}")
+                if len(differences) > args.max_diffs:
+                    problems.append(f"... y {len(differences) - args.max_diffs} diferencias más")
+
+                if seconds > budget["seconds"]:
+                    problems.append(f"tiempo {seconds:.3f} s > presupuesto {budget['seconds']:.3f} s")
+                if peak_mib is not None and peak_mib > budget["memory_mib"]:
+                    problems.append(f"memoria {peak_mib:.1f} MiB > presupuesto {budget['memory_mib']:.1f} MiB")
+
+                memory = f", {peak_mib:.1f} MiB" if peak_mib is not None else ""
+                if problems:
+                    failures += 1
+                    print(f"❌ {label} ({seconds:.3f} s{memory})")
+                    for problem in problems:
+                        print(f"   {problem}")
+                else:
+                    passed += 1
+                    print(f"✅ {label} ({seconds:.3f} s{memory})")
+
+    logging.disable(logging.NOTSET)
+    quiet.close()
+
+    if args.update:
+        return
+
+    problems = timeline_problems()
+    if problems:
+        failures += 1
+        print("❌ calendario de plazos · output/")
+        for problem in problems[:args.max_diffs]:
+            print(f"   {problem}")
+    else:
+        passed += 1
+        print("✅ calendario de plazos · output/")
+
+    print(f"\n{passed} correctos, {failures} fallos, {skipped} omitidos")
+    sys.exit(1 if failures or (args.strict and skipped) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Fechas y horas en el formato de las convocatorias.
+
+Los extractores guardan los plazos del Artículo 48 tal como aparecen en el texto
+("10 de mayo de 2024", "31  de  diciembre  de  2021"), y el inicio del plazo de
+solicitud ("desde el día 19 de marzo de 2024, a las 9,00") no se guardaba. Este módulo
+los convierte a fechas ISO 8601 ("2024-05-10T23:59:59") que se pueden ordenar y comparar
+como texto.
+
+- Las horas son hora peninsular (``Europe/Madrid``) y se guardan sin zona horaria.
+- Un plazo que termina un día sin hora ("hasta el 14 de octubre de 2021, inclusive") o
+  "a las 24,00" termina a las 23:59:59 de ese día; uno que empieza sin hora, a las 00:00.
+- ``extract_application_window``: inicio y fin del plazo general ("desde el día ... hasta
+  el ...").
+- ``annotate_deadlines``: añade a un resultado de ``extract_application_deadlines`` la
+  fecha ISO de cada plazo (``deadline_iso``) y el plazo general (``application_window``).
+"""
+
+import re
+import unicodedata
+from datetime import date, datetime, time
+from typing import Any, Dict, Optional
+
+import regex_engine
+
+MONTHS = {"enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6, "julio": 7,
+          "agosto": 8, "septiembre": 9, "setiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12}
+
+START_OF_DAY = time(0, 0, 0)
+END_OF_DAY = time(23, 59, 59)
+
+_DATE = r'(\d{1,2})\s+de\s+([a-zA-ZáéíóúÁÉÍÓÚñÑ]+)\s+(?:de|del)\s+(\d{4})'
+_DATE_WORDS = regex_engine.compile(_DATE, re.IGNORECASE)
+_DATE_NUMERIC = regex_engine.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')
+_TIME = regex_engine.compile(r'(\d{1,2})(?:[,.:](\d{2}))?')
+_HOUR = r'(?:\s*,?\s*a\s+las\s+(\d{1,2}(?:[,.:]\d{2})?))?'
+# "desde el día 19 de marzo de 2024, a las 9,00, hora peninsular, hasta el 10 de mayo de 2024, a las 15,00"
+_WINDOW = regex_engine.compile(
+    r'desde\s+el\s+(?:día\s+)?' + _DATE + _HOUR + r'[^.;]{0,80}?hasta\s+el\s+(?:día\s+)?' + _DATE + _HOUR,
+    re.IGNORECASE
+)
+
+
+def _month(name: str) -> Optional[int]:
+    """Número de mes a partir de su nombre, con o sin tildes ni mayúsculas."""
+    folded = ''.join(c for c in unicodedata.normalize('NFD', name.lower()) if unicodedata.category(c) != 'Mn')
+    return MONTHS.get(folded)
+
+
+def _make_date(day: str, month: Optional[int], year: str) -> Optional[date]:
+    if month is None:
+        return None
+    try:
+        return date(int(year), month, int(day))
+    except ValueError:
+        return None
+
+
+def parse_date(text: str) -> Optional[date]:
+    """
+    Primera fecha de un texto ("10 de mayo de 2024", "10/05/2024"), o None si no hay
+    ninguna fecha completa y válida.
+    """
+    if not text:
+        return None
+    match = _DATE_WORDS.search(text)
+    if match:
+        return _make_date(match.group(1), _month(match.group(2)), match.group(3))
+    match = _DATE_NUMERIC.search(text)
+    if match:
+        return _make_date(match.group(1), int(match.group(2)), match.group(3))
+    return None
+
+
+def parse_time(text: str) -> Optional[time]:
+    """Hora de la convocatoria ("9,00", "15.30", "24,00" = fin del día), o None."""
+    match = _TIME.match(text.strip()) if text else None
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if hour == 24 and minute == 0:
+        return END_OF_DAY
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+def to_iso(day: date, at: Optional[time] = None, end: bool = False) -> str:
+    """
+    Fecha y hora ISO 8601 sin zona horaria. Sin hora, el principio del día o, con
+    ``end``, su último segundo.
+    """
+    if at is None:
+        at = END_OF_DAY if end else START_OF_DAY
+    return datetime.combine(day, at).isoformat(timespec='seconds')
+
+
+def normalize_deadline(text: str, end: bool = True) -> Optional[str]:
+    """
+    Fecha ISO de un plazo escrito como en la convocatoria ("hasta el 12 de mayo de 2022,
+    a las 24,00"). Por defecto es el final del plazo; None si no contiene una fecha.
+    """
+    day = parse_date(text)
+    if day is None:
+        return None
+    hour = regex_engine.search(r'a\s+las\s+(\d{1,2}(?:[,.:]\d{2})?)', text, re.IGNORECASE)
+    return to_iso(day, parse_time(hour.group(1)) if hour else None, end)
+
+
+def extract_application_window(text: str) -> Optional[Dict[str, str]]:
+    """
+    Plazo general de solicitud ("desde el día ... hasta el ...") de un texto.
+
+    Returns:
+        Diccionario con ``start`` y ``end`` (ISO 8601) y ``description`` (el fragmento del
+        texto), o None si el texto no indica el inicio y el fin del plazo
+    """
+    if not text:
+        return None
+    # Los textos de pdfminer tienen espacios dobles y saltos de línea en mitad de la frase
+    flat = ' '.join(text.split())
+    match = _WINDOW.search(flat)
+    if not match:
+        return None
+    start = _make_date(match.group(1), _month(match.group(2)), match.group(3))
+    end = _make_date(match.group(5), _month(match.group(6)), match.group(7))
+    if start is None or end is None:
+        return None
+    return {
+        "start": to_iso(start, parse_time(match.group(4)) if match.group(4) else None),
+        "end": to_iso(end, parse_time(match.group(8)) if match.group(8) else None, end=True),
+        "description": match.group(0)
+    }
+
+
+def annotate_deadlines(result: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """
+    Añade las fechas ISO a un resultado de ``extract_application_deadlines``.
+
+    Cada plazo y el caso excepcional reciben ``deadline_iso`` si su fecha es completa, y
+    el resultado recibe ``application_window`` si el texto indica el plazo general. Un
+    plazo que termina el mismo día que el plazo general toma su hora de cierre.
+    """
+    window = extract_application_window(text)
+    if window is not None:
+        result["application_window"] = window
+
+    entries = list(result.get("deadlines", []))
+    if "exceptional_cases" in result:
+        entries.append(result["exceptional_cases"])
+    for entry in entries:
+        iso = normalize_deadline(entry.get("deadline", ""))
+        if iso is None:
+            continue
+        if window is not None and iso[:10] == window["end"][:10]:
+            iso = window["end"]
+        entry["deadline_iso"] = iso
+    return result
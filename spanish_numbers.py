@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Números e importes en el formato de las convocatorias.
+
+Un único intérprete para los importes y notas que capturan los extractores ("1.700,00",
+"8.843", "8,50", "1.700.00") y para los números escritos con palabras ("tres",
+"veintiún", "octavo"), en lugar de los ``replace`` y diccionarios de uno a ocho
+repartidos por cada extractor.
+
+- ``normalize_amount``: texto canónico con punto decimal y sin separador de miles
+  ("1.700,00" → "1700.00", "8.843" → "8843"). Es lo que guardan los extractores.
+- ``parse_amount``: valor numérico (NaN si no es interpretable), con un camino rápido
+  para los enteros sin separadores.
+- ``parse_amounts``: conversión por lotes a un array de NumPy (o ``array('d')`` si NumPy
+  no está instalado). Interpreta una sola vez cada texto distinto y convierte los
+  enteros sin separadores directamente en NumPy.
+- ``words_to_number`` / ``number_to_words``: números escritos con palabras, cardinales
+  hasta los millones y ordinales hasta el décimo.
+"""
+
+import re
+import math
+import unicodedata
+from array import array
+from typing import Any, Iterable, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Importe tal como aparece en el texto: con separador de miles ("1.700,00", "8.843",
+# "1.700.00") o con decimales ("300,00"). Para buscarlo delante de "euros" en los extractores
+AMOUNT_PATTERN = r'(\d{1,3}(?:\.\d{3})+(?:[,.]\d{1,2})?|\d+[,.]\d+)'
+
+_NON_NUMERIC = re.compile(r'[^\d.,]')
+_THOUSANDS_SUFFIX = re.compile(r'\.\d{3}$')
+
+_UNITS = ["cero", "uno", "dos", "tres", "cuatro", "cinco", "seis", "siete", "ocho", "nueve"]
+_TEENS = ["diez", "once", "doce", "trece", "catorce", "quince", "dieciséis", "diecisiete", "dieciocho",
+          "diecinueve", "veinte", "veintiuno", "veintidós", "veintitrés", "veinticuatro", "veinticinco",
+          "veintiséis", "veintisiete", "veintiocho", "veintinueve"]
+_TENS = ["", "", "", "treinta", "cuarenta", "cincuenta", "sesenta", "setenta", "ochenta", "noventa"]
+_HUNDREDS = ["", "ciento", "doscientos", "trescientos", "cuatrocientos", "quinientos", "seiscientos",
+             "setecientos", "ochocientos", "novecientos"]
+_ORDINALS = {"primer": 1, "primero": 1, "primera": 1, "segundo": 2, "segunda": 2, "tercer": 3, "tercero": 3,
+             "tercera": 3, "cuarto": 4, "cuarta": 4, "quinto": 5, "quinta": 5, "sexto": 6, "sexta": 6,
+             "septimo": 7, "septima": 7, "octavo": 8, "octava": 8, "noveno": 9, "novena": 9,
+             "decimo": 10, "decima": 10}
+
+
+def _strip_accents(text: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+
+
+def _word_values() -> dict:
+    """Palabra (sin tildes) → valor, para unidades, decenas y centenas."""
+    values = {_strip_accents(word): i for i, word in enumerate(_UNITS)}
+    values.update({"un": 1, "una": 1, "veintiun": 21, "veintiuna": 21, "cien": 100})
+    values.update({_strip_accents(word): 10 + i for i, word in enumerate(_TEENS)})
+    values.update({word: i * 10 for i, word in enumerate(_TENS) if word})
+    for i, word in enumerate(_HUNDREDS):
+        if word:
+            values[word] = i * 100
+            values[word[:-2] + "as"] = i * 100  # doscientas, trescientas...
+    return values
+
+
+_WORD_VALUES = _word_values()
+
+
+def words_to_number(text: str) -> Optional[int]:
+    """
+    Número escrito con palabras ("tres", "veintiún", "dos mil trescientos", "octavo"),
+    o con dígitos. None si el texto no es un número.
+    """
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+
+    tokens = _strip_accents(text.lower()).replace('-', ' ').split()
+    if len(tokens) == 1 and tokens[0] in _ORDINALS:
+        return _ORDINALS[tokens[0]]
+
+    total = current = 0
+    seen = False
+    for token in tokens:
+        if token == 'y':
+            continue
+        if token in _WORD_VALUES:
+            current += _WORD_VALUES[token]
+        elif token == 'mil':
+            total += (current or 1) * 1000
+            current = 0
+        elif token in ('millon', 'millones'):
+            total = (total + (current or 1)) * 1000000
+            current = 0
+        else:
+            return None
+        seen = True
+    return total + current if seen else None
+
+
+def number_to_words(number: int, apocope: bool = True) -> str:
+    """
+    Número con palabras. Con ``apocope`` se usa la forma que va delante de un nombre
+    ("un miembro", "veintiún miembros").
+    """
+    if number < 0:
+        return "menos " + number_to_words(-number, apocope)
+    if number >= 1000000:
+        millions, rest = divmod(number, 1000000)
+        head = "un millón" if millions == 1 else f"{number_to_words(millions)} millones"
+        return f"{head} {number_to_words(rest, apocope)}" if rest else head
+    if number >= 1000:
+        thousands, rest = divmod(number, 1000)
+        head = "mil" if thousands == 1 else f"{number_to_words(thousands)} mil"
+        return f"{head} {number_to_words(rest, apocope)}" if rest else head
+    if number >= 100:
+        hundreds, rest = divmod(number, 100)
+        if number == 100:
+            return "cien"
+        return f"{_HUNDREDS[hundreds]} {number_to_words(rest, apocope)}" if rest else _HUNDREDS[hundreds]
+    if number >= 30:
+        tens, unit = divmod(number, 10)
+        return f"{_TENS[tens]} y {number_to_words(unit, apocope)}" if unit else _TENS[tens]
+    if number >= 10:
+        return "veintiún" if number == 21 and apocope else _TEENS[number - 10]
+    return "un" if number == 1 and apocope else _UNITS[number]
+
+
+def normalize_amount(raw: Any) -> Optional[str]:
+    """
+    Importe o nota capturados en texto canónico, con punto decimal y sin separador de
+    miles. Devuelve None si no contiene ningún dígito.
+
+    "1.700,00" → "1700.00"; "8.843" → "8843"; "8,50" → "8.50"; "1.700.00" → "1700.00".
+    """
+    if raw is None:
+        return None
+    text = str(raw)
+    if text.isdigit():
+        return text
+
+    cleaned = _NON_NUMERIC.sub('', text)
+    if not any(c.isdigit() for c in cleaned):
+        return None
+    if ',' in cleaned:
+        return cleaned.replace('.', '').replace(',', '.')
+    if cleaned.count('.') > 1 or _THOUSANDS_SUFFIX.search(cleaned):
+        # Puntos de miles, con o sin dos decimales al final ("1.700.00", "8.843")
+        head, _, tail = cleaned.rpartition('.')
+        return head.replace('.', '') + ('.' + tail if len(tail) == 2 else tail)
+    return cleaned
+
+
+def parse_amount(raw: Any) -> float:
+    """Valor de un importe o número con palabras (NaN si no es interpretable)."""
+    if raw is None or raw == '':
+        return math.nan
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    if raw.isdigit():
+        return float(raw)
+
+    normalized = normalize_amount(raw)
+    if normalized is None:
+        value = words_to_number(raw)
+        return math.nan if value is None else float(value)
+    try:
+        return float(normalized)
+    except ValueError:
+        return math.nan
+
+
+def parse_amounts(values: Iterable[Any]):
+    """
+    Convierte una colección de importes capturados en un array de valores (NaN donde no
+    son interpretables).
+
+    Returns:
+        ``numpy.ndarray`` de ``float64`` con la forma de la entrada, o ``array('d')`` si
+        NumPy no está instalado
+    """
+    if not NUMPY_AVAILABLE:
+        return array('d', (parse_amount(value) for value in values))
+
+    data = np.asarray(['' if value is None else str(value) for value in values]
+                      if not isinstance(values, np.ndarray) else values.astype(str))
+    if data.size == 0:
+        return np.empty(data.shape, dtype=np.float64)
+
+    # Cada texto distinto se interpreta una sola vez; los importes se repiten mucho entre
+    # documentos y entre umbrales
+    uniques, inverse = np.unique(data.ravel(), return_inverse=True)
+    parsed = np.full(uniques.shape, np.nan)
+    plain = np.char.isdigit(uniques)
+    parsed[plain] = uniques[plain].astype(np.float64)
+    for i in np.flatnonzero(~plain):
+        parsed[i] = parse_amount(str(uniques[i]))
+    return parsed[inverse].reshape(data.shape)
+
+
+def format_amount(value: float, decimals: bool = True) -> str:
+    """Importe con el formato de las convocatorias ('1.700,00' o '8.843')."""
+    integer, cents = divmod(round(value * 100), 100)
+    text = f"{integer:,}".replace(',', '.')
+    return f"{text},{cents:02d}" if decimals else text
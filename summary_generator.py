@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Etapa de generación de resúmenes abstractivos a partir de los datos extraídos.
+
+Sobre el JSON de cada convocatoria se construye una entrada compacta y determinista
+que se envía a un backend de generación. Los backends implementan una interfaz común
+(``GeneratorBackend``), reciben las entradas por lotes de varios documentos y sus
+resultados se guardan en una caché en disco indexada por el hash de la entrada, de
+modo que volver a generar un curso que no ha cambiado no tiene coste.
+
+Backends disponibles:
+- ``local``: generador determinista sin dependencias, útil para pruebas
+- ``transformers``: modelo seq2seq local de Hugging Face (opcional)
+
+Uso:
+python summary_generator.py -i output/becas_datos.json -o output/resumenes --backend local
+"""
+
+import os
+import json
+import hashlib
+import logging
+import argparse
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from models import as_document, load_documents
+from article_index import ArticleIndex
+from prompt_compaction import DEFAULT_TOKEN_BUDGET, compact_document
+
+logger = logging.getLogger("SummaryGenerator")
+
+# Backend opcional basado en transformers
+try:
+    from transformers import pipeline
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+PROMPT_HEADER = "Resume la siguiente convocatoria de becas en español:\n"
+
+
+def build_generator_input(data: Any, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """
+    Construye la entrada compacta y determinista del generador para un documento.
+
+    Se excluyen los textos completos de los artículos y los metadatos que cambian en
+    cada ejecución (fecha de extracción), de forma que el mismo documento produce
+    siempre la misma entrada (ver ``prompt_compaction.compact_document``).
+    """
+    return compact_document(data, token_budget).text
+
+
+class GeneratorBackend(ABC):
+    """Interfaz de los backends de generación de resúmenes."""
+
+    #: Nombre del backend (forma parte de la clave de caché)
+    name = "base"
+
+    @property
+    def model_id(self) -> str:
+        """Identificador del modelo; las entradas de caché de modelos distintos no se mezclan."""
+        return self.name
+
+    @abstractmethod
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Genera un resumen por cada entrada del lote, en el mismo orden."""
+
+
+class LocalBackend(GeneratorBackend):
+    """
+    Backend determinista sin modelo.
+
+    Redacta un párrafo a partir de las líneas clave-valor de la entrada. Sirve como
+    sustituto del modelo en pruebas y entornos sin GPU: la misma entrada produce
+    siempre el mismo texto.
+    """
+
+    name = "local"
+
+    def __init__(self, max_items: int = 4):
+        self.max_items = max_items
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        return [self._summarize(prompt) for prompt in prompts]
+
+    def _summarize(self, prompt: str) -> str:
+        groups: Dict[str, List[str]] = {}
+        year = "N/A"
+        for line in prompt.splitlines():
+            if line.startswith("curso: "):
+                year = line[len("curso: "):]
+                continue
+            if " | " not in line:
+                continue
+            group, value = line.split(" | ", 1)
+            groups.setdefault(group, []).append(value)
+
+        sentences = [f"La convocatoria del curso {year} recoge"]
+        amounts = groups.get("cuantía", [])
+        if amounts:
+            sentences.append(f" {len(amounts)} cuantías ({'; '.join(amounts[:self.max_items])})")
+        else:
+            sentences.append(" cuantías no identificadas")
+
+        thresholds = [g for g in groups if g.startswith("umbral ")]
+        if thresholds:
+            sentences.append(f" y {len(thresholds)} {'umbral' if len(thresholds) == 1 else 'umbrales'} de renta")
+        sentences.append(".")
+
+        deadlines = groups.get("plazo", [])
+        if deadlines:
+            sentences.append(f" Plazos: {'; '.join(deadlines[:self.max_items])}.")
+
+        requirements = groups.get("requisito", [])
+        if requirements:
+            sentences.append(f" Incluye {len(requirements)} requisitos académicos.")
+
+        context = groups.get("contexto", [])
+        if context:
+            sentences.append(f" Según el texto de la convocatoria, {context[0].split(': ', 1)[-1]}")
+
+        return "".join(sentences)
+
+
+class TransformersBackend(GeneratorBackend):
+    """Backend basado en un modelo seq2seq local de Hugging Face."""
+
+    name = "transformers"
+
+    def __init__(self, model: str = "google/mt5-small", batch_size: int = 8,
+                 max_new_tokens: int = 256, device: int = -1):
+        if not TRANSFORMERS_AVAILABLE:
+            raise RuntimeError("transformers no está instalado. Instálalo con 'pip install transformers'")
+        self.model = model
+        self.batch_size = batch_size
+        self.max_new_tokens = max_new_tokens
+        self._pipeline = pipeline("text2text-generation", model=model, device=device)
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.name}:{self.model}"
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        outputs = self._pipeline([PROMPT_HEADER + prompt for prompt in prompts],
+                                 batch_size=self.batch_size,
+                                 max_new_tokens=self.max_new_tokens)
+        return [output['generated_text'].strip() for output in outputs]
+
+
+BACKENDS = {
+    LocalBackend.name: LocalBackend,
+    TransformersBackend.name: TransformersBackend
+}
+
+
+class SummaryCache:
+    """Caché en disco de resúmenes generados, indexada por el SHA-256 de modelo y entrada."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(model_id: str, prompt: str) -> str:
+        """Calcula la clave de caché de una entrada para un modelo."""
+        return hashlib.sha256(f"{model_id}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Devuelve el resumen guardado para una clave, o None si no existe."""
+        try:
+            with open(self.path_for(key), 'r', encoding='utf-8') as file:
+                return json.load(file)['summary']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, summary: str) -> None:
+        """Guarda un resumen con escritura atómica."""
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({"summary": summary}, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class SummaryGenerator:
+    """Genera resúmenes por lotes reutilizando los ya generados para las mismas entradas."""
+
+    def __init__(self, backend: GeneratorBackend, cache: Optional[SummaryCache] = None,
+                 batch_size: int = 8, token_budget: int = DEFAULT_TOKEN_BUDGET):
+        """
+        Inicializa el generador.
+
+        Args:
+            backend: Backend de generación
+            cache: Caché de resúmenes (None para no usar caché)
+            batch_size: Número de documentos que se envían juntos al backend
+            token_budget: Presupuesto de tokens de la entrada de cada documento
+        """
+        self.backend = backend
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.token_budget = token_budget
+        self.cache_hits = 0
+        self.generated = 0
+
+    def generate(self, documents: Iterable[Any], query: Optional[str] = None,
+                 index: Optional[ArticleIndex] = None, context_budget: int = 200) -> List[str]:
+        """
+        Devuelve un resumen por documento, en el mismo orden que la entrada.
+
+        Si se indican una consulta y un índice de artículos, la entrada de cada documento
+        incluye además los fragmentos de ese curso más relevantes para la consulta.
+        """
+        prompts = []
+        for document in documents:
+            prompt = build_generator_input(document, self.token_budget)
+            if query and index is not None:
+                year = as_document(document).academic_year
+                context = index.build_context(query, context_budget, year=year)
+                prompt = "\n".join([prompt] + [f"contexto | {chunk.article} {chunk.apartado}: {chunk.text}"
+                                                for chunk in context])
+            prompts.append(prompt)
+        return self.generate_from_inputs(prompts)
+
+    def generate_from_inputs(self, prompts: List[str]) -> List[str]:
+        """Genera los resúmenes de entradas ya compactadas."""
+        summaries: List[Optional[str]] = [None] * len(prompts)
+        pending: Dict[str, List[int]] = {}
+
+        # Consultar la caché y agrupar las entradas repetidas
+        for index, prompt in enumerate(prompts):
+            key = SummaryCache.key_for(self.backend.model_id, prompt)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                summaries[index] = cached
+                self.cache_hits += 1
+            else:
+                pending.setdefault(key, []).append(index)
+
+        # Generar el resto por lotes
+        keys = list(pending)
+        for batch_keys in _batches(keys, self.batch_size):
+            batch_prompts = [prompts[pending[key][0]] for key in batch_keys]
+            outputs = self.backend.generate_batch(batch_prompts)
+            for key, summary in zip(batch_keys, outputs):
+                if self.cache is not None:
+                    self.cache.put(key, summary)
+                for index in pending[key]:
+                    summaries[index] = summary
+            self.generated += len(batch_keys)
+
+        logger.info(f"Resúmenes generados: {self.generated}, recuperados de caché: {self.cache_hits}")
+        return summaries
+
+
+def _batches(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Divide una lista en lotes consecutivos."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def create_backend(name: str, **kwargs) -> GeneratorBackend:
+    """Crea un backend por nombre."""
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {name}. Disponibles: {', '.join(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
+
+
+def main():
+    """Genera los resúmenes abstractivos de un fichero de resultados."""
+    parser = argparse.ArgumentParser(description='Genera resúmenes abstractivos de los datos de becas extraídos')
+    parser.add_argument('--input', '-i', type=str, required=True, help='Fichero JSON o NDJSON con los resultados')
+    parser.add_argument('--output', '-o', type=str, default='./output/resumenes', help='Directorio de salida')
+    parser.add_argument('--backend', type=str, default='local', choices=sorted(BACKENDS), help='Backend de generación')
+    parser.add_argument('--model', type=str, default=None, help='Modelo del backend transformers')
+    parser.add_argument('--batch-size', type=int, default=8, help='Documentos por lote')
+    parser.add_argument('--token-budget', type=int, default=DEFAULT_TOKEN_BUDGET,
+                        help='Presupuesto de tokens de la entrada de cada documento')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Directorio de la caché de resúmenes (por defecto <output>/cache)')
+    parser.add_argument('--no-cache', action='store_true', help='No usar la caché de resúmenes')
+    parser.add_argument('--query', type=str, default=None,
+                        help='Tema del resumen; añade a la entrada los fragmentos de artículos más relevantes')
+    parser.add_argument('--index', type=str, default='./output/indice_articulos.json',
+                        help='Índice de artículos creado con article_index.py (se usa con --query)')
+    parser.add_argument('--context-budget', type=int, default=200,
+                        help='Presupuesto de tokens de los fragmentos de contexto')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    os.makedirs(args.output, exist_ok=True)
+
+    backend_kwargs = {}
+    if args.backend == TransformersBackend.name:
+        backend_kwargs['batch_size'] = args.batch_size
+        if args.model:
+            backend_kwargs['model'] = args.model
+    backend = create_backend(args.backend, **backend_kwargs)
+
+    cache = None if args.no_cache else SummaryCache(args.cache_dir or os.path.join(args.output, 'cache'))
+    generator = SummaryGenerator(backend, cache, batch_size=args.batch_size, token_budget=args.token_budget)
+
+    documents = [document for document in load_documents(args.input) if document.valid]
+    index = ArticleIndex.load(args.index) if args.query else None
+    summaries = generator.generate(documents, args.query, index, args.context_budget)
+
+    for document, summary in zip(documents, summaries):
+        # El nombre del fichero de origen evita que dos documentos del mismo curso se pisen
+        year = (document.academic_year or 'sin_curso').replace('/', '-')
+        stem = os.path.splitext(os.path.basename(document.file_name))[0] or 'documento'
+        output_path = os.path.join(args.output, f"resumen_generado_{year}_{stem}.md")
+        with open(output_path, 'w', encoding='utf-8') as file:
+            file.write(f"# Resumen de la convocatoria {document.academic_year or ''}\n\n{summary}\n")
+
+    print(f"Resúmenes escritos en {args.output}: {generator.generated} generados, "
+          f"{generator.cache_hits} desde caché")
+
+
+if __name__ == "__main__":
+    main()
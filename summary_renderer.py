@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Renderizado en streaming de los resúmenes Markdown de las convocatorias de becas.
+
+Cada resumen se genera como una secuencia de fragmentos de texto a partir de
+plantillas precompiladas, en lugar de concatenar cadenas con ``+=``. Los fragmentos
+pueden escribirse directamente en un fichero (``write_summary``) o unirse con
+``"".join(...)``, de modo que el coste es lineal en el tamaño del resumen.
+
+Hay tres variantes, equivalentes a las funciones originales:
+- ``iter_corpus_summary``: resumen general de ``pymupdf_extractor.generate_summary``
+- ``iter_articles_summary``: resumen por artículos de ``BecasExtractor.generate_summary``
+- ``iter_individual_summary``: resumen de un documento de ``generate_individual_summary``
+"""
+
+from typing import Dict, List, Any, Iterable, Iterator, Optional, TextIO
+
+from models import as_dict
+from text_cache import TextCache, resolve_article
+from year_diff import YearDiff
+
+# Plantillas precompiladas (métodos format ya enlazados)
+TITLE = "# {}\n\n".format
+SECTION = "## {}\n\n".format
+SUBSECTION = "### {}\n\n".format
+PARAGRAPH = "{}\n\n".format
+BULLET = "- {}\n".format
+BOLD_BULLET = "- **{}**: {}\n".format
+CODE_BLOCK = "```\n{}\n```\n\n".format
+SPECIAL_CASE = "**Caso especial**: {}\n\n".format
+FORMULA_NOTE = "**Nota**: {}\n\n".format
+ADDITIONAL_INFO = "\n*{}*\n".format
+EXCEPTIONAL_CASES = "\n**Casos excepcionales**: {}\n".format
+YEAR_AMOUNT = "- **{}**: {} euros\n".format
+BLANK = "\n"
+
+NO_DOCUMENTS = "# Resumen de Becas Educativas\n\nNo se encontraron documentos válidos para analizar."
+MAIN_TITLE = "Resumen de Becas Educativas del Ministerio de Educación y Formación Profesional"
+
+FINAL_NOTES = (
+    "## Notas Adicionales\n\n"
+    "- La concesión de las becas está sujeta al cumplimiento de requisitos académicos y económicos establecidos en la convocatoria.\n"
+    "- Las solicitudes deben presentarse dentro de los plazos establecidos, aunque no coincidan con el plazo de matrícula.\n"
+    "- Para información completa, consulte la convocatoria oficial publicada en el Boletín Oficial del Estado.\n"
+)
+
+
+def write_summary(chunks: Iterable[str], file: TextIO) -> int:
+    """Escribe los fragmentos de un resumen en un fichero abierto y devuelve los caracteres escritos."""
+    written = 0
+    for chunk in chunks:
+        file.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def _sorted_valid(data: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Filtra los documentos válidos y los ordena por año académico."""
+    valid_data = [item for item in map(as_dict, data) if item.get('valid', False)]
+    return sorted(valid_data, key=lambda x: (x.get('academic_year') or {}).get('year', ''))
+
+
+def _iter_study_list(studies: List[Dict[str, Any]], with_identifier: bool = False) -> Iterator[str]:
+    """Lista de estudios elegibles."""
+    for study in studies:
+        if with_identifier:
+            yield BULLET(f"{study.get('identifier', '')} {study.get('description', '')}")
+        else:
+            yield BULLET(study.get('description', ''))
+    yield BLANK
+
+
+def _iter_fixed_types(scholarship_types: Dict[str, Any]) -> Iterator[str]:
+    """Cuantías fijas y variable del Artículo 4."""
+    if 'fixed_amounts' in scholarship_types and scholarship_types['fixed_amounts']:
+        yield SUBSECTION("Cuantías Fijas")
+        for type_info in scholarship_types['fixed_amounts']:
+            yield BULLET(type_info.get('type', ''))
+        yield BLANK
+
+    if 'variable_amount' in scholarship_types and 'description' in scholarship_types['variable_amount']:
+        yield SUBSECTION("Cuantía Variable")
+        yield PARAGRAPH(scholarship_types['variable_amount']['description'])
+
+
+def _iter_components(components: List[Dict[str, Any]], with_identifier: bool = False,
+                     with_formula: bool = False) -> Iterator[str]:
+    """Componentes de la beca con sus cuantías, rangos y casos especiales."""
+    for component in components:
+        component_type = component.get('type', '')
+        if with_identifier:
+            yield SUBSECTION(f"{component.get('identifier', '')} {component_type}")
+        else:
+            yield SUBSECTION(component_type)
+
+        if 'amount_description' in component:
+            yield PARAGRAPH(component['amount_description'])
+
+        # Para componentes con rangos (como la excelencia académica)
+        if 'ranges' in component:
+            for range_info in component['ranges']:
+                yield BULLET(range_info.get('description', ''))
+            yield BLANK
+
+        # Para casos especiales (como la beca básica para grado básico)
+        if 'special_case' in component:
+            yield SPECIAL_CASE(component['special_case'].get('description', ''))
+
+        # Para componentes con fórmulas (como la cuantía variable)
+        if with_formula and 'formula_description' in component:
+            yield FORMULA_NOTE(component['formula_description'])
+
+
+def _iter_thresholds(thresholds: List[Dict[str, Any]]) -> Iterator[str]:
+    """Umbrales de renta con el límite para cada tamaño de familia."""
+    for threshold in thresholds:
+        yield SUBSECTION(f"Umbral {threshold.get('number', '')}")
+
+        for family_size in threshold.get('family_sizes', []):
+            yield BULLET(family_size.get('description', ''))
+
+        if 'additional_info' in threshold:
+            yield ADDITIONAL_INFO(threshold['additional_info'].get('description', ''))
+
+        yield BLANK
+
+
+def _iter_requirements(requirements: List[Dict[str, Any]]) -> Iterator[str]:
+    """Requisitos académicos agrupados por tipo."""
+    requirements_by_type = {}
+    for req in requirements:
+        requirements_by_type.setdefault(req.get('type', 'Otros'), []).append(req)
+
+    for req_type, reqs in requirements_by_type.items():
+        yield SUBSECTION(req_type)
+        for req in reqs:
+            yield BULLET(req.get('description', ''))
+        yield BLANK
+
+
+def _iter_deadlines(application_deadlines: Dict[str, Any]) -> Iterator[str]:
+    """Plazos de solicitud y casos excepcionales."""
+    for deadline in application_deadlines.get('deadlines', []):
+        yield BOLD_BULLET(deadline.get('type', ''), deadline.get('description', ''))
+
+    if 'exceptional_cases' in application_deadlines:
+        yield EXCEPTIONAL_CASES(application_deadlines['exceptional_cases'].get('description', ''))
+
+    yield BLANK
+
+
+def _iter_evolution(diff: YearDiff) -> Iterator[str]:
+    """Comparación de cuantías y umbrales entre cursos académicos."""
+    yield SECTION("Evolución de las Becas")
+    yield PARAGRAPH("Comparación de las cuantías y requisitos a lo largo de los diferentes cursos académicos:")
+
+    sections = [
+        ("Evolución de la Beca Básica", diff.component('Beca básica')),
+        ("Evolución de la Cuantía Ligada a la Renta", diff.component('Cuantía fija ligada a la renta')),
+        ("Evolución del Umbral 1 de Renta (Familia de 4 miembros)", diff.threshold(1, 4))
+    ]
+
+    for title, series in sections:
+        points = diff.points(series)
+        if len(points) > 1:
+            yield SUBSECTION(title)
+            for year, amount in points:
+                yield YEAR_AMOUNT(year, amount)
+            yield BLANK
+
+
+def iter_corpus_summary(data: Iterable[Any]) -> Iterator[str]:
+    """Resumen general del corpus (formato de ``pymupdf_extractor.generate_summary``)."""
+    sorted_data = _sorted_valid(data)
+
+    if not sorted_data:
+        yield NO_DOCUMENTS
+        return
+
+    # Obtener el documento más reciente para el resumen principal
+    latest_data = sorted_data[-1]
+
+    yield TITLE(MAIN_TITLE)
+
+    # Sección de información general
+    academic_year = latest_data.get('academic_year', {})
+    if academic_year:
+        yield SECTION("Información General")
+        yield PARAGRAPH(academic_year.get('description', ''))
+
+    # Sección de estudios elegibles
+    eligible_studies = latest_data.get('eligible_studies', {})
+    if eligible_studies:
+        yield SECTION("Estudios Elegibles")
+        yield PARAGRAPH(eligible_studies.get('description', ''))
+
+        if 'non_university_studies' in eligible_studies and eligible_studies['non_university_studies']:
+            yield SUBSECTION("Estudios No Universitarios")
+            if 'non_university_section' in eligible_studies:
+                yield PARAGRAPH(eligible_studies['non_university_section'])
+            yield from _iter_study_list(eligible_studies['non_university_studies'])
+
+        if 'university_studies' in eligible_studies and eligible_studies['university_studies']:
+            yield SUBSECTION("Estudios Universitarios")
+            if 'university_section' in eligible_studies:
+                yield PARAGRAPH(eligible_studies['university_section'])
+            yield from _iter_study_list(eligible_studies['university_studies'])
+
+    # Sección de cuantías de las becas
+    scholarship_amounts = latest_data.get('scholarship_amounts', {})
+    if scholarship_amounts:
+        yield SECTION("Cuantías de las Becas")
+        yield PARAGRAPH(scholarship_amounts.get('description', ''))
+        if 'introduction' in scholarship_amounts:
+            yield PARAGRAPH(scholarship_amounts['introduction'])
+        yield from _iter_components(scholarship_amounts.get('components', []), with_formula=True)
+
+    # Sección de umbrales de renta
+    income_thresholds = latest_data.get('income_thresholds', {})
+    if income_thresholds:
+        yield SECTION("Umbrales de Renta Familiar")
+        yield PARAGRAPH(income_thresholds.get('description', ''))
+        if 'introduction' in income_thresholds:
+            yield PARAGRAPH(income_thresholds['introduction'])
+        yield from _iter_thresholds(income_thresholds.get('thresholds', []))
+
+    # Sección de plazos de solicitud
+    application_deadlines = latest_data.get('application_deadlines', {})
+    if application_deadlines:
+        yield SECTION("Plazos de Solicitud")
+        yield PARAGRAPH(application_deadlines.get('description', ''))
+        if 'introduction' in application_deadlines:
+            yield PARAGRAPH(application_deadlines['introduction'])
+        yield from _iter_deadlines(application_deadlines)
+
+    # Sección de requisitos académicos
+    academic_requirements = latest_data.get('academic_requirements', {})
+    if academic_requirements:
+        yield SECTION("Requisitos Académicos")
+        yield PARAGRAPH(academic_requirements.get('description', ''))
+        yield from _iter_requirements(academic_requirements.get('requirements', []))
+
+    # Comparación entre años (si hay más de un año)
+    if len(sorted_data) > 1:
+        yield from _iter_evolution(YearDiff.build(sorted_data))
+
+    yield FINAL_NOTES
+
+
+def iter_articles_summary(data: Iterable[Any]) -> Iterator[str]:
+    """Resumen general por artículos (formato de ``BecasExtractor.generate_summary``)."""
+    sorted_data = _sorted_valid(data)
+
+    if not sorted_data:
+        yield NO_DOCUMENTS
+        return
+
+    latest_data = sorted_data[-1]
+
+    yield TITLE(MAIN_TITLE)
+
+    academic_year = latest_data.get('academic_year', {})
+    if academic_year:
+        yield SECTION("Información General")
+        yield PARAGRAPH(academic_year.get('description', ''))
+
+    # Artículo 3
+    eligible_studies = latest_data.get('eligible_studies', {})
+    if eligible_studies:
+        yield SECTION("Artículo 3: Estudios Elegibles")
+        if 'non_university_studies' in eligible_studies and eligible_studies['non_university_studies']:
+            yield SUBSECTION("Estudios No Universitarios")
+            yield from _iter_study_list(eligible_studies['non_university_studies'])
+        if 'university_studies' in eligible_studies and eligible_studies['university_studies']:
+            yield SUBSECTION("Estudios Universitarios")
+            yield from _iter_study_list(eligible_studies['university_studies'])
+
+    # Artículo 4
+    scholarship_types = latest_data.get('scholarship_types', {})
+    if scholarship_types:
+        yield SECTION("Artículo 4: Clases y Cuantías de las Becas")
+        yield from _iter_fixed_types(scholarship_types)
+
+    # Artículo 11
+    scholarship_amounts = latest_data.get('scholarship_amounts', {})
+    if scholarship_amounts and 'components' in scholarship_amounts:
+        yield SECTION("Artículo 11: Cuantías de las Becas")
+        yield from _iter_components(scholarship_amounts.get('components', []))
+
+    # Artículo 19
+    income_thresholds = latest_data.get('income_thresholds', {})
+    if income_thresholds and 'thresholds' in income_thresholds:
+        yield SECTION("Artículo 19: Umbrales de Renta Familiar")
+        yield from _iter_thresholds(income_thresholds.get('thresholds', []))
+
+    # Artículo 24
+    academic_requirements = latest_data.get('academic_requirements', {})
+    if academic_requirements and 'requirements' in academic_requirements:
+        yield SECTION("Artículo 24: Requisitos Académicos")
+        yield from _iter_requirements(academic_requirements.get('requirements', []))
+
+    # Artículo 48
+    application_deadlines = latest_data.get('application_deadlines', {})
+    if application_deadlines and 'deadlines' in application_deadlines:
+        yield SECTION("Artículo 48: Plazos de Solicitud")
+        yield from _iter_deadlines(application_deadlines)
+
+
+def iter_individual_summary(data: Any, index: int, text_cache: Optional[TextCache] = None) -> Iterator[str]:
+    """Resumen de un solo documento con el texto de cada artículo (formato de ``generate_individual_summary``)."""
+    data = as_dict(data)
+
+    if not data.get('valid', False):
+        yield f"# Resumen de Beca #{index}\n\nEl documento no contiene datos válidos de convocatoria de becas."
+        return
+
+    yield TITLE(f"Resumen de Beca #{index}: {data.get('file_name', '')}")
+
+    academic_year = data.get('academic_year', {})
+    if academic_year:
+        yield SECTION("Información General")
+        yield PARAGRAPH(academic_year.get('description', ''))
+
+    def article_block(key: str) -> Iterator[str]:
+        # Incluir texto completo del artículo si está disponible
+        article_text = resolve_article(data.get(key), text_cache)
+        if article_text:
+            yield CODE_BLOCK(article_text)
+
+    # Artículo 3
+    eligible_studies = data.get('eligible_studies', {})
+    if eligible_studies:
+        yield SECTION("Artículo 3: Estudios Elegibles")
+        yield from article_block('article_3')
+        if 'non_university_studies' in eligible_studies and eligible_studies['non_university_studies']:
+            yield SUBSECTION("Estudios No Universitarios")
+            yield from _iter_study_list(eligible_studies['non_university_studies'], with_identifier=True)
+        if 'university_studies' in eligible_studies and eligible_studies['university_studies']:
+            yield SUBSECTION("Estudios Universitarios")
+            yield from _iter_study_list(eligible_studies['university_studies'], with_identifier=True)
+
+    # Artículo 4
+    scholarship_types = data.get('scholarship_types', {})
+    if scholarship_types:
+        yield SECTION("Artículo 4: Clases y Cuantías de las Becas")
+        yield from article_block('article_4')
+        yield from _iter_fixed_types(scholarship_types)
+
+    # Artículo 11
+    scholarship_amounts = data.get('scholarship_amounts', {})
+    if scholarship_amounts and 'components' in scholarship_amounts:
+        yield SECTION("Artículo 11: Cuantías de las Becas")
+        yield from article_block('article_11')
+        yield from _iter_components(scholarship_amounts.get('components', []), with_identifier=True)
+
+    # Artículo 19
+    income_thresholds = data.get('income_thresholds', {})
+    if income_thresholds and 'thresholds' in income_thresholds:
+        yield SECTION("Artículo 19: Umbrales de Renta Familiar")
+        yield from article_block('article_19')
+        yield from _iter_thresholds(income_thresholds.get('thresholds', []))
+
+    # Artículo 24
+    academic_requirements = data.get('academic_requirements', {})
+    if academic_requirements and 'requirements' in academic_requirements:
+        yield SECTION("Artículo 24: Requisitos Académicos")
+        yield from article_block('article_24')
+        yield from _iter_requirements(academic_requirements.get('requirements', []))
+
+    # Artículo 48
+    application_deadlines = data.get('application_deadlines', {})
+    if application_deadlines and 'deadlines' in application_deadlines:
+        yield SECTION("Artículo 48: Plazos de Solicitud")
+        yield from article_block('article_48')
+        yield from _iter_deadlines(application_deadlines)
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Generador de convocatorias sintéticas con el formato del BOE para pruebas de carga.
+
+Cada documento parte de uno de los textos reales de ``corpus_txt/`` (la plantilla) y
+sustituye los artículos que analizan los extractores por versiones generadas:
+- Artículo 3: listas de enseñanzas de longitud aleatoria
+- Artículo 11: cuantías aleatorias de cada componente y tramos de excelencia
+- Artículo 19: umbrales de renta aleatorios, en formato tradicional (una línea por
+  tamaño de familia) o de tabla (columnas por umbral, como a partir de 2024-2025)
+- Artículo 24: porcentajes de créditos por rama, en lista o en tabla
+- Artículo 48: fechas del plazo de solicitud
+El resto del texto de la plantilla se conserva, con los años desplazados al curso
+generado, y se intercalan pies de página como los de los PDFs reales.
+
+Junto a cada documento se escribe su verdad de referencia en ``gold/<documento>.json``
+con el formato de ``evaluate_backends.py``, de modo que el mismo corpus sirve para pruebas
+de carga y para validar la extracción. Con PyMuPDF instalado también se genera el PDF.
+
+Uso:
+python synthetic_corpus.py --count 10000 --output synthetic --seed 1 --workers 8
+python evaluate_backends.py --source txt --input synthetic/txt --gold synthetic/gold
+"""
+
+import os
+import re
+import json
+import random
+import argparse
+from multiprocessing import Pool
+from typing import Dict, List, Any, Tuple
+
+from spanish_numbers import format_amount, number_to_words
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+ARTICLE_TITLES = {
+    3: 'Enseñanzas comprendidas',
+    11: 'Cuantías de las becas',
+    19: 'Umbrales de renta',
+    24: 'Rendimiento académico en el curso anterior',
+    48: 'Lugar y plazo de presentación de solicitudes'
+}
+THRESHOLD_LAYOUTS = ('traditional', 'table')
+REQUIREMENT_LAYOUTS = ('list', 'table')
+
+NON_UNIVERSITY_STUDIES = [
+    "Primer y segundo cursos de bachillerato.",
+    "Formación Profesional de grado medio y de grado superior, incluidos los estudios de formación "
+    "profesional realizados en los centros docentes militares.",
+    "Enseñanzas artísticas profesionales.",
+    "Enseñanzas deportivas.",
+    "Enseñanzas artísticas superiores.",
+    "Estudios religiosos superiores.",
+    "Estudios de idiomas realizados en escuelas oficiales de titularidad de las administraciones "
+    "educativas, incluida la modalidad de distancia.",
+    "Cursos de acceso y cursos de preparación para las pruebas de acceso a la formación profesional "
+    "y cursos de formación específicos para el acceso a los ciclos formativos de grado medio y de "
+    "grado superior impartidos en centros públicos y en centros privados concertados que tengan "
+    "autorizadas enseñanzas de formación profesional.",
+    "Ciclos Formativos de Grado Básico."
+]
+UNIVERSITY_STUDIES = [
+    "Enseñanzas universitarias conducentes a títulos oficiales de grado y de máster, incluidos los "
+    "estudios de grado y máster cursados en los centros universitarios de la defensa y de la guardia civil.",
+    "Curso de preparación para acceso a la universidad de mayores de 25 años impartido por "
+    "universidades públicas.",
+    "Complementos de formación para acceso u obtención del título de máster y créditos "
+    "complementarios para la obtención del título de grado."
+]
+AREAS = ["Artes y Humanidades", "Ciencias", "Ciencias Sociales y Jurídicas", "Ciencias de la Salud",
+         "Ingeniería o Arquitectura"]
+MONTHS = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre",
+          "octubre", "noviembre", "diciembre"]
+
+# Valores de referencia del curso 2022-2023, sobre los que se generan variaciones
+BASE_THRESHOLDS = [
+    [8422, 12632, 16843, 21054, 24423, 27791, 31160, 34529, 3368],
+    [13236, 22594, 30668, 36421, 40708, 43945, 47146, 50333, 3181],
+    [14112, 24089, 32697, 38831, 43402, 46853, 50267, 53665, 3391]
+]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+LINE_WIDTH = 95
+
+
+def _wrap(text: str, indent: str = "") -> List[str]:
+    """Parte un párrafo en líneas del ancho aproximado de los PDFs."""
+    lines, current = [], indent
+    for word in text.split():
+        if len(current) + len(word) + 1 > LINE_WIDTH and current.strip():
+            lines.append(current.rstrip() + "  ")
+            current = ""
+        current += word + " "
+    lines.append(current.rstrip() + "  ")
+    return lines
+
+
+def _footer(rng: random.Random, page: int, date: str) -> List[str]:
+    """Pie de página con código seguro de verificación, como los de los PDFs del ministerio."""
+    code = '-'.join(f"{rng.randrange(16 ** 4):04x}" for _ in range(8))
+    return [f"{page}  ", "", f"CSV : GEN-{code}", "",
+            "DIRECCIÓN DE VALIDACIÓN : https://sede.administracion.gob.es/pagSedeFront/servicios/consultaCSV.htm",
+            "", f"FIRMANTE(1) : PERSONA TITULAR DE LA SECRETARÍA DE ESTADO | FECHA : {date} | Aprueba", ""]
+
+
+def _date(day: int, month: int, year: int) -> str:
+    return f"{day} de {MONTHS[month - 1]} de {year}"
+
+
+def generate_article_3(rng: random.Random, year: str) -> Tuple[List[str], List[str]]:
+    """Artículo 3 con listas de enseñanzas de longitud aleatoria; devuelve (líneas, enseñanzas)."""
+    non_university = sorted(rng.sample(range(len(NON_UNIVERSITY_STUDIES)),
+                                       rng.randint(3, len(NON_UNIVERSITY_STUDIES))))
+    university = sorted(rng.sample(range(len(UNIVERSITY_STUDIES)), rng.randint(1, len(UNIVERSITY_STUDIES))))
+
+    lines = [f"Artículo 3. {ARTICLE_TITLES[3]}.  ", ""]
+    lines += _wrap(f"Para el curso académico {year} y, con cargo a los créditos mencionados en el artículo "
+                   "anterior se convocan becas sin número determinado de personas beneficiarias para las "
+                   "siguientes enseñanzas:")
+    lines += [""] + _wrap("1. Enseñanzas postobligatorias y superiores no universitarias del sistema educativo "
+                          "español y con validez en todo el territorio nacional:") + [""]
+    studies = []
+    for letter, index in zip(LETTERS, non_university):
+        lines += _wrap(f"{letter})  {NON_UNIVERSITY_STUDIES[index]}") + [""]
+        studies.append(NON_UNIVERSITY_STUDIES[index])
+    lines += _wrap("2. Enseñanzas universitarias del sistema universitario español cursadas en centros "
+                   "españoles y con validez en todo el territorio nacional:") + [""]
+    for letter, index in zip(LETTERS, university):
+        lines += _wrap(f"{letter})  {UNIVERSITY_STUDIES[index]}") + [""]
+        studies.append(UNIVERSITY_STUDIES[index])
+    return lines, studies
+
+
+def generate_article_11(rng: random.Random, year: str, scale: float) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Artículo 11 con cuantías aleatorias; devuelve (líneas, componentes)."""
+    income = round(1700 * scale * rng.uniform(0.9, 1.1), -1)
+    residence = round(1600 * scale * rng.uniform(0.9, 1.1), -1)
+    basic = round(300 * scale * rng.uniform(0.9, 1.1), -1)
+    basic_fp = basic + 50
+    minimum = round(60 * rng.uniform(0.8, 1.2))
+    steps = sorted(rng.sample(range(40, 200, 5), 4))
+
+    lines = [f"Artículo 11. {ARTICLE_TITLES[11]}.  ", ""]
+    lines += _wrap(f"Las cuantías de las becas de carácter general para el curso {year} serán las siguientes:")
+    lines += [""] + _wrap("A)  Beca de matrícula: Comprenderá el precio público oficial de los servicios académicos "
+                          "universitarios correspondiente a los créditos en que se haya matriculado el estudiante "
+                          f"por primera vez en el curso {year}, en los términos previstos en el artículo 5 de esta "
+                          "Resolución.")
+    lines += ["", f"B)   Cuantía fija ligada a la renta del solicitante: {format_amount(income)} euros.  ", ""]
+    lines += [f"C)  Cuantía fija ligada a la residencia del solicitante durante el curso: {format_amount(residence)} euros.   ", ""]
+    lines += _wrap(f"D)  Cuantía fija ligada a la excelencia académica: entre {steps[0]} y {steps[-1]} euros con "
+                   "la siguiente distribución:")
+    lines += ["", "Nota media del ", "estudiante  ", "", "Entre 8,00 y 8,49 puntos  ", "", "Cuantía en ", "euros  ", ""]
+    for label, step in zip(["", "Entre 8,50 y 8,99 puntos", "Entre 9,00 y 9,49 puntos", "9,50 puntos o más"], steps):
+        if label:
+            lines += [f"{label}  ", ""]
+        lines += [f"{step} euros  ", ""]
+    lines += _wrap(f"E) Beca básica: {format_amount(basic)} euros. En el caso de los becarios que cursen Ciclos Formativos "
+                   f"de Grado Básico esta cuantía será de {format_amount(basic_fp, decimals=False)} euros.")
+    lines += [""] + _wrap("F) Cuantía variable y distinta para los diferentes solicitantes que resultará de la "
+                          "ponderación de la nota media del expediente del estudiante y de su renta familiar y cuyo "
+                          f"importe mínimo será de {format_amount(minimum)} euros.")
+
+    components = [
+        {"type": "Beca de matrícula", "amount": ""},
+        {"type": "Cuantía fija ligada a la renta del solicitante", "amount": format_amount(income)},
+        {"type": "Cuantía fija ligada a la residencia del solicitante durante el curso", "amount": format_amount(residence)},
+        {"type": "Cuantía fija ligada a la excelencia académica", "amount": ""},
+        {"type": "Beca básica", "amount": format_amount(basic)},
+        {"type": "Cuantía variable", "amount": ""}
+    ]
+    return lines, components
+
+
+def _threshold_values(rng: random.Random, scale: float) -> List[List[int]]:
+    """Umbrales aleatorios (8 tamaños de familia + miembro adicional), crecientes con el tamaño."""
+    values = []
+    for base in BASE_THRESHOLDS:
+        factor = scale * rng.uniform(0.95, 1.05)
+        row = [round(value * factor * rng.uniform(0.99, 1.01)) for value in base[:8]]
+        row.sort()
+        values.append(row + [round(base[8] * factor)])
+    return values
+
+
+def generate_article_19(rng: random.Random, scale: float, layout: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Artículo 19 en formato tradicional o de tabla; devuelve (líneas, umbrales)."""
+    values = _threshold_values(rng, scale)
+    lines = [f"Artículo 19. {ARTICLE_TITLES[19]}.  "]
+    lines += _wrap("Los umbrales de renta familiar aplicables para la concesión de las becas que se convocan "
+                   "por esta Resolución serán los que se señalan a continuación:")
+
+    if layout == 'table':
+        # Columna a columna, como sale el texto de la tabla de los PDFs a partir de 2024-2025
+        lines += ["nº de ", "miembros de la ", "familia "] + [f"{size} " for size in range(1, 9)]
+        lines += ["Cada miembro ", "adicional al 8º "]
+        lines += ["Umbral 1 (euros)  Umbral 2 (euros) Umbral 3 (euros) "]
+        for row in values:
+            lines += [f"{format_amount(value, decimals=False)} " for value in row]
+    else:
+        for number, row in enumerate(values, 1):
+            lines += ["", f"{number}.  Umbral {number}:  ", ""]
+            for size, value in enumerate(row[:8], 1):
+                plural = "miembro" if size == 1 else "miembros"
+                if rng.random() < 0.3:
+                    lines += [f"• Familias de {number_to_words(size)} {plural}:  ", "", f"{format_amount(value)} euros. ", ""]
+                else:
+                    lines += [f"• Familias de {number_to_words(size)} {plural}:   {format_amount(value)} euros. ", ""]
+            lines += _wrap(f"A partir del octavo miembro se añadirán {format_amount(row[8])} euros por cada nuevo miembro "
+                           "computable de la familia.")
+
+    thresholds = [{"number": number, "family_size": size, "amount": format_amount(value, decimals=False)}
+                  for number, row in enumerate(values, 1) for size, value in enumerate(row[:8], 1)]
+    return lines, thresholds
+
+
+def generate_article_24(rng: random.Random, layout: str) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Artículo 24 con porcentajes de créditos por rama; devuelve (líneas, requisitos)."""
+    percentages = [rng.choice((65, 80, 85, 90, 100)) for _ in AREAS]
+    lines = [f"Artículo 24. {ARTICLE_TITLES[24]}.   "]
+    lines += _wrap("1. Para la concesión de beca a quienes se matriculen por primera vez de primer curso de "
+                   "estudios de grado se requerirá una nota de 5,00 puntos en la nota de acceso a la universidad.")
+    lines += _wrap("2. Para obtener beca los solicitantes de segundos y posteriores cursos de los estudios a que "
+                   "se refiere esta sección, deberán haber superado en los últimos estudios cursados los "
+                   "siguientes porcentajes de los créditos matriculados:")
+
+    if layout == 'table':
+        lines += ["Rama o área de conocimiento  "]
+        lines += [f"{area} {'. ' * max(2, (40 - len(area)) // 2)}" for area in AREAS]
+        lines += ["Porcentaje de ", "créditos a ", "superar  "] + [f"{p}%  " for p in percentages]
+    else:
+        lines += [f"Área de {area}: {p}%  " for area, p in zip(AREAS, percentages)]
+    lines += _wrap("3. Estos requisitos se aplicarán también a los casos de estudiantes con discapacidad igual o "
+                   "superior al 65 por ciento.")
+
+    requirements = [{"area": area, "percentage": f"{p}%"} for area, p in zip(AREAS, percentages)]
+    return lines, requirements
+
+
+def generate_article_48(rng: random.Random, start_year: int) -> Tuple[List[str], List[Dict[str, str]], str]:
+    """Artículo 48 con el plazo de solicitud; devuelve (líneas, plazos, plazo excepcional)."""
+    year = start_year
+    opening = (rng.randint(1, 28), rng.randint(2, 4))
+    closing = (rng.randint(1, 28), opening[1] + rng.randint(1, 2))
+    exceptional = _date(31, 12, year)
+
+    lines = [f"Artículo 48. {ARTICLE_TITLES[48]}.  "]
+    lines += _wrap("1. El plazo para presentar la solicitud tanto de los estudiantes universitarios como no "
+                   f"universitarios se extenderá desde el día {_date(*opening, year)}, a las 9,00, hora "
+                   f"peninsular, hasta el {_date(*closing, year)}, a las 15,00, hora peninsular, ambos inclusive.")
+    lines += _wrap("2. Únicamente podrán presentarse solicitudes de beca después del plazo señalado y hasta el "
+                   f"{exceptional} en caso de fallecimiento del sustentador principal de la familia, o por "
+                   "jubilación forzosa del mismo.")
+    return lines, [{"type": "General", "deadline": _date(*closing, year)}], exceptional
+
+
+def _article_spans(text: str) -> Dict[int, Tuple[int, int]]:
+    """Posición de cada artículo generado dentro de una plantilla (hasta el siguiente artículo o capítulo)."""
+    spans = {}
+    for number in ARTICLE_TITLES:
+        start = re.search(rf'^\s*Artículo\s+{number}\s*\.', text, re.MULTILINE)
+        if not start:
+            continue
+        end = re.compile(r'^\s*(?:Artículo\s+\d+\s*\.|CAP[ÍI]TULO\b)', re.MULTILINE).search(text, start.end())
+        spans[number] = (start.start(), end.start() if end else len(text))
+    return spans
+
+
+def load_templates(template_dir: str) -> List[Dict[str, Any]]:
+    """Plantillas de ``corpus_txt/`` que contienen todos los artículos que se generan."""
+    templates = []
+    for name in sorted(os.listdir(template_dir)):
+        if not name.endswith('.txt'):
+            continue
+        with open(os.path.join(template_dir, name), 'r', encoding='utf-8') as file:
+            text = file.read()
+        spans = _article_spans(text)
+        year = re.search(r'curso\s+(?:académico\s+)?(\d{4})-\d{4}', text)
+        if len(spans) == len(ARTICLE_TITLES) and year:
+            templates.append({"name": name, "text": text, "spans": spans, "start_year": int(year.group(1))})
+    return templates
+
+
+def _shift_years(text: str, offset: int) -> str:
+    """Desplaza los años 2000-2099 de la plantilla para que correspondan al curso generado."""
+    if offset == 0:
+        return text
+    return re.sub(r'\b20\d\d\b', lambda m: str(int(m.group()) + offset), text)
+
+
+def generate_document(template: Dict[str, Any], rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+    """
+    Genera un documento a partir de una plantilla.
+
+    Returns:
+        (texto del documento, verdad de referencia con el formato de ``evaluate_backends``)
+    """
+    start_year = rng.randint(2015, 2035)
+    year = f"{start_year}-{start_year + 1}"
+    # Las cuantías crecen un 2 % anual respecto a las de referencia (2022)
+    scale = 1.02 ** (start_year - 2022)
+    threshold_layout = rng.choice(THRESHOLD_LAYOUTS)
+    requirement_layout = rng.choice(REQUIREMENT_LAYOUTS)
+    signature_date = f"{rng.randint(1, 28):02d}/{rng.randint(2, 4):02d}/{start_year} {rng.randint(9, 20)}:{rng.randint(0, 59):02d}"
+
+    generated = {
+        3: generate_article_3(rng, year),
+        11: generate_article_11(rng, year, scale),
+        19: generate_article_19(rng, scale, threshold_layout),
+        24: generate_article_24(rng, requirement_layout),
+        48: generate_article_48(rng, start_year)
+    }
+
+    text = template["text"]
+    offset = start_year - template["start_year"]
+    parts, position, page = [], 0, 1
+    for number, (start, end) in sorted(template["spans"].items(), key=lambda item: item[1][0]):
+        parts.append(_shift_years(text[position:start], offset))
+        lines = list(generated[number][0])
+        # Un pie de página en medio del artículo, como en los PDFs reales
+        if len(lines) > 6 and rng.random() < 0.5:
+            cut = rng.randint(3, len(lines) - 2)
+            lines[cut:cut] = _footer(rng, page, signature_date)
+            page += 1
+        parts.append("\n".join(lines) + "\n\n")
+        position = end
+    parts.append(_shift_years(text[position:], offset))
+
+    gold = {
+        "reviewed": True,
+        "synthetic": True,
+        "template": template["name"],
+        "layouts": {"article_19": threshold_layout, "article_24": requirement_layout},
+        "academic_year": year,
+        "studies": generated[3][1],
+        "components": generated[11][1],
+        "thresholds": generated[19][1],
+        "deadlines": generated[48][1],
+        "exceptional_deadline": generated[48][2],
+        "requirements": generated[24][1]
+    }
+    return "".join(parts), gold
+
+
+def write_pdf(text: str, path: str, lines_per_page: int = 70) -> None:
+    """Escribe el texto en un PDF de páginas A4 con PyMuPDF."""
+    document = fitz.open()
+    lines = text.splitlines()
+    for start in range(0, len(lines), lines_per_page):
+        page = document.new_page(width=595, height=842)
+        page.insert_text((40, 40), "\n".join(lines[start:start + lines_per_page]), fontsize=7)
+    document.save(path, garbage=3, deflate=True)
+    document.close()
+
+
+# Estado de cada proceso trabajador (las plantillas se cargan una vez por proceso)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(template_dir: str, output_dir: str, seed: int, pdf: bool) -> None:
+    _worker_state.update(templates=load_templates(template_dir), output_dir=output_dir, seed=seed, pdf=pdf)
+
+
+def _generate_one(index: int) -> str:
+    """Genera y escribe el documento ``index`` (determinista para una semilla dada)."""
+    state = _worker_state
+    rng = random.Random(f"{state['seed']}:{index}")
+    template = rng.choice(state["templates"])
+    text, gold = generate_document(template, rng)
+
+    name = f"sintetico_{index:06d}"
+    output_dir = state["output_dir"]
+    with open(os.path.join(output_dir, 'txt', f"{name}.txt"), 'w', encoding='utf-8') as file:
+        file.write(text)
+    with open(os.path.join(output_dir, 'gold', f"{name}.json"), 'w', encoding='utf-8') as file:
+        json.dump(gold, file, ensure_ascii=False, indent=2)
+    if state["pdf"]:
+        write_pdf(text, os.path.join(output_dir, 'pdf', f"{name}.pdf"))
+    return name
+
+
+def main():
+    """Genera el corpus sintético."""
+    parser = argparse.ArgumentParser(description='Generador de convocatorias sintéticas para pruebas de carga')
+    parser.add_argument('--count', '-n', type=int, default=100, help='Número de documentos')
+    parser.add_argument('--output', '-o', type=str, default='./synthetic', help='Directorio de salida')
+    parser.add_argument('--templates', '-t', type=str, default='./corpus_txt', help='Directorio de las plantillas')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla (el mismo valor genera el mismo corpus)')
+    parser.add_argument('--start', type=int, default=0, help='Índice del primer documento (para ampliar un corpus)')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='Procesos en paralelo')
+    parser.add_argument('--no-pdf', action='store_true', help='Genera solo los textos, sin PDF')
+    args = parser.parse_args()
+
+    templates = load_templates(args.templates)
+    if not templates:
+        print(f"No hay plantillas válidas en {args.templates}")
+        return
+    print(f"Plantillas: {', '.join(t['name'] for t in templates)}")
+
+    pdf = not args.no_pdf
+    if pdf and not PYMUPDF_AVAILABLE:
+        print("⚠️ PyMuPDF no está instalado: solo se generan los textos. Instálalo con 'pip install pymupdf'")
+        pdf = False
+
+    for sub in ('txt', 'gold') + (('pdf',) if pdf else ()):
+        os.makedirs(os.path.join(args.output, sub), exist_ok=True)
+
+    indices = range(args.start, args.start + args.count)
+    init_args = (args.templates, args.output, args.seed, pdf)
+    if args.workers > 1:
+        with Pool(args.workers, initializer=_init_worker, initargs=init_args) as pool:
+            for done, _ in enumerate(pool.imap_unordered(_generate_one, indices, chunksize=16), 1):
+                if done % 1000 == 0:
+                    print(f"   {done}/{args.count} documentos")
+    else:
+        _init_worker(*init_args)
+        for done, _ in enumerate(map(_generate_one, indices), 1):
+            if done % 1000 == 0:
+                print(f"   {done}/{args.count} documentos")
+
+    print(f"✅ {args.count} documentos generados en {args.output} "
+          f"(txt/, gold/{', pdf/' if pdf else ''})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Caché en disco de los textos extraídos de los documentos, direccionada por el hash del contenido.
+
+El modo compacto de los extractores guarda cada artículo como una referencia
+(clave del texto, inicio, fin) en lugar de copiar su texto en el JSON. Este módulo
+almacena el texto completo una sola vez y resuelve esas referencias bajo demanda.
+"""
+
+import os
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+class TextCache:
+    """Almacén de textos de documentos indexado por el SHA-1 de su contenido."""
+
+    def __init__(self, cache_dir: str, max_loaded: int = 8):
+        """
+        Inicializa la caché.
+
+        Args:
+            cache_dir: Directorio donde se guardan los textos
+            max_loaded: Número máximo de textos que se mantienen cargados en memoria
+        """
+        self.cache_dir = cache_dir
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        """Calcula la clave de caché de un texto."""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """Devuelve la ruta del fichero que contiene el texto de una clave."""
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def put(self, text: str) -> str:
+        """Guarda un texto (si no estaba ya guardado) y devuelve su clave."""
+        key = self.key_for(text)
+        path = self.path_for(key)
+
+        if not os.path.exists(path):
+            # Escritura atómica para no dejar textos a medias si el proceso se interrumpe
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as file:
+                file.write(text)
+            os.replace(tmp_path, path)
+
+        self._remember(key, text)
+        return key
+
+    def get(self, key: str) -> str:
+        """Devuelve el texto completo asociado a una clave."""
+        if key in self._loaded:
+            self._loaded.move_to_end(key)
+            return self._loaded[key]
+
+        with open(self.path_for(key), 'r', encoding='utf-8', newline='') as file:
+            text = file.read()
+
+        self._remember(key, text)
+        return text
+
+    def slice(self, key: str, start: int, end: int) -> str:
+        """Devuelve el fragmento [start, end) del texto asociado a una clave."""
+        return self.get(key)[start:end]
+
+    def _remember(self, key: str, text: str) -> None:
+        """Mantiene en memoria los últimos textos usados."""
+        self._loaded[key] = text
+        self._loaded.move_to_end(key)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+
+def make_article_ref(text_key: str, span: Optional[Tuple[int, int]]) -> Any:
+    """Crea la referencia compacta de un artículo ("" si el artículo no se encontró)."""
+    if span is None:
+        return ""
+    return {"text_key": text_key, "start": span[0], "end": span[1]}
+
+
+def is_article_ref(value: Any) -> bool:
+    """Indica si un valor es una referencia compacta a un artículo."""
+    return isinstance(value, dict) and "text_key" in value and "start" in value and "end" in value
+
+
+def resolve_article(value: Any, text_cache: Optional[TextCache]) -> str:
+    """
+    Devuelve el texto de un artículo, tanto si está guardado en claro como si es una referencia.
+
+    Si el valor es una referencia y no se dispone de caché, devuelve una cadena vacía.
+    """
+    if is_article_ref(value):
+        if text_cache is None:
+            return ""
+        return text_cache.slice(value["text_key"], value["start"], value["end"])
+    return value or ""
+
+
+def expand_articles(data: Dict[str, Any], text_cache: TextCache) -> Dict[str, Any]:
+    """Devuelve una copia del resultado con todas las referencias a artículos resueltas."""
+    expanded = dict(data)
+    for key, value in data.items():
+        if key.startswith('article_') and is_article_ref(value):
+            expanded[key] = resolve_article(value, text_cache)
+    return expanded
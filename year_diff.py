@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Comparación estructurada entre cursos académicos.
+
+Alinea en una sola pasada los campos extraídos de todas las convocatorias en series
+indexadas por curso (una posición por documento, ordenados por año académico) y
+calcula a la vez las diferencias y variaciones porcentuales de cada componente de
+la beca y de cada celda de los umbrales de renta (umbral × tamaño de familia).
+
+El resumen general y cualquier informe pueden consultar estas series en lugar de
+volver a recorrer los documentos para cada métrica.
+
+Uso:
+python year_diff.py output/ayudas_21-22.json output/ayudas_22-23.json ...
+"""
+
+import sys
+import json
+import math
+from array import array
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from models import as_dict
+from spanish_numbers import parse_amounts
+
+
+class Series:
+    """Serie de valores de un campo alineada con los cursos del corpus."""
+
+    __slots__ = ('key', 'raw', 'values', 'deltas', 'pct_changes')
+
+    def __init__(self, key: Any, size: int):
+        self.key = key
+        # Texto original de cada curso (None si el documento no tiene el campo)
+        self.raw: List[Optional[str]] = [None] * size
+        self.values = array('d', [math.nan]) * size
+        self.deltas = array('d', [math.nan]) * size
+        self.pct_changes = array('d', [math.nan]) * size
+
+    def compute_changes(self) -> None:
+        """Calcula la diferencia y el porcentaje respecto al curso anterior con dato."""
+        previous = math.nan
+        for i, value in enumerate(self.values):
+            if math.isnan(value):
+                continue
+            if not math.isnan(previous):
+                self.deltas[i] = value - previous
+                if previous:
+                    self.pct_changes[i] = (value - previous) / previous * 100.0
+            previous = value
+
+    def present(self) -> List[int]:
+        """Posiciones de los cursos en los que el documento contiene el campo."""
+        return [i for i, raw in enumerate(self.raw) if raw is not None]
+
+
+class YearDiff:
+    """Series alineadas por curso para todos los componentes y umbrales del corpus."""
+
+    def __init__(self, years: List[str]):
+        self.years = years
+        self.components: Dict[str, Series] = {}
+        self.thresholds: Dict[Tuple[int, str], Series] = {}
+
+    @classmethod
+    def build(cls, documents: Iterable[Any]) -> "YearDiff":
+        """Construye las series a partir de los resultados válidos, en una sola pasada."""
+        valid_data = [item for item in map(as_dict, documents) if item.get('valid', False)]
+        sorted_data = sorted(valid_data, key=lambda x: (x.get('academic_year') or {}).get('year', ''))
+        size = len(sorted_data)
+
+        diff = cls([(item.get('academic_year') or {}).get('year', 'N/A') for item in sorted_data])
+
+        for index, item in enumerate(sorted_data):
+            for component in item.get('scholarship_amounts', {}).get('components', []):
+                component_type = component.get('type', '')
+                if 'amount' not in component:
+                    continue
+                series = diff.components.get(component_type)
+                if series is None:
+                    series = diff.components[component_type] = Series(component_type, size)
+                # Si un documento repite un tipo de componente, se conserva el primero
+                if series.raw[index] is None:
+                    series.raw[index] = component['amount']
+
+            for threshold in item.get('income_thresholds', {}).get('thresholds', []):
+                number = threshold.get('number')
+                for family in threshold.get('family_sizes', []):
+                    key = (number, str(family.get('size', '')))
+                    series = diff.thresholds.get(key)
+                    if series is None:
+                        series = diff.thresholds[key] = Series(key, size)
+                    if series.raw[index] is None:
+                        series.raw[index] = family.get('amount', 'N/A')
+
+        # Todos los importes del corpus se interpretan en una sola llamada por lotes
+        all_series = list(diff.components.values()) + list(diff.thresholds.values())
+        values = parse_amounts([raw for series in all_series for raw in series.raw])
+        for i, series in enumerate(all_series):
+            series.values = array('d', values[i * size:(i + 1) * size])
+            series.compute_changes()
+
+        return diff
+
+    def component(self, component_type: str) -> Optional[Series]:
+        """Serie de un tipo de componente (por ejemplo, 'Beca básica')."""
+        return self.components.get(component_type)
+
+    def threshold(self, number: int, family_size: int) -> Optional[Series]:
+        """Serie de un umbral de renta para un tamaño de familia."""
+        return self.thresholds.get((number, str(family_size)))
+
+    def points(self, series: Optional[Series]) -> List[Tuple[str, str]]:
+        """Pares (curso, importe original) de los cursos en los que existe el dato."""
+        if series is None:
+            return []
+        return [(self.years[i], series.raw[i]) for i in series.present()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Informe serializable con todas las series, diferencias y porcentajes."""
+        def series_dict(series: Series) -> Dict[str, Any]:
+            return {
+                "raw": series.raw,
+                "values": [None if math.isnan(v) else v for v in series.values],
+                "deltas": [None if math.isnan(v) else round(v, 2) for v in series.deltas],
+                "pct_changes": [None if math.isnan(v) else round(v, 2) for v in series.pct_changes]
+            }
+
+        return {
+            "years": self.years,
+            "components": {key: series_dict(s) for key, s in self.components.items()},
+            "thresholds": {f"umbral_{number}_miembros_{size}": series_dict(s)
+                           for (number, size), s in sorted(self.thresholds.items(), key=lambda kv: (str(kv[0][0]), kv[0][1].zfill(3)))}
+        }
+
+
+def main():
+    """Imprime el informe de evolución en JSON para los ficheros de resultados indicados."""
+    documents = []
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        documents.extend(data if isinstance(data, list) else [data])
+
+    print(json.dumps(YearDiff.build(documents).to_dict(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Reglas compiladas de un curso académico, con carga binaria instantánea.
+
+Para conocer una cuantía, un umbral de renta, un tramo de excelencia o el porcentaje de
+créditos de un área había que cargar el JSON completo del curso y recorrer sus
+diccionarios anidados. ``compile_rules`` convierte una vez el resultado de un extractor
+en un objeto ``YearRules`` inmutable cuyos valores están en bloques contiguos de
+``float64``:
+
+- cuantía y cuantía mínima de cada componente (Artículo 11);
+- tramos de nota de la excelencia académica, ordenados para buscarlos con ``bisect``;
+- tabla de umbrales de renta (umbral × tamaño de familia) y el importe por miembro
+  adicional (Artículo 19);
+- porcentaje de créditos a superar de cada rama (Artículo 24).
+
+El fichero binario (``.rules``) es una cabecera de tamaño fijo, los nombres en UTF-8
+y los bloques de valores tal cual están en memoria. ``YearRules.load`` lo proyecta con
+``mmap`` y los bloques son vistas de solo lectura sobre el fichero, sin copiar ni
+interpretar nada; ``pickle`` usa el mismo formato. Los valores que no constan son NaN.
+
+Uso:
+python year_rules.py compile -i output/ayudas_*.json -o output/reglas
+python year_rules.py show 2024-2025
+python year_rules.py show 2022-2023 --threshold 1 4 --score 8.7 --area Ciencias
+"""
+
+import os
+import sys
+import mmap
+import math
+import time
+import struct
+import argparse
+import unicodedata
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models import as_document, load_documents
+from query import normalize_year
+from spanish_numbers import parse_amount, parse_amounts
+
+RULES_MAGIC = b'BECR'
+RULES_VERSION = 1
+RULES_SUFFIX = '.rules'
+DEFAULT_RULES_DIR = './output/reglas'
+# Tamaños de familia de la tabla de umbrales (la convocatoria los detalla hasta ocho)
+MAX_FAMILY_SIZE = 8
+
+# magia, versión, orden de bytes, componentes, umbrales, tramos, áreas, bytes de nombres
+_HEADER = struct.Struct('<4sHcxIIIII')
+_NAME_SEPARATOR = '\x00'
+
+
+def _key(name: str) -> str:
+    """Nombre en minúsculas, sin tildes ni espacios repetidos, para las búsquedas."""
+    decomposed = unicodedata.normalize('NFD', name.lower())
+    return ' '.join(''.join(c for c in decomposed if unicodedata.category(c) != 'Mn').split())
+
+
+def _frozen(values: Sequence[float]) -> memoryview:
+    """Vista de solo lectura de un bloque de ``float64``."""
+    return memoryview(array('d', values)).toreadonly()
+
+
+def _value(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class YearRules:
+    """Reglas de un curso académico, en bloques de ``float64`` de solo lectura."""
+
+    __slots__ = ('year', 'components', 'areas', 'threshold_numbers', 'component_amounts',
+                 'component_minimums', 'thresholds', 'amount_per_member', 'score_min', 'score_max',
+                 'score_amounts', 'credit_percentages', '_component_positions', '_area_positions',
+                 '_threshold_positions', '_buffer')
+
+    def __init__(self, year: str, components: Sequence[str], areas: Sequence[str],
+                 threshold_numbers: Sequence[int], blocks: Dict[str, memoryview], buffer: Any = None):
+        """
+        Args:
+            year: Curso académico ('2024-2025')
+            components: Tipos de componente, en el orden de los bloques de cuantías
+            areas: Ramas de conocimiento, en el orden de los porcentajes de créditos
+            threshold_numbers: Número de cada fila de la tabla de umbrales
+            blocks: Bloques de valores, por nombre (ver ``_BLOCKS``)
+            buffer: Objeto del que dependen los bloques (el ``mmap`` del fichero), que se
+                mantiene vivo mientras lo esté la regla
+        """
+        setter = super().__setattr__
+        setter('year', year)
+        setter('components', tuple(components))
+        setter('areas', tuple(areas))
+        setter('threshold_numbers', tuple(threshold_numbers))
+        for name in _BLOCKS:
+            setter(name, blocks[name])
+        setter('_component_positions', {_key(name): i for i, name in enumerate(self.components)})
+        setter('_area_positions', {_key(name): i for i, name in enumerate(self.areas)})
+        setter('_threshold_positions', {number: i for i, number in enumerate(self.threshold_numbers)})
+        setter('_buffer', buffer)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Las reglas de un curso son inmutables ({name})")
+
+    def __reduce__(self):
+        return YearRules.from_buffer, (self.to_bytes(),)
+
+    def __repr__(self) -> str:
+        return (f"YearRules({self.year}: {len(self.components)} componentes, {len(self.threshold_numbers)} umbrales, "
+                f"{len(self.score_amounts)} tramos, {len(self.areas)} áreas)")
+
+    def _resolve(self, positions: Dict[str, int], name: str) -> Optional[int]:
+        """Posición de un nombre exacto o aproximado ('beca basica', 'residencia')."""
+        key = _key(name)
+        if key in positions:
+            return positions[key]
+        matches = [candidate for candidate in positions if key in candidate]
+        return positions[min(matches, key=len)] if matches else None
+
+    def component_amount(self, component: str) -> Optional[float]:
+        """Cuantía de un componente (None si no consta)."""
+        position = self._resolve(self._component_positions, component)
+        return None if position is None else _value(self.component_amounts[position])
+
+    def component_minimum(self, component: str) -> Optional[float]:
+        """Cuantía mínima de un componente (None si no consta)."""
+        position = self._resolve(self._component_positions, component)
+        return None if position is None else _value(self.component_minimums[position])
+
+    def income_threshold(self, number: int, family_size: int) -> Optional[float]:
+        """
+        Renta máxima de un umbral para un tamaño de familia. Por encima de los tamaños
+        detallados se suma el importe por cada miembro adicional, si consta.
+        """
+        row = self._threshold_positions.get(number)
+        if row is None or family_size < 1:
+            return None
+        base = row * MAX_FAMILY_SIZE
+        if family_size <= MAX_FAMILY_SIZE:
+            return _value(self.thresholds[base + family_size - 1])
+        extra = self.amount_per_member[row]
+        last = self.thresholds[base + MAX_FAMILY_SIZE - 1]
+        return _value(last + (family_size - MAX_FAMILY_SIZE) * extra)
+
+    def excellence_amount(self, score: float) -> Optional[float]:
+        """Cuantía ligada a la excelencia académica para una nota media (None si no llega)."""
+        # Si los tramos se solapan gana el de mayor nota mínima (y, a igual mínima, el más estrecho)
+        position = bisect_right(self.score_min, score) - 1
+        while position >= 0 and score > self.score_max[position]:
+            position -= 1
+        return None if position < 0 else _value(self.score_amounts[position])
+
+    def credit_percentage(self, area: str) -> Optional[float]:
+        """Porcentaje de créditos a superar en una rama de conocimiento (None si no consta)."""
+        position = self._resolve(self._area_positions, area)
+        return None if position is None else _value(self.credit_percentages[position])
+
+    def to_bytes(self) -> bytes:
+        """Reglas en el formato binario de ``save``."""
+        names = _NAME_SEPARATOR.join([self.year, *self.components, *self.areas]).encode('utf-8')
+        header = _HEADER.pack(RULES_MAGIC, RULES_VERSION, b'L' if sys.byteorder == 'little' else b'B',
+                              len(self.components), len(self.threshold_numbers), len(self.score_amounts),
+                              len(self.areas), len(names))
+        numbers = array('d', self.threshold_numbers).tobytes()
+        # Los bloques empiezan alineados a 8 bytes
+        padding = b'\x00' * (-(_HEADER.size + len(names)) % 8)
+        return b''.join([header, names, padding, numbers] + [getattr(self, name).tobytes() for name in _BLOCKS])
+
+    def save(self, path: str) -> None:
+        """Guarda las reglas en un fichero binario."""
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def from_buffer(cls, buffer: Any) -> "YearRules":
+        """
+        Reglas a partir del formato binario. Los bloques son vistas sobre ``buffer`` (sin
+        copia) salvo que el fichero se escribiera con el otro orden de bytes.
+
+        Raises:
+            ValueError: Si el contenido no es un fichero de reglas de esta versión
+        """
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("Fichero de reglas truncado")
+        magic, version, byteorder, n_components, n_thresholds, n_ranges, n_areas, names_size = \
+            _HEADER.unpack_from(view)
+        if magic != RULES_MAGIC or version != RULES_VERSION:
+            raise ValueError(f"Fichero de reglas no soportado (versión {version})")
+
+        names = bytes(view[_HEADER.size:_HEADER.size + names_size]).decode('utf-8').split(_NAME_SEPARATOR)
+        offset = _HEADER.size + names_size + (-(_HEADER.size + names_size) % 8)
+        sizes = _block_sizes(n_components, n_thresholds, n_ranges, n_areas)
+        expected = offset + 8 * (n_thresholds + sum(sizes.values()))
+        if len(view) != expected:
+            raise ValueError(f"Fichero de reglas truncado ({len(view)} bytes, se esperaban {expected})")
+
+        values = view[offset:].cast('d')
+        if byteorder != (b'L' if sys.byteorder == 'little' else b'B'):
+            swapped = array('d', values)
+            swapped.byteswap()
+            values = memoryview(swapped)
+        values = values.toreadonly()
+
+        threshold_numbers = [int(number) for number in values[:n_thresholds]]
+        blocks, position = {}, n_thresholds
+        for name in _BLOCKS:
+            blocks[name] = values[position:position + sizes[name]]
+            position += sizes[name]
+        return cls(names[0], names[1:1 + n_components], names[1 + n_components:1 + n_components + n_areas],
+                   threshold_numbers, blocks, buffer)
+
+    @classmethod
+    def load(cls, path: str) -> "YearRules":
+        """Proyecta en memoria un fichero guardado con ``save``."""
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(mapped)
+
+
+# Bloques de valores, en el orden en que se guardan
+_BLOCKS = ('component_amounts', 'component_minimums', 'thresholds', 'amount_per_member',
+           'score_min', 'score_max', 'score_amounts', 'credit_percentages')
+
+
+def _block_sizes(n_components: int, n_thresholds: int, n_ranges: int, n_areas: int) -> Dict[str, int]:
+    """Número de valores de cada bloque."""
+    return {"component_amounts": n_components, "component_minimums": n_components,
+            "thresholds": n_thresholds * MAX_FAMILY_SIZE, "amount_per_member": n_thresholds,
+            "score_min": n_ranges, "score_max": n_ranges, "score_amounts": n_ranges,
+            "credit_percentages": n_areas}
+
+
+def compile_rules(data: Any) -> YearRules:
+    """
+    Compila las reglas de un curso a partir del resultado de cualquiera de los extractores.
+
+    Raises:
+        ValueError: Si el documento no es válido o no indica el curso académico
+    """
+    document = as_document(data)
+    if not document.valid or not document.academic_year:
+        raise ValueError(f"{document.file_name}: documento no válido o sin curso académico")
+
+    # Si un documento repite un tipo de componente, se conserva el primero
+    components = {}
+    for component in document.components:
+        components.setdefault(component.type, component)
+    # Tramos de excelencia por nota mínima y, a igual mínima, del más ancho al más estrecho;
+    # sin nota mínima no se pueden buscar
+    def range_key(score_range):
+        maximum = parse_amount(score_range.max_score)
+        return parse_amount(score_range.min_score), -(math.inf if math.isnan(maximum) else maximum)
+
+    ranges = sorted((score_range for component in components.values() for score_range in component.ranges or []
+                     if not math.isnan(parse_amount(score_range.min_score))), key=range_key)
+    areas = {}
+    for requirement in document.requirements:
+        if requirement.area and requirement.percentage is not None:
+            areas.setdefault(requirement.area, requirement.percentage)
+    thresholds = sorted(document.thresholds, key=lambda t: t.number)
+
+    # Todos los importes del curso se interpretan en una sola llamada por lotes
+    raw: List[Optional[str]] = []
+    raw += [component.amount for component in components.values()]
+    raw += [component.minimum_amount for component in components.values()]
+    for threshold in thresholds:
+        row = [None] * MAX_FAMILY_SIZE
+        for family in threshold.family_sizes:
+            if family.size.isdigit() and 1 <= int(family.size) <= MAX_FAMILY_SIZE:
+                row[int(family.size) - 1] = family.amount
+        raw += row
+    raw += [threshold.amount_per_member for threshold in thresholds]
+    raw += [score_range.min_score for score_range in ranges]
+    raw += [score_range.max_score for score_range in ranges]
+    raw += [score_range.amount for score_range in ranges]
+    raw += list(areas.values())
+    values = array('d', parse_amounts(raw))
+
+    sizes = _block_sizes(len(components), len(thresholds), len(ranges), len(areas))
+    blocks, position = {}, 0
+    for name in _BLOCKS:
+        block = values[position:position + sizes[name]]
+        if name == 'score_max':
+            # "9,50 puntos o más" no tiene nota máxima
+            block = array('d', (math.inf if math.isnan(value) else value for value in block))
+        blocks[name] = _frozen(block)
+        position += sizes[name]
+
+    return YearRules(normalize_year(document.academic_year), list(components), list(areas),
+                     [threshold.number for threshold in thresholds], blocks)
+
+
+def rules_path(year: str, directory: str = DEFAULT_RULES_DIR) -> str:
+    """Fichero de reglas de un curso dentro de un directorio."""
+    return os.path.join(directory, normalize_year(year) + RULES_SUFFIX)
+
+
+@lru_cache(maxsize=None)
+def load_rules(year: str, directory: str = DEFAULT_RULES_DIR) -> YearRules:
+    """
+    Reglas de un curso desde el directorio de reglas compiladas (se proyecta una sola
+    vez por curso y proceso).
+
+    Raises:
+        OSError: Si no hay reglas compiladas para el curso
+        ValueError: Si el fichero de reglas está vacío o dañado
+    """
+    return YearRules.load(rules_path(year, directory))
+
+
+def compile_corpus(documents: Iterable[Any], directory: str) -> List[Tuple[str, str]]:
+    """Compila y guarda las reglas de cada curso. Devuelve los pares (curso, fichero)."""
+    os.makedirs(directory, exist_ok=True)
+    saved = []
+    for document in documents:
+        try:
+            rules = compile_rules(document)
+        except ValueError:
+            continue
+        path = rules_path(rules.year, directory)
+        rules.save(path)
+        saved.append((rules.year, path))
+    return saved
+
+
+def _amount(value: Optional[float]) -> str:
+    return 'sin datos' if value is None else f"{value:g} euros"
+
+
+def _percentage(value: Optional[float]) -> str:
+    return 'sin datos' if value is None else f"{value:g}% de créditos"
+
+
+def main():
+    """Compila las reglas de los cursos o muestra las de uno."""
+    parser = argparse.ArgumentParser(description='Reglas compiladas de las convocatorias de becas por curso')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compile_parser = subparsers.add_parser('compile', help='Compila las reglas de ficheros de resultados')
+    compile_parser.add_argument('--input', '-i', type=str, nargs='+', required=True,
+                                help='Ficheros JSON o NDJSON con los resultados de los extractores')
+    compile_parser.add_argument('--output', '-o', type=str, default=DEFAULT_RULES_DIR,
+                                help='Directorio de las reglas compiladas')
+
+    show_parser = subparsers.add_parser('show', help='Muestra las reglas de un curso')
+    show_parser.add_argument('year', help="Curso académico ('2024-2025', '24-25' o '2024')")
+    show_parser.add_argument('--rules', '-r', type=str, default=DEFAULT_RULES_DIR,
+                             help='Directorio de las reglas compiladas')
+    show_parser.add_argument('--threshold', type=int, nargs=2, metavar=('UMBRAL', 'MIEMBROS'), default=None,
+                             help='Umbral de renta para un tamaño de familia')
+    show_parser.add_argument('--score', type=float, default=None, help='Cuantía de excelencia para una nota media')
+    show_parser.add_argument('--area', type=str, default=None, help='Porcentaje de créditos de una rama')
+
+    args = parser.parse_args()
+
+    if args.command == 'compile':
+        documents = (document for path in args.input for document in load_documents(path))
+        saved = compile_corpus(documents, args.output)
+        for year, path in saved:
+            print(f"   {year}: {path} ({os.path.getsize(path)} bytes)")
+        print(f"Reglas de {len(saved)} cursos guardadas en {args.output}")
+        return
+
+    start = time.perf_counter()
+    try:
+        rules = load_rules(args.year, args.rules)
+    except OSError:
+        print(f"No hay reglas compiladas para {normalize_year(args.year)} en {args.rules}")
+        sys.exit(1)
+    except ValueError as e:
+        # Fichero vacío, truncado o de otra versión
+        print(f"No se pueden leer las reglas de {normalize_year(args.year)} en {args.rules}: {e}")
+        sys.exit(1)
+    print(f"{rules} ({(time.perf_counter() - start) * 1e6:.0f} µs)")
+
+    if args.threshold is None and args.score is None and args.area is None:
+        for component in rules.components:
+            print(f"   {component}: {_amount(rules.component_amount(component))}")
+        for number in rules.threshold_numbers:
+            sizes = [rules.income_threshold(number, size) for size in range(1, MAX_FAMILY_SIZE + 1)]
+            print(f"   Umbral {number}: " + ", ".join(f"{size + 1}: {value:g}" for size, value in enumerate(sizes)
+                                                    if value is not None))
+        for area in rules.areas:
+            print(f"   {area}: {_percentage(rules.credit_percentage(area))}")
+        return
+
+    if args.threshold is not None:
+        number, size = args.threshold
+        print(f"   Umbral {number}, familia de {size} miembros: {_amount(rules.income_threshold(number, size))}")
+    if args.score is not None:
+        print(f"   Excelencia con nota {args.score:g}: {_amount(rules.excellence_amount(args.score))}")
+    if args.area is not None:
+        print(f"   {args.area}: {_percentage(rules.credit_percentage(args.area))}")
+
+
+if __name__ == "__main__":
+    main()